@@ -0,0 +1,187 @@
+"""
+Bus engine timings: timetable reprocessing and schedule queries.
+
+Times ``BusesService._process_all_data`` on the recorded buses.json and on
+``synthetic.buses`` with the departures multiplied, followed by merging every
+combined ("all") view of the schedules and stops, which is deferred to the
+first request of each view, and by an incremental rebuild after one of the
+timetables changed. Then times the bus query endpoints end-to-end
+through the ASGI app (served from the mock upstream) and ``plan_journey`` over
+every pair of stops, on the timetable of the largest multiplier.
+
+Usage:
+    python benchmarks/buses.py [--multipliers 1 10 100] [--repeat 5] [--iterations 300]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from itertools import product
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from mock_upstream import FIXTURES_DIR, MockUpstream  # noqa: E402
+from synthetic import buses  # noqa: E402
+
+from data_api.api.api import app  # noqa: E402
+from data_api.data.manager import nthudata  # noqa: E402
+from data_api.domain.buses.graph import STOPS_DATA  # noqa: E402
+from data_api.domain.buses.services import (  # noqa: E402
+    BUS_DAY,
+    BUS_DIRECTION,
+    BUS_ROUTE_TYPE,
+    BusesService,
+    buses_service,
+)
+
+RECORDED = FIXTURES_DIR / "data.nthusa.tw" / "buses.json"
+
+Call = Callable[[], Awaitable[object]]
+
+
+def query_cases(client: AsyncClient) -> dict[str, Call]:
+    """Bus endpoint requests, by case name."""
+
+    def get(path: str, **params) -> Call:
+        async def call():
+            response = await client.get(path, params=params)
+            assert response.status_code == 200, (path, response.status_code)
+
+        return call
+
+    return {
+        "GET /buses/schedules": get(
+            "/buses/schedules/", bus_type="all", day="weekday", direction="all", time="12:00"
+        ),
+        "GET /buses/schedules details": get(
+            "/buses/schedules/",
+            bus_type="all",
+            day="weekday",
+            direction="all",
+            time="12:00",
+            details=True,
+        ),
+        "GET /buses/stops/{stop_name}": get(
+            "/buses/stops/北校門口/", bus_type="all", day="weekday", direction="all", time="12:00"
+        ),
+        "GET /buses/plan": get(
+            "/buses/plan",
+            **{"from": "南大校區校門口右側(食品路校牆邊)", "to": "楓林小徑"},
+            depart_after="12:00",
+            day="weekday",
+        ),
+    }
+
+
+def time_planning(service: BusesService, repeat: int) -> float:
+    """Best mean time in seconds of ``plan_journey`` over every pair of stops."""
+    pairs = [(a.name, b.name) for a in STOPS_DATA.values() for b in STOPS_DATA.values() if a != b]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for after in ("07:00", "12:00", "18:00"):
+            for origin, destination in pairs:
+                service.plan_journey(origin, destination, "weekday", after)
+        timings.append((time.perf_counter() - start) / (3 * len(pairs)))
+    return min(timings)
+
+
+def request_every_view(service: BusesService) -> None:
+    """Request every schedule and stop view once, materializing the combined ones."""
+    for route_type, day, direction in product(BUS_ROUTE_TYPE, BUS_DAY, BUS_DIRECTION):
+        service.get_schedule(route_type=route_type, day=day, direction=direction)
+        for stop in STOPS_DATA.values():
+            service.get_stop_schedule(stop.name, route_type, day, direction)
+
+
+def time_processing(payload: dict, repeat: int) -> tuple[float, float, float]:
+    """
+    Best wall times in seconds of a full ``_process_all_data`` on ``payload``, of
+    then requesting every view, and of rebuilding after one timetable changed.
+    """
+    changed = dict(payload)
+    changed["weekendBusScheduleTowardNanda"] = payload["weekendBusScheduleTowardNanda"][1:]
+    processing, views, incremental = [], [], []
+    for _ in range(repeat):
+        service = BusesService()
+        service._res_json = payload
+        start = time.perf_counter()
+        service._process_all_data()
+        processing.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        request_every_view(service)
+        views.append(time.perf_counter() - start)
+        service._res_json = changed
+        start = time.perf_counter()
+        service._process_all_data()
+        incremental.append(time.perf_counter() - start)
+    return min(processing), min(views), min(incremental)
+
+
+async def time_queries(payload: dict, iterations: int) -> dict[str, float]:
+    """Median latency in seconds of each query case, serving ``payload``."""
+    upstream = MockUpstream()
+    upstream.set("buses.json", json.dumps(payload, ensure_ascii=False).encode())
+    nthudata.fetcher.max_bytes = None
+    nthudata.endpoint_max_bytes = {}
+    nthudata.cache.max_bytes = None
+
+    results = {}
+    with upstream.install():
+        await nthudata.file_details_manager.refresh()
+        buses_service.last_commit_hash = None
+        await buses_service.update_data()
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+        ) as client:
+            for name, call in query_cases(client).items():
+                await call()
+                timings = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    await call()
+                    timings.append(time.perf_counter() - start)
+                results[name] = statistics.median(timings)
+        results["plan_journey (per query)"] = time_planning(buses_service, 5)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--multipliers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--output", type=Path, help="write the timings to this JSON file")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    print(f"{'case':<40} {'ms':>10}")
+    payloads = {"recorded": json.loads(RECORDED.read_text())}
+    payloads.update({f"{m}x": buses(m) for m in args.multipliers})
+    for label, payload in payloads.items():
+        timings = time_processing(payload, args.repeat)
+        names = ("_process_all_data", "  + every view", "  incremental")
+        for name, seconds in zip(names, timings):
+            results[f"{name.strip()} {label}"] = seconds
+            print(f"{name + ' ' + label:<40} {seconds * 1000:>10.3f}")
+
+    largest = f"{max(args.multipliers)}x"
+    for name, seconds in asyncio.run(time_queries(payloads[largest], args.iterations)).items():
+        results[f"{name} {largest}"] = seconds
+        print(f"{name + ' ' + largest:<40} {seconds * 1000:>10.3f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved timings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Latency, allocations and throughput of the router hot paths and MCP tools.
+
+Every case runs end-to-end through the ASGI app (or the MCP tool function)
+against the recorded fixtures of ``tests/mock_upstream``, so no network access
+is needed. The app's lifespan runs first, warming up the data as in production,
+and every case must return results. Each case is warmed up once (filling the
+caches), then timed
+sequentially for p50/p99 latency, run ``--concurrency`` at a time for
+throughput, and traced with tracemalloc for the peak memory allocated per call.
+
+Results can be saved as a baseline and later runs compared against it; the
+script exits with status 1 if a case got slower or allocates more than the
+baseline by more than ``--threshold``.
+
+Usage:
+    python benchmarks/endpoints.py [--iterations 200] [--filter buses]
+    python benchmarks/endpoints.py --save baseline.json
+    python benchmarks/endpoints.py --compare baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from mock_upstream import MockUpstream  # noqa: E402
+
+from data_api.api.api import app  # noqa: E402
+from data_api.mcp.tools.announcements import _get_announcements  # noqa: E402
+from data_api.mcp.tools.buses import (  # noqa: E402
+    _get_bus_stops,
+    _get_next_buses,
+    _plan_bus_journey,
+)
+from data_api.mcp.tools.campus import _search_campus  # noqa: E402
+from data_api.mcp.tools.courses import _search_courses  # noqa: E402
+from data_api.mcp.tools.dining import _find_dining  # noqa: E402
+
+# Metrics compared against the baseline, where larger is worse
+COMPARED = ("p50_ms", "p99_ms", "peak_kib")
+
+Call = Callable[[], Awaitable[object]]
+
+
+def http_cases(client: AsyncClient) -> dict[str, Call]:
+    """HTTP requests through the ASGI app, by case name."""
+
+    def get(path: str, **params) -> Call:
+        async def call():
+            response = await client.get(path, params=params)
+            assert response.status_code == 200, (path, response.status_code)
+            return response.json()
+
+        return call
+
+    def post(path: str, body) -> Call:
+        async def call():
+            response = await client.post(path, json=body)
+            assert response.status_code == 200, (path, response.status_code)
+            return response.json()
+
+        return call
+
+    return {
+        "GET /buses/schedules": get(
+            "/buses/schedules/", bus_type="all", day="weekday", direction="up", details=True
+        ),
+        "GET /buses/stops/{stop_name}": get(
+            "/buses/stops/北校門口/", bus_type="all", day="weekday", direction="up", details=True
+        ),
+        "GET /buses/plan": get(
+            "/buses/plan",
+            **{"from": "北校門口", "to": "南大校區校門口右側(食品路校牆邊)"},
+            depart_after="08:00",
+            day="weekday",
+        ),
+        "GET /courses/search": get("/courses/search", chinese_title="資料"),
+        "POST /courses/search": post(
+            "/courses/search",
+            [
+                {"row_field": "chinese_title", "matcher": "資料", "regex_match": True},
+                "or",
+                {"row_field": "teacher", "matcher": "王", "regex_match": True},
+            ],
+        ),
+        "GET /announcements/": get("/announcements/", department="教務處"),
+        "GET /dining/": get("/dining/"),
+        "GET /departments/search": get("/departments/search/", query="資訊工程"),
+        "GET /locations/search": get("/locations/search", query="校門"),
+    }
+
+
+def mcp_cases() -> dict[str, Call]:
+    """MCP tool calls, by case name."""
+    return {
+        "mcp get_next_buses": lambda: _get_next_buses(limit=5),
+        "mcp get_bus_stops": lambda: _get_bus_stops(stop_name="北校門口"),
+        "mcp plan_bus_journey": lambda: _plan_bus_journey("北校門口", "楓林小徑"),
+        "mcp search_courses": lambda: _search_courses(keyword="資料", limit=20),
+        "mcp get_announcements": lambda: _get_announcements(limit=10),
+        "mcp find_dining": lambda: _find_dining(check_open="weekday"),
+        "mcp search_campus": lambda: _search_campus(query="校門"),
+    }
+
+
+def has_results(result: object) -> bool:
+    """Whether a case returned data: a non-empty list, or a dict with a count or list of any."""
+    if isinstance(result, dict):
+        if "count" in result:
+            return result["count"] > 0
+        return any(isinstance(value, list) and value for value in result.values())
+    return bool(result)
+
+
+def percentile(timings: list[float], q: float) -> float:
+    """The ``q``-th percentile (0-100) of ``timings``, nearest rank."""
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+
+async def measure(call: Call, iterations: int, concurrency: int) -> dict[str, float]:
+    """Latency percentiles, throughput and peak allocation of ``call``."""
+    await call()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+
+    async def worker(n: int):
+        for _ in range(n):
+            await call()
+
+    # Spread every call over the workers, the first ones taking the remainder
+    share, remainder = divmod(iterations, concurrency)
+    calls = [share + (i < remainder) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in calls if n))
+    throughput = sum(calls) / (time.perf_counter() - start)
+
+    peak = 0
+    tracemalloc.start()
+    for _ in range(min(iterations, 20)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        await call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "rps": throughput,
+        "peak_kib": peak / 1024,
+    }
+
+
+async def run(iterations: int, concurrency: int, name_filter: str) -> dict[str, dict]:
+    results = {}
+    with MockUpstream().install():
+        async with (
+            app.router.lifespan_context(app),
+            AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+            ) as client,
+        ):
+            cases = {**http_cases(client), **mcp_cases()}
+            for name, call in cases.items():
+                if name_filter in name:
+                    # Timing an empty answer would hide a data or warmup problem
+                    assert has_results(await call()), f"{name} returned no results"
+                    results[name] = await measure(call, iterations, concurrency)
+                    print_row(name, results[name])
+    return results
+
+
+def print_row(name: str, result: dict[str, float], baseline: dict[str, float] = None) -> None:
+    columns = [
+        f"{result['p50_ms']:>8.2f}",
+        f"{result['p99_ms']:>8.2f}",
+        f"{result['rps']:>8.0f}",
+        f"{result['peak_kib']:>9.1f}",
+    ]
+    if baseline:
+        columns += [
+            f"{(result[metric] / baseline[metric] - 1) * 100 if baseline[metric] else 0:>+7.0f}%"
+            for metric in COMPARED
+        ]
+    print(f"{name:<30} " + " ".join(columns))
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names and metrics of cases that regressed by more than ``threshold``."""
+    regressions = []
+    print(
+        f"\n{'vs. baseline':<30} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'peak KiB':>9} "
+        + " ".join(f"{metric.split('_')[0]:>8}" for metric in COMPARED)
+    )
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        print_row(name, result, baseline[name])
+        for metric in COMPARED:
+            if result[metric] > baseline[name][metric] * (1 + threshold):
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--filter", default="", help="only run cases containing this string")
+    parser.add_argument("--save", type=Path, help="write the results to this baseline file")
+    parser.add_argument("--compare", type=Path, help="compare against this baseline file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+    if args.iterations < 1 or args.concurrency < 1:
+        parser.error("--iterations and --concurrency must be at least 1")
+
+    print(f"{'case':<30} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'peak KiB':>9}")
+    results = asyncio.run(run(args.iterations, args.concurrency, args.filter))
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "iterations": args.iterations,
+                    "concurrency": args.concurrency,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}: " + ", ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
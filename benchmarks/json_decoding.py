@@ -0,0 +1,126 @@
+"""
+JSON decoding throughput per backend and event-loop stalls while decoding.
+
+Decodes courses.json-like payloads of several sizes with every installed
+backend (orjson, msgspec, json), then measures the worst event-loop stall
+observed by a ticker task while a payload is decoded inline vs. offloaded to a
+worker thread (``JSONDecoder.decode_async``), and finally the peak memory of
+buffering a download before decoding vs. parsing it while it streams in
+(``StreamingArrayParser``).
+
+Usage:
+    python benchmarks/json_decoding.py [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from memory_workers import make_payload  # noqa: E402
+
+from data_api.data.decoding import DECODERS, JSONDecoder, StreamingArrayParser  # noqa: E402
+
+# Roughly buses.json, dining.json, announcements.json and courses.json
+SIZES = (200, 2000, 10000, 40000)
+
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time of ``repeat`` calls in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def max_stall(decoder: JSONDecoder, raw: bytes) -> float:
+    """Longest gap in seconds between 1 ms ticks while ``raw`` is decoded."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await decoder.decode_async(raw)
+    done = True
+    await task
+    return worst
+
+
+def buffered(chunks: list[bytes]):
+    """Download fully, then decode (the non-streaming path)."""
+    raw = b"".join(chunks)
+    return JSONDecoder().decode(raw)
+
+
+def streamed(chunks: list[bytes]):
+    """Parse chunks as they arrive."""
+    parser = StreamingArrayParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def peak_memory(func, chunks: list[bytes]) -> tuple[float, float]:
+    """Wall time in seconds and peak traced memory in bytes of ``func(chunks)``."""
+    start = time.perf_counter()
+    func(chunks)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    result = func(chunks)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return duration, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {rows: json.dumps(make_payload(rows), ensure_ascii=False).encode() for rows in SIZES}
+
+    print(f"{'rows':>6} {'size':>9} " + " ".join(f"{name:>9}" for name in DECODERS))
+    for rows, raw in payloads.items():
+        timings = [best_of(lambda: decode(raw), args.repeat) for decode in DECODERS.values()]
+        print(
+            f"{rows:>6} {len(raw) / 1024:>5.0f} KiB "
+            + " ".join(f"{t * 1000:>6.2f} ms" for t in timings)
+        )
+
+    print(f"\nworst event-loop stall while decoding ({next(iter(DECODERS))})")
+    print(f"{'rows':>6} {'inline':>9} {'offloaded':>10}")
+    for rows, raw in payloads.items():
+        inline = asyncio.run(max_stall(JSONDecoder(offload_threshold=None), raw))
+        offloaded = asyncio.run(max_stall(JSONDecoder(offload_threshold=0), raw))
+        print(f"{rows:>6} {inline * 1000:>6.1f} ms {offloaded * 1000:>7.1f} ms")
+
+    print("\npeak memory while downloading in 64 KiB chunks (time without tracing)")
+    print(f"{'rows':>6} {'buffered':>22} {'streamed':>22}")
+    for rows, raw in payloads.items():
+        chunks = [raw[i : i + 65536] for i in range(0, len(raw), 65536)]
+        columns = []
+        for func in (buffered, streamed):
+            duration, peak = peak_memory(func, chunks)
+            columns.append(f"{peak / 2**20:>7.1f} MiB {duration * 1000:>7.1f} ms")
+        print(f"{rows:>6} " + " ".join(f"{column:>22}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
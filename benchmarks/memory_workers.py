@@ -0,0 +1,118 @@
+"""
+Per-worker memory and upstream usage: independent workers vs. shared snapshots.
+
+Spawns N worker processes that each materialize a courses.json-sized payload,
+either by downloading and parsing JSON themselves ("independent", the default
+deployment) or by attaching to the refresher's shared snapshot ("shared",
+``SHARED_SNAPSHOTS=true``). Reports RSS after loading, peak RSS (VmHWM) while
+loading, and how many upstream downloads the host performed.
+
+Usage:
+    python benchmarks/memory_workers.py [--workers 4] [--rows 40000]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from data_api.data.shared import SharedStore  # noqa: E402
+from data_api.data.snapshot import SnapshotStore  # noqa: E402
+
+ENDPOINT = "/courses.json"
+
+
+def make_payload(rows: int) -> list[dict]:
+    """Build a courses.json-like payload with the given number of rows."""
+    return [
+        {
+            "科號": f"11310CS {i:06d}",
+            "課程中文名稱": f"資料結構與演算法 第{i}班",
+            "課程英文名稱": f"Data Structures and Algorithms Section {i}",
+            "學分數": str(i % 4 + 1),
+            "人限": str(i % 120),
+            "授課教師": f"王小明 WANG, XIAO-MING {i % 300}",
+            "教室與上課時間": f"DELTA{i % 50:03d}M3M4R3",
+            "備註": "本課程以英語授課" if i % 3 == 0 else "",
+        }
+        for i in range(rows)
+    ]
+
+
+def proc_status_kib(field: str) -> int:
+    """Read a memory field from /proc/self/status in KiB (Linux)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def rss_kib() -> int:
+    """Current resident set size in KiB."""
+    return proc_status_kib("VmRSS:")
+
+
+def worker(mode: str, directory: str, raw_path: str, queue) -> None:
+    baseline = rss_kib()
+    if mode == "independent":
+        # Simulates DataFetcher: hold the raw body, then parse it
+        raw = Path(raw_path).read_bytes()
+        data = json.loads(raw)
+        del raw
+    else:
+        _, data = SharedStore(SnapshotStore(directory)).read(ENDPOINT)
+    queue.put(
+        {
+            "rows": len(data),
+            "rss": rss_kib() - baseline,
+            "peak": proc_status_kib("VmHWM:") - baseline,
+        }
+    )
+
+
+def run(mode: str, workers: int, directory: str, raw_path: str) -> list[dict]:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(mode, directory, raw_path, queue)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=40000)
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows)
+    raw = json.dumps(payload, ensure_ascii=False).encode()
+
+    with tempfile.TemporaryDirectory() as directory:
+        raw_path = Path(directory) / "courses.json"
+        raw_path.write_bytes(raw)
+        SnapshotStore(directory).save(ENDPOINT, "abc123", payload)
+        snapshot_size = SnapshotStore(directory).path_for(ENDPOINT).stat().st_size
+
+        print(f"payload: {args.rows} rows, JSON {len(raw) / 1024:.0f} KiB, ", end="")
+        print(f"snapshot {snapshot_size / 1024:.0f} KiB, {args.workers} workers\n")
+        print(f"{'mode':<12} {'upstream':>8} {'RSS/worker':>12} {'peak/worker':>12}")
+        for mode, downloads in (("independent", args.workers), ("shared", 1)):
+            results = run(mode, args.workers, directory, str(raw_path))
+            rss = sum(r["rss"] for r in results) / len(results) / 1024
+            peak = sum(r["peak"] for r in results) / len(results) / 1024
+            print(f"{mode:<12} {downloads:>8} {rss:>9.1f} MiB {peak:>9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Scaling curves of the services on synthetic data at 1x, 10x and 100x size.
+
+Serves ``synthetic.payloads(scale)`` through the mock upstream and times, per
+scale: loading courses (download, decode, ``CourseData`` conversion),
+``CoursesService.query``, the department, location and announcement fuzzy
+searches, rebuilding the bus registries and a stop lookup. The byte budgets of
+``nthudata`` are lifted so the large payloads are accepted.
+
+Usage:
+    python benchmarks/scaling.py [--scales 1 10 100] [--repeat 3] [--output curves.json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from mock_upstream import MockUpstream  # noqa: E402
+from synthetic import payloads  # noqa: E402
+
+from data_api.data.manager import nthudata  # noqa: E402
+from data_api.domain.announcements.services import announcements_service  # noqa: E402
+from data_api.domain.buses.services import Timetable, buses_service  # noqa: E402
+from data_api.domain.courses.models import Conditions  # noqa: E402
+from data_api.domain.courses.services import courses_service  # noqa: E402
+from data_api.domain.departments.services import departments_service  # noqa: E402
+from data_api.domain.locations.services import locations_service  # noqa: E402
+
+
+async def load_courses():
+    await courses_service.update_data()
+
+
+async def query_courses():
+    query = Conditions("chinese_title", "資料", True) | Conditions("teacher", "^王", True)
+    courses_service.query(query)
+
+
+async def search_departments():
+    await departments_service.fuzzy_search_departments_and_people("王小明")
+
+
+async def search_locations():
+    await locations_service.fuzzy_search_locations("綜二館")
+
+
+async def search_announcements():
+    await announcements_service.fuzzy_search_announcements(title="選課公告")
+
+
+async def process_buses():
+    # Start from an empty timetable, or the rebuild reuses every unchanged schedule
+    buses_service._timetable = Timetable()
+    buses_service.last_commit_hash = None
+    await buses_service.update_data()
+
+
+async def query_stop():
+    buses_service.get_stop_schedule("北校門口", "all", "weekday", "up")
+
+
+CASES: dict[str, Callable[[], Awaitable[None]]] = {
+    "courses load": load_courses,
+    "courses query": query_courses,
+    "departments fuzzy": search_departments,
+    "locations fuzzy": search_locations,
+    "announcements fuzzy": search_announcements,
+    "buses process": process_buses,
+    "buses stop query": query_stop,
+}
+
+
+async def best_of(func: Callable[[], Awaitable[None]], repeat: int) -> float:
+    """Best wall time of ``repeat`` awaited calls in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def run(scales: list[float], repeat: int) -> dict[str, dict]:
+    upstream = MockUpstream()
+    nthudata.fetcher.max_bytes = None
+    nthudata.endpoint_max_bytes = {}
+    nthudata.cache.max_bytes = None
+
+    curves: dict[str, dict] = {}
+    with upstream.install():
+        for scale in scales:
+            sizes = {}
+            for file_name, payload in payloads(scale).items():
+                body = json.dumps(payload, ensure_ascii=False).encode()
+                upstream.set(file_name, body)
+                sizes[file_name] = len(body)
+            await nthudata.file_details_manager.refresh()
+            # Download every file once so the timings below exclude it
+            for file_name in sizes:
+                await nthudata.get(file_name)
+
+            timings = {}
+            for name, func in CASES.items():
+                # courses load measures the download too
+                if name == "courses load":
+                    timings[name] = await best_of(load_courses, 1)
+                    continue
+                await func()
+                timings[name] = await best_of(func, repeat)
+            curves[str(scale)] = {"bytes": sizes, "seconds": timings}
+            print_row(scale, timings, curves[str(scales[0])]["seconds"])
+    return curves
+
+
+def print_row(scale: float, timings: dict[str, float], base: dict[str, float]) -> None:
+    print(
+        f"{scale:>6g}x "
+        + " ".join(
+            f"{timings[name] * 1000:>9.2f} ({timings[name] / base[name] if base[name] else 0:>5.1f}x)"
+            for name in CASES
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write the curves to this JSON file")
+    args = parser.parse_args()
+
+    print("milliseconds (growth vs. the first scale)")
+    print(f"{'scale':>7} " + " ".join(f"{name:>18}" for name in CASES))
+    curves = asyncio.run(run(args.scales, args.repeat))
+    if args.output:
+        args.output.write_text(json.dumps(curves, indent=2))
+
+
+if __name__ == "__main__":
+    main()
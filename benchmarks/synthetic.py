@@ -0,0 +1,265 @@
+"""
+Synthetic, schema-faithful data.nthusa.tw payloads at configurable sizes.
+
+Each generator produces the same structure and field names as the live file
+(see the recorded samples in ``tests/mock_upstream/fixtures``), with
+deterministic pseudo-random contents. ``SIZES`` holds the roughly production
+sized parameters, which ``payloads`` multiplies by a scale factor.
+
+Usage:
+    python benchmarks/synthetic.py --scale 10 --output /tmp/synthetic
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+SURNAMES = "王李張劉陳楊黃趙吳周徐孫馬朱胡郭何林羅高"
+GIVEN_NAMES = ["小明", "大文", "美玲", "志豪", "淑芬", "建宏", "怡君", "家豪", "雅婷", "俊傑"]
+SUBJECTS = [
+    ("資料結構", "Data Structures"),
+    ("演算法", "Algorithms"),
+    ("微積分", "Calculus"),
+    ("線性代數", "Linear Algebra"),
+    ("普通物理", "General Physics"),
+    ("有機化學", "Organic Chemistry"),
+    ("計算機網路", "Computer Networks"),
+    ("作業系統", "Operating Systems"),
+    ("機率與統計", "Probability and Statistics"),
+    ("經濟學原理", "Principles of Economics"),
+    ("中國文學史", "History of Chinese Literature"),
+    ("英文寫作", "English Writing"),
+]
+DEPARTMENT_CODES = ["CS", "EE", "MATH", "PHYS", "CHEM", "ECON", "CL", "FL", "LS", "MS", "IEEM"]
+BUILDINGS = ["資電館", "台達館", "人社院", "綜二館", "綜三館", "化學館", "物理館", "生科館"]
+DAYS = "MTWRF"
+PERIODS = "1234n56789abc"
+TITLES = ["系主任", "教授", "副教授", "助理教授", "講師", "行政專員", "技士", "組長"]
+UNITS = ["教務處", "學務處", "總務處", "研發處", "圖書館", "計算機與通訊中心", "國際處"]
+TOPICS = ["選課公告", "獎學金申請", "校園停電通知", "宿舍申請作業", "期末考試注意事項", "徵才資訊"]
+NANDA_DESCRIPTIONS = ["", "路線二經過教育學院", "83路公車"]
+
+# Roughly production-sized parameters at scale 1
+SIZES = {
+    "courses": 3000,  # rows
+    "announcements": (60, 30),  # sources, articles per source (scaled)
+    "directory": (150, 15),  # departments (scaled), people per department
+    "maps": 150,  # locations
+    "buses": 1,  # departures multiplier of the recorded schedule
+}
+
+
+def name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES)
+
+
+def courses(rows: int, seed: int = 0) -> list[dict]:
+    """courses.json with ``rows`` courses."""
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        chinese, english = rng.choice(SUBJECTS)
+        code = rng.choice(DEPARTMENT_CODES)
+        teacher = name(rng)
+        slots = "".join(rng.choice(DAYS) + rng.choice(PERIODS) for _ in range(rng.randint(1, 3)))
+        data.append(
+            {
+                "科號": f"11310{code:<4} {i:06d}",
+                "課程中文名稱": f"{chinese}{'一二三四'[i % 4]}",
+                "課程英文名稱": f"{english} {'I' * (i % 4 + 1)}",
+                "學分數": str(rng.randint(1, 4)),
+                "人限": str(rng.choice([30, 60, 90, 120, ""])),
+                "新生保留人數": str(rng.choice([0, 5, 10])),
+                "通識對象": "",
+                "通識類別": rng.choice(["", "核心通識Core GE courses 1", "自然科學"]),
+                "授課語言": rng.choice("中中中英"),
+                "備註": rng.choice(["", "需自備筆電", "本課程以英語授課"]),
+                "停開註記": "停開" if i % 97 == 0 else "",
+                "教室與上課時間": f"{rng.choice(BUILDINGS)}{rng.randint(100, 599)}\t{slots}\t",
+                "授課教師": f"{teacher}\tWANG, XIAO-MING\t",
+                "擋修說明": "",
+                "課程限制說明": rng.choice(["", "限本系生修習"]),
+                "第一二專長對應": "",
+                "學分學程對應": "",
+                "不可加簽說明": "",
+                "必選修說明": f"{code}必修" if i % 3 == 0 else f"{code}選修",
+            }
+        )
+    return data
+
+
+def announcements(sources: int, articles: int, seed: int = 0) -> list[dict]:
+    """announcements.json with ``sources`` sources of ``articles`` articles each."""
+    rng = random.Random(seed)
+    data = []
+    for i in range(sources):
+        department = f"{UNITS[i % len(UNITS)]}{i // len(UNITS) or ''}"
+        data.append(
+            {
+                "title": f"{department}公告",
+                "link": f"https://www.nthu.edu.tw/p/403-{1000 + i}-1.php",
+                "language": "en" if i % 5 == 4 else "zh-tw",
+                "department": department,
+                "articles": [
+                    {
+                        "title": f"{rng.choice(TOPICS)}（{j + 1}）",
+                        "link": f"https://www.nthu.edu.tw/p/{400000 + i * articles + j}.php",
+                        "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    }
+                    for j in range(articles)
+                ],
+            }
+        )
+    return data
+
+
+def directory(departments: int, people: int, seed: int = 0) -> list[dict]:
+    """directory.json with ``departments`` units of ``people`` people each."""
+    rng = random.Random(seed)
+    data = []
+    for i in range(departments):
+        code = f"{DEPARTMENT_CODES[i % len(DEPARTMENT_CODES)].lower()}{i}"
+        data.append(
+            {
+                "index": f"{i:02d}",
+                "name": f"{rng.choice(UNITS + BUILDINGS)}{i}",
+                "parent_name": rng.choice(["工學院", "理學院", "人文社會學院", ""]),
+                "url": f"https://{code}.site.nthu.edu.tw/",
+                "details": {
+                    "departments": [],
+                    "contact": {
+                        "extension": str(30000 + i),
+                        "phone": "03-5715131",
+                        "fax": "03-5722713",
+                        "email": f"office@{code}.nthu.edu.tw",
+                        "website": f"https://{code}.site.nthu.edu.tw/",
+                    },
+                    "people": [
+                        {
+                            "name": name(rng),
+                            "title": rng.choice(TITLES),
+                            "extension": str(30000 + i * people + j),
+                            "email": f"{code}{j}@mx.nthu.edu.tw",
+                            "note": "",
+                        }
+                        for j in range(people)
+                    ],
+                },
+            }
+        )
+    return data
+
+
+def maps(locations: int, seed: int = 0) -> dict:
+    """maps.json with ``locations`` locations split over both campuses."""
+    rng = random.Random(seed)
+    data = {"main": {}, "nanda": {}}
+    for i in range(locations):
+        campus = "main" if i % 4 else "nanda"
+        data[campus][f"{rng.choice(BUILDINGS)}{i}"] = {
+            "latitude": f"{24.78 + rng.random() * 0.02:.5f}",
+            "longitude": f"{120.96 + rng.random() * 0.04:.5f}",
+        }
+    return data
+
+
+def departure_times(count: int, start: int = 7 * 60, end: int = 23 * 60) -> list[str]:
+    """``count`` departure times spread evenly over the service hours."""
+    step = (end - start) / max(count, 1)
+    return [
+        f"{int(start + i * step) // 60:02d}:{int(start + i * step) % 60:02d}" for i in range(count)
+    ]
+
+
+def buses(multiplier: int, seed: int = 0) -> dict:
+    """buses.json with ``multiplier`` times the recorded number of departures."""
+    rng = random.Random(seed)
+    info = {
+        "towardTSMCBuildingInfo": (
+            "往台積館",
+            "北校門口 → 綜二館 → 楓林小徑 → 人社院&生科館 → 台積館",
+        ),
+        "towardMainGateInfo": (
+            "往校門口",
+            "台積館 → 教育學院大樓&南門停車場 → 奕園停車場 → 綜二館 → 北校門口",
+        ),
+        "towardNandaInfo": ("往南大校區", "北校門口 → 綜二館 → 人社院&生科館 → 台積館 → 南大校區"),
+        "towardMainCampusInfo": (
+            "往校本部",
+            "南大校區 → 台積館 → 人社院&生科館 → 綜二館 → 北校門口",
+        ),
+    }
+    # schedule key -> (weekday departures, weekend departures, departure stops or None for Nanda)
+    schedules = {
+        "TSMCBuilding": (44, 22, ["校門"]),
+        "MainGate": (44, 22, ["台積館", "台積館", "台積館", "綜二館"]),
+        "Nanda": (15, 8, None),
+        "MainCampus": (14, 7, None),
+    }
+
+    data = {}
+    for (info_key, (direction, route)), (target, counts) in zip(info.items(), schedules.items()):
+        data[info_key] = {
+            "direction": direction,
+            "duration": "2024/09/01 ~ 2025/01/31",
+            "route": route,
+            "routeEN": route,
+        }
+        *day_counts, dep_stops = counts
+        for day, count in zip(("weekday", "weekend"), day_counts):
+            entries = []
+            for time in departure_times(count * multiplier):
+                if dep_stops is None:
+                    entries.append({"time": time, "description": rng.choice(NANDA_DESCRIPTIONS)})
+                else:
+                    entries.append(
+                        {
+                            "time": time,
+                            "description": rng.choice(["", "", "大型巴士"]),
+                            "dep_stop": rng.choice(dep_stops),
+                            "line": rng.choice(["red", "green"]),
+                        }
+                    )
+            data[f"{day}BusScheduleToward{target}"] = entries
+    return data
+
+
+def payloads(scale: float = 1, seed: int = 0) -> dict[str, object]:
+    """
+    All synthetic datasets at ``scale`` times the production size.
+
+    Returns:
+        Dict mapping the data.nthusa.tw file name to its payload.
+    """
+
+    def scaled(n: int) -> int:
+        return max(1, round(n * scale))
+
+    sources, articles = SIZES["announcements"]
+    departments, people = SIZES["directory"]
+    return {
+        "courses.json": courses(scaled(SIZES["courses"]), seed),
+        "announcements.json": announcements(sources, scaled(articles), seed),
+        "directory.json": directory(scaled(departments), people, seed),
+        "maps.json": maps(scaled(SIZES["maps"]), seed),
+        "buses.json": buses(scaled(SIZES["buses"]), seed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    for file_name, payload in payloads(args.scale, args.seed).items():
+        path = args.output / file_name
+        path.write_text(json.dumps(payload, ensure_ascii=False))
+        print(f"{path} ({path.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
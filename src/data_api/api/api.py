@@ -5,63 +5,111 @@ Creates the FastAPI app instance, configures middleware,
 and registers all routers.
 """
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from data_api.core import config
+from data_api.core import config, metrics
 from data_api.core.settings import settings
-from data_api.data.manager import nthudata
+from data_api.data.manager import nthudata, refresher, views, warmup
 from data_api.domain.buses import services as buses_services
 from data_api.mcp import mcp
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan manager for startup and shutdown tasks."""
-    # Startup: Pre-fetch configured endpoints
-    print("Starting application...")
-    print(f"Pre-fetching {len(config.PREFETCH_ENDPOINTS)} endpoints...")
-    results = await nthudata.prefetch(config.PREFETCH_ENDPOINTS)
+async def prefetch_endpoints() -> bool:
+    """Warmup stage: fetch the PREFETCH_ENDPOINTS not already cached (e.g. from snapshots)."""
+    endpoints = [
+        endpoint for endpoint in config.PREFETCH_ENDPOINTS if not nthudata.is_cached(endpoint)
+    ]
+    if not endpoints:
+        return True
 
-    success_count = sum(1 for success in results.values() if success)
-    print(f"Pre-fetch complete: {success_count}/{len(config.PREFETCH_ENDPOINTS)} endpoints loaded")
+    print(f"Pre-fetching {len(endpoints)} endpoints...")
+    results = await nthudata.prefetch(
+        endpoints,
+        max_concurrency=settings.prefetch_concurrency,
+        timeout=settings.prefetch_timeout,
+    )
 
-    for endpoint, success in results.items():
-        status = "✓" if success else "✗"
-        print(f"  {status} {endpoint}")
+    success_count = sum(1 for result in results.values() if result["success"])
+    print(f"Pre-fetch complete: {success_count}/{len(endpoints)} endpoints loaded")
 
-    # Initialize module-specific data processors
-    print("Initializing data processors...")
-    await buses_services.buses_service.update_data()
+    for endpoint, result in results.items():
+        status = "✓" if result["success"] else "✗"
+        print(f"  {status} {endpoint} ({result['duration']:.2f}s, {result['bytes']} bytes)")
+    return success_count == len(endpoints)
 
+
+async def initialize_processors() -> bool:
+    """Warmup stage: build the bus schedule registries and the course list."""
     from data_api.domain.courses import services as courses_services
 
+    print("Initializing data processors...")
+    await buses_services.buses_service.update_data()
     await courses_services.courses_service.update_data()
-    print("Data processors initialized.")
+    return (
+        buses_services.buses_service.last_commit_hash is not None
+        and courses_services.courses_service.last_commit_hash is not None
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager for startup and shutdown tasks."""
+    # Startup: Serve on-disk snapshots immediately if available, validating them in the
+    # background, and warm up everything else before reporting ready
+    print("Starting application...")
+    validation_task = None
+    snapshot_endpoints = nthudata.load_snapshots()
+    if snapshot_endpoints:
+        print(f"Loaded {len(snapshot_endpoints)} snapshots from disk, validating in background...")
+        endpoints = list(dict.fromkeys([*config.PREFETCH_ENDPOINTS, *snapshot_endpoints]))
+        validation_task = asyncio.create_task(
+            nthudata.validate_snapshots(
+                endpoints,
+                max_concurrency=settings.prefetch_concurrency,
+                timeout=settings.prefetch_timeout,
+            )
+        )
+
+    warmup.add_stage("prefetch", prefetch_endpoints)
+    warmup.add_stage("processors", initialize_processors)
+    warmup.add_stage("views", views.warm)
+    if not await warmup.run():
+        # Keep serving, but report not ready until the hot data is materialized
+        warmup.start()
+
+    # Keep data fresh in the background instead of on the request path
+    if settings.refresh_interval > 0:
+        from data_api.domain.courses import services as courses_services
+
+        for endpoint in config.PREFETCH_ENDPOINTS:
+            refresher.register(endpoint)
+        refresher.register("buses.json", buses_services.buses_service.update_data)
+        refresher.register("courses.json", courses_services.courses_service.update_data)
+        refresher.start()
 
     yield
 
-    # Shutdown: cleanup if needed
+    # Shutdown: release pooled upstream connections
     print("Shutting down application...")
+    await warmup.stop()
+    await refresher.stop()
+    if validation_task is not None and not validation_task.done():
+        validation_task.cancel()
+    await nthudata.aclose()
 
 
-def create_app() -> FastAPI:
+def configure_middleware(app: FastAPI) -> None:
     """
-    Create and configure the FastAPI application.
+    Add the CORS, process time and data freshness middleware.
 
-    Returns:
-        FastAPI: Configured application instance.
+    Args:
+        app: Application to configure.
     """
-    app = FastAPI(
-        lifespan=lifespan,
-        title="NTHU Data API",
-        version="2.0.0",
-        description="由國立清華大學校內各單位資料所組成的公共資料 API。",
-    )
-
     # CORS configuration
     # Using explicit origins would be safer, but for a public API:
     origins = settings.cors_origins  # From settings
@@ -82,6 +130,8 @@ def create_app() -> FastAPI:
         expose_headers=[
             "X-Process-Time",
             "X-Data-Commit-Hash",
+            "X-Data-Age",
+            "X-Data-Degraded",
         ],
     )
 
@@ -92,8 +142,47 @@ def create_app() -> FastAPI:
         response = await call_next(request)
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
+        # Label by route template, not the raw path, to keep the number of series bounded
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_DURATION.observe(
+            process_time,
+            request.method,
+            route.path if route is not None else "unmatched",
+            getattr(route, "operation_id", None) or "",
+            str(response.status_code),
+        )
         return response
 
+    # Data freshness middleware
+    @app.middleware("http")
+    async def add_data_age_header(request: Request, call_next):
+        response = await call_next(request)
+        data_age = nthudata.data_age
+        if data_age is not None:
+            response.headers["X-Data-Age"] = str(int(data_age))
+        if nthudata.is_degraded:
+            # Data is older than the allowed maximum staleness
+            response.headers["X-Data-Degraded"] = "true"
+            response.headers["Warning"] = '110 - "Response is Stale"'
+        return response
+
+
+def create_app() -> FastAPI:
+    """
+    Create and configure the FastAPI application.
+
+    Returns:
+        FastAPI: Configured application instance.
+    """
+    app = FastAPI(
+        lifespan=lifespan,
+        title="NTHU Data API",
+        version="2.0.0",
+        description="由國立清華大學校內各單位資料所組成的公共資料 API。",
+    )
+
+    configure_middleware(app)
+
     # Add favicon route
     @app.get("/favicon.ico", include_in_schema=False)
     async def favicon():
@@ -113,6 +202,7 @@ def create_app() -> FastAPI:
         libraries,
         locations,
         newsletters,
+        status,
     )
 
     app.include_router(announcements.router, prefix="/announcements", tags=["Announcements"])
@@ -124,6 +214,7 @@ def create_app() -> FastAPI:
     app.include_router(libraries.router, prefix="/libraries", tags=["Libraries"])
     app.include_router(locations.router, prefix="/locations", tags=["Locations"])
     app.include_router(newsletters.router, prefix="/newsletters", tags=["Newsletters"])
+    app.include_router(status.router, tags=["Status"])
 
     return app
 
@@ -134,11 +225,22 @@ fast_api_app = create_app()
 # MCP Integration - Using curated MCP tools designed for LLM agents
 mcp_app = mcp.http_app(path="/mcp", transport="streamable-http", stateless_http=True)
 
+
+@asynccontextmanager
+async def combined_lifespan(app: FastAPI):
+    """Run the MCP session manager and the application lifespan together."""
+    async with mcp_app.lifespan(app):
+        async with lifespan(app):
+            yield
+
+
+# Routes are copied, so the middleware has to be configured on the combined app as well
 combined_app = FastAPI(
     title=fast_api_app.title,
     version=fast_api_app.version,
     description=fast_api_app.description,
     routes=[*mcp_app.routes, *fast_api_app.routes],
-    lifespan=mcp_app.lifespan,
+    lifespan=combined_lifespan,
 )
+configure_middleware(combined_app)
 app = combined_app
@@ -10,6 +10,7 @@ from . import (
     libraries,
     locations,
     newsletters,
+    status,
 )
 
 __all__ = [
@@ -22,4 +23,5 @@ __all__ = [
     "libraries",
     "locations",
     "newsletters",
+    "status",
 ]
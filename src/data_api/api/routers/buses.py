@@ -6,7 +6,7 @@ Delegates business logic to domain services.
 """
 
 from datetime import datetime
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
@@ -49,7 +49,7 @@ async def get_bus_route_metadata(
     - 校本部來自[總務處事務組](https://affairs.site.nthu.edu.tw/p/412-1165-20978.php?Lang=zh-tw)
     - 南大來自[總務處事務組](https://affairs.site.nthu.edu.tw/p/412-1165-20979.php?Lang=zh-tw)
     """
-    await services.buses_service.update_data()
+    await services.buses_service.update_on_request()
     try:
         return services.buses_service.get_route_info(bus_type, direction)
     except Exception as e:
@@ -64,7 +64,7 @@ async def get_bus_route_metadata(
 )
 async def get_bus_stops_information():
     """取得所有公車站牌的經緯度與資訊。"""
-    await services.buses_service.update_data()
+    await services.buses_service.update_on_request()
     try:
         return services.buses_service.gen_bus_stops_info()
     except Exception as e:
@@ -90,29 +90,21 @@ async def get_bus_schedules(
     - **details=False**: 回傳簡易時刻表（僅發車時間）。
     - **details=True**: 回傳詳細時刻表（包含每站預估到達時間）。
     """
-    await services.buses_service.update_data()
+    await services.buses_service.update_on_request()
 
     # 1. 計算要查詢的時間點與模式
     find_day, after_time = (day, query.time) if day != "current" else get_current_time_state()
 
     try:
-        time_path = ["dep_info", "time"] if details else ["time"]
-        raw_data = services.buses_service.get_schedule(
+        return services.buses_service.get_next_departures(
             route_type=bus_type,
             day=find_day,
             direction=direction,
+            after=after_time or "",
+            limit=query.limits,
             detailed=details,
         )
 
-        res = services.after_specific_time(
-            raw_data,
-            after_time or "",
-            time_path,
-        )
-
-        limit = query.limits
-        return res[:limit]
-
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve bus schedule: {e}")
 
@@ -131,23 +123,47 @@ async def get_stop_bus_information_by_stop(
     query: schemas.BusQuery = Depends(),
 ):
     """取得指定公車站牌的資訊和即將停靠公車。"""
-    await services.buses_service.update_data()
+    await services.buses_service.update_on_request()
 
     # Time calculation logic...
     find_day, after_time = (day, query.time) if day != "current" else get_current_time_state()
 
     # Updated: Query via Service instead of Stop Instance
-    raw_data = services.buses_service.get_stop_schedule(stop_name, bus_type, find_day, direction)
+    return services.buses_service.get_next_arrivals(
+        stop_name, bus_type, find_day, direction, after_time or "", query.limits
+    )
 
-    if not raw_data and not services.buses_service.stops_schedule_registry:
-        # Handle case where registry might be empty/error
-        pass
 
-    res = services.after_specific_time(
-        raw_data,
-        after_time or "",
-        ["arrive_time"],
-    )
+@router.get(
+    "/plan",
+    response_model=schemas.BusJourneyPlan,
+    dependencies=[Depends(add_custom_header)],
+    operation_id="planBusJourney",
+)
+async def plan_bus_journey(
+    from_stop: schemas.BusStopsName = Query(..., alias="from", description="出發站牌"),
+    to_stop: schemas.BusStopsName = Query(..., alias="to", description="目的站牌"),
+    depart_after: Optional[str] = Query(
+        None, description="最早出發時間 (HH:MM)。未提供時為目前時刻。"
+    ),
+    day: schemas.BusDayWithCurrent = Query("current", description="平日、假日或目前時刻"),
+):
+    """
+    規劃兩站之間最早抵達的搭車路線。
+    - 包含校本部與南大區間車之間的轉乘。
+    - 往南大的區間車僅能在南大下車，往校本部的區間車僅能在南大上車。
+    """
+    await services.buses_service.update_on_request()
 
-    limit = query.limits
-    return res[:limit]
+    current_day, current_time = get_current_time_state()
+    find_day = current_day if day == "current" else day
+
+    try:
+        plan = services.buses_service.plan_journey(
+            from_stop.value, to_stop.value, find_day, depart_after or current_time
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if plan is None:
+        raise HTTPException(status_code=404, detail="找不到可抵達的公車班次")
+    return plan
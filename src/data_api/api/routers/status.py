@@ -0,0 +1,70 @@
+"""Health, readiness, cache status and metrics router."""
+
+from fastapi import APIRouter, Response
+from fastapi.responses import PlainTextResponse
+
+from data_api.api.schemas import status as schemas
+from data_api.core import metrics
+from data_api.data.manager import nthudata, views, warmup
+from data_api.domain.buses.services import buses_service
+from data_api.domain.courses.services import courses_service
+
+router = APIRouter()
+
+# Processors whose state is materialized from one dataset: endpoint -> (index name, service)
+PROCESSORS = {
+    "/buses.json": ("buses.registry", buses_service),
+    "/courses.json": ("courses.list", courses_service),
+}
+
+
+@router.get("/health", response_model=schemas.Health, operation_id="getHealth")
+async def get_health():
+    """
+    確認服務是否存活（不檢查資料）。
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=schemas.Readiness, operation_id="getReadiness")
+async def get_readiness(response: Response):
+    """
+    確認熱資料是否已載入完成；尚未完成時回傳 503。
+    """
+    status = warmup.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
+
+@router.get("/_status/cache", response_model=schemas.CacheStatus, operation_id="getCacheStatus")
+async def get_cache_status():
+    """
+    取得各資料集的快取狀態與衍生索引建立情形（不會連線至上游）。
+    """
+    status = nthudata.status()
+    datasets = status["datasets"]
+    for name, view in views.stats().items():
+        dataset = datasets.get(view["endpoint"])
+        if dataset is not None:
+            dataset.setdefault("indexes", {})[name] = (
+                view["cached"] and view["commit_hash"] == dataset["commit_hash"]
+            )
+    for endpoint_name, (name, service) in PROCESSORS.items():
+        dataset = datasets.get(endpoint_name)
+        if dataset is not None:
+            dataset.setdefault("indexes", {})[name] = (
+                service.last_commit_hash == dataset["commit_hash"]
+            )
+    status["views_size"] = views.total_size
+    return status
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    以 Prometheus 文字格式輸出請求、上游下載、快取與資料處理指標。
+    """
+    return PlainTextResponse(
+        metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
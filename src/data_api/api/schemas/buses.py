@@ -33,6 +33,8 @@ __all__ = [
     "BusStopsQueryResult",
     "BusArriveTime",
     "BusDetailedSchedule",
+    "BusJourneyLeg",
+    "BusJourneyPlan",
     "BusMainData",
     "BusNandaData",
 ]
@@ -107,6 +109,36 @@ class BusDetailedSchedule(BaseModel):
     stops_time: list[BusArriveTime] = Field(..., description="各站發車時間")
 
 
+class BusJourneyLeg(BaseModel):
+    """One bus ride of a journey."""
+
+    route_type: BusRouteType = Field(..., description="路線類型")
+    direction: BusDirection = Field(..., description="上山或下山")
+    line: str = Field("", description="路線 (主校區: red/green, 南大: route_1/route_2)")
+    bus_type: BusType = Field(..., description="營運車輛類型")
+    description: str = Field(..., description="備註")
+    dep_time: str = Field(..., description="該班次發車時間")
+    board_stop: str = Field(..., description="上車站牌")
+    board_time: str = Field(..., description="預計上車時間")
+    alight_stop: str = Field(..., description="下車站牌")
+    alight_time: str = Field(..., description="預計下車時間")
+    stops: list[BusArriveTime] = Field(..., description="沿途各站預計到達時間")
+
+
+class BusJourneyPlan(BaseModel):
+    """Earliest-arrival journey between two bus stops."""
+
+    from_stop: str = Field(..., description="出發站牌")
+    to_stop: str = Field(..., description="目的站牌")
+    day: BusDay = Field(..., description="平日或假日")
+    depart_after: str = Field(..., description="最早出發時間")
+    departure_time: str = Field(..., description="預計上車時間")
+    arrival_time: str = Field(..., description="預計抵達時間")
+    duration: int = Field(..., description="上車至抵達所需分鐘數（含轉乘等候）")
+    transfers: int = Field(..., description="轉乘次數")
+    legs: list[BusJourneyLeg] = Field(..., description="各段搭乘資訊")
+
+
 class BusMainData(BaseModel):
     """Main campus bus data."""
 
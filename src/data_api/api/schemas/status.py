@@ -0,0 +1,57 @@
+"""Health and status API schemas."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class Health(BaseModel):
+    """Liveness status."""
+
+    status: str = Field(..., description="固定為 ok")
+
+
+class WarmupStage(BaseModel):
+    """State of one startup warmup stage."""
+
+    status: str = Field(..., description="pending、running、ok 或 failed")
+    attempts: int = Field(..., description="已執行次數")
+    duration: Optional[float] = Field(None, description="最近一次執行秒數")
+    error: Optional[str] = Field(None, description="最近一次失敗原因")
+    completed_at: Optional[float] = Field(None, description="完成時間（Unix 時間）")
+
+
+class Readiness(BaseModel):
+    """Readiness of this worker."""
+
+    ready: bool = Field(..., description="熱資料是否已載入完成")
+    started_at: Optional[float] = Field(None, description="開始暖機時間（Unix 時間）")
+    ready_at: Optional[float] = Field(None, description="暖機完成時間（Unix 時間）")
+    stages: dict[str, WarmupStage] = Field(..., description="各暖機階段狀態")
+
+
+class DatasetStatus(BaseModel):
+    """Cache status of one dataset."""
+
+    commit_hash: Optional[str] = Field(None, description="快取資料的 commit hash")
+    age: float = Field(..., description="快取存放秒數")
+    size: int = Field(..., description="估計記憶體大小（位元組）")
+    hits: int = Field(..., description="快取命中次數")
+    pinned: bool = Field(..., description="是否不會被淘汰")
+    fetch_duration: Optional[float] = Field(None, description="最近一次下載秒數")
+    fetched_bytes: Optional[int] = Field(None, description="最近一次下載位元組數")
+    fetched_at: Optional[float] = Field(None, description="最近一次下載時間（Unix 時間）")
+    indexes: dict[str, bool] = Field(
+        default_factory=dict, description="衍生索引是否已依目前 commit 建立"
+    )
+
+
+class CacheStatus(BaseModel):
+    """Cache and upstream status of this worker."""
+
+    file_details: dict = Field(..., description="file_details.json 的存放秒數與是否過期")
+    datasets: dict[str, DatasetStatus] = Field(..., description="各資料集快取狀態")
+    errors: dict[str, dict] = Field(..., description="最近一次下載失敗的網址與原因")
+    downloads: dict[str, dict] = Field(..., description="下載中的網址與進度")
+    breakers: dict[str, dict] = Field(..., description="各上游主機的斷路器狀態")
+    views_size: int = Field(..., description="衍生索引估計總大小（位元組）")
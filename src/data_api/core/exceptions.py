@@ -2,6 +2,8 @@
 Custom exceptions for the application.
 """
 
+from typing import Optional
+
 
 class DataAPIException(Exception):
     """Base exception for all Data API errors."""
@@ -19,3 +21,59 @@ class DataUpdateException(DataAPIException):
     """Raised when data update fails."""
 
     pass
+
+
+class UpstreamFetchError(DataUpdateException):
+    """Raised (or recorded) when fetching data from upstream fails."""
+
+    def __init__(
+        self,
+        url: str,
+        kind: str,
+        message: str,
+        status_code: Optional[int] = None,
+        attempts: int = 1,
+    ):
+        """
+        Initialize the error.
+
+        Args:
+            url: URL that failed.
+            kind: "timeout", "connect", "network", "http_status", "decode",
+                "too_large" or "circuit_open".
+            message: Human-readable description.
+            status_code: HTTP status code for "http_status" errors.
+            attempts: Number of attempts made before giving up.
+        """
+        super().__init__(url, kind, message)
+        self.url = url
+        self.kind = kind
+        self.message = message
+        self.status_code = status_code
+        self.attempts = attempts
+
+    def __str__(self) -> str:
+        # Built on demand, since the fetcher updates ``attempts`` while retrying
+        return (
+            f"{self.kind} error fetching {self.url} after {self.attempts} attempt(s): "
+            f"{self.message}"
+        )
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the failure is transient and points at an unhealthy upstream."""
+        if self.kind == "http_status":
+            return self.status_code is not None and (
+                self.status_code >= 500 or self.status_code == 429
+            )
+        return self.kind in ("timeout", "connect", "network")
+
+    def to_dict(self) -> dict:
+        """Structured representation for logs and status endpoints."""
+        return {
+            "url": self.url,
+            "kind": self.kind,
+            "message": self.message,
+            "status_code": self.status_code,
+            "attempts": self.attempts,
+        }
@@ -5,6 +5,7 @@ Settings are loaded from environment variables and .env file.
 """
 
 import os
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -33,6 +34,132 @@ class Settings(BaseSettings):
         description="File details cache expiry time in seconds (default: 5 minutes)",
     )
 
+    file_details_stale_while_revalidate: bool = Field(
+        default=True,
+        description="Serve expired file details immediately and revalidate them in the background",
+    )
+    file_details_max_staleness: float = Field(
+        default=3600,
+        description="Data age in seconds after which responses are flagged as degraded",
+    )
+
+    refresh_interval: float = Field(
+        default=300,
+        description="Seconds between background data refreshes (0 disables the refresher)",
+    )
+    refresh_schedules: dict[str, float] = Field(
+        default_factory=dict,
+        description='Per-endpoint refresh intervals in seconds, e.g. {"courses.json": 3600}',
+    )
+    snapshot_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for on-disk data snapshots used on warm restarts (disabled if unset)",
+    )
+    shared_snapshots: bool = Field(
+        default=False,
+        description="Share snapshot_dir between workers; only one elected worker polls upstream",
+    )
+    prefetch_concurrency: int = Field(
+        default=4,
+        description="Maximum number of endpoints pre-fetched concurrently at startup",
+    )
+    prefetch_timeout: float = Field(
+        default=60.0,
+        description="Per-endpoint pre-fetch timeout in seconds",
+    )
+    warmup_retry_interval: float = Field(
+        default=5.0,
+        description="Seconds before failed startup warmup stages are first retried",
+    )
+    warmup_max_retry_interval: float = Field(
+        default=60.0,
+        description="Upper bound for the doubling delay between warmup retries",
+    )
+
+    data_cache_max_bytes: Optional[int] = Field(
+        default=256 * 1024 * 1024,
+        description=(
+            "Budget for the estimated size of cached upstream data in bytes; least recently "
+            "used endpoints outside PREFETCH_ENDPOINTS are evicted beyond it (unset: unbounded)"
+        ),
+    )
+    derived_views_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Budget for the estimated total size of cached derived views in bytes",
+    )
+    json_decoder: str = Field(
+        default="auto",
+        description='JSON decoder backend: "auto", "orjson", "msgspec" or "json"',
+    )
+    json_offload_threshold: Optional[int] = Field(
+        default=None,
+        description=(
+            "Upstream bodies of at least this many bytes are decoded in a worker thread "
+            "(unset: 256 KiB on free-threaded Python, never otherwise)"
+        ),
+    )
+
+    # Upstream HTTP client settings (shared connection pool for data.nthusa.tw)
+    http_max_connections: int = Field(
+        default=20,
+        description="Maximum number of concurrent upstream connections",
+    )
+    http_max_keepalive_connections: int = Field(
+        default=10,
+        description="Maximum number of idle keep-alive connections kept in the pool",
+    )
+    http_keepalive_expiry: float = Field(
+        default=600.0,
+        description="Seconds an idle keep-alive connection is kept open",
+    )
+    http_timeout: float = Field(
+        default=30.0,
+        description="Upstream read/write/pool timeout in seconds",
+    )
+    http_connect_timeout: float = Field(
+        default=5.0,
+        description="Upstream connect timeout in seconds",
+    )
+
+    # Upstream failure handling
+    fetch_attempts: int = Field(
+        default=3,
+        description="Attempts per upstream fetch for timeouts, connection errors and 5xx/429",
+    )
+    fetch_backoff_base: float = Field(
+        default=0.2,
+        description="Base delay in seconds of the jittered exponential backoff between attempts",
+    )
+    fetch_backoff_max: float = Field(
+        default=5.0,
+        description="Maximum delay in seconds between attempts",
+    )
+    circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failed fetches after which upstream requests are short-circuited",
+    )
+    circuit_reset_timeout: float = Field(
+        default=30.0,
+        description="Seconds to serve cached data only before probing a failing upstream again",
+    )
+
+    # Upstream download limits
+    fetch_max_bytes: Optional[int] = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum size in bytes of one upstream download (unset: unlimited)",
+    )
+    fetch_max_bytes_per_endpoint: dict[str, int] = Field(
+        default_factory=dict,
+        description='Per-endpoint download size limits, e.g. {"courses.json": 134217728}',
+    )
+    stream_parse_min_bytes: Optional[int] = Field(
+        default=1024 * 1024,
+        description=(
+            "Array payloads of at least this many bytes are parsed while downloading "
+            "(unset: always download fully, then decode)"
+        ),
+    )
+
     # API settings
     cors_origins: list[str] = Field(
         default=["*"],
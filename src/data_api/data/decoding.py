@@ -0,0 +1,216 @@
+"""
+JSON decoding backends for upstream payloads.
+
+The fastest installed decoder is used (orjson, then msgspec), falling back to
+the standard library. Large bodies such as courses.json can be decoded in a
+worker thread so that the event loop keeps serving other requests meanwhile.
+All backends hold the GIL while building objects, so this is only enabled by
+default on free-threaded interpreters; elsewhere the faster backend is what
+shortens the stall (see benchmarks/json_decoding.py).
+
+Array-shaped payloads can instead be parsed incrementally while they download
+(``StreamingArrayParser``), so the raw body is never held in full next to the
+parsed result.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+import sys
+from typing import Any, Callable, Optional
+
+Decoder = Callable[[bytes], Any]
+
+# Backends in order of preference; only installed ones are registered
+DECODERS: dict[str, Decoder] = {}
+
+try:
+    import orjson
+
+    DECODERS["orjson"] = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
+try:
+    import msgspec
+
+    DECODERS["msgspec"] = msgspec.json.decode
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
+DECODERS["json"] = json.loads
+
+# Bodies at least this large (in bytes) are decoded off the event loop, which only
+# pays off when decoding does not block the event loop thread on the GIL
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024 if FREE_THREADED else None
+
+
+def get_decoder(name: Optional[str] = None) -> tuple[str, Decoder]:
+    """
+    Resolve a JSON decoder by name.
+
+    Args:
+        name: "orjson", "msgspec", "json", or None/"auto" for the fastest installed one.
+            Unavailable backends fall back to the fastest installed one.
+
+    Returns:
+        Tuple of (backend name, decode function).
+    """
+    if name and name != "auto":
+        if name in DECODERS:
+            return name, DECODERS[name]
+        print(f"JSON decoder '{name}' is not installed, falling back")
+    backend = next(iter(DECODERS))
+    return backend, DECODERS[backend]
+
+
+class JSONDecoder:
+    """Decodes JSON bodies with a pluggable backend, offloading large ones."""
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        offload_threshold: Optional[int] = DEFAULT_OFFLOAD_THRESHOLD,
+    ):
+        """
+        Initialize the decoder.
+
+        Args:
+            backend: Decoder backend name (see ``get_decoder``).
+            offload_threshold: Minimum body size in bytes decoded in a worker
+                thread; None always decodes inline.
+        """
+        self.backend, self._decode = get_decoder(backend)
+        self.offload_threshold = offload_threshold
+
+    def decode(self, raw: bytes) -> Any:
+        """
+        Decode a JSON body on the calling thread.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        return self._decode(raw)
+
+    async def decode_async(self, raw: bytes) -> Any:
+        """
+        Decode a JSON body, in a worker thread if it is large.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        if self.offload_threshold is not None and len(raw) >= self.offload_threshold:
+            return await asyncio.to_thread(self._decode, raw)
+        return self._decode(raw)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class StreamingArrayParser:
+    """
+    Incrementally parses a top-level JSON array fed in byte chunks.
+
+    Complete elements are decoded as soon as they arrive and only the trailing,
+    incomplete element is kept as text, so peak memory is roughly the size of the
+    parsed result. Elements are decoded with the standard library (the only
+    decoder able to report where a value ends); dict keys are shared between
+    elements as the fast decoders do.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        # start -> first -> (value -> comma)* -> done
+        self._state = "start"
+        # Text needed before retrying to decode an incomplete element, which keeps
+        # large elements from being re-parsed on every chunk
+        self._need = 0
+        self._keys: dict[str, str] = {}
+        self.items: list = []
+
+    @staticmethod
+    def accepts(first_chunk: bytes) -> bool:
+        """Whether a body starting with ``first_chunk`` is a JSON array."""
+        return first_chunk.lstrip()[:1] == b"["
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Parse the next chunk of the body.
+
+        Raises:
+            ValueError: If the body is not a valid JSON array.
+        """
+        self._buffer += self._text.decode(chunk)
+        self._parse(final=False)
+
+    def close(self) -> list:
+        """
+        Finish parsing and return the array.
+
+        Raises:
+            ValueError: If the body is not a complete, valid JSON array.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON array")
+        return self.items
+
+    def _parse(self, final: bool) -> None:
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            state = self._state
+            if state == "start":
+                if buffer[pos] != "[":
+                    raise ValueError("Not a JSON array")
+                self._state = "first"
+                pos += 1
+            elif state == "comma":
+                if buffer[pos] == ",":
+                    self._state = "value"
+                elif buffer[pos] == "]":
+                    self._state = "done"
+                else:
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[pos]!r}")
+                pos += 1
+            elif state == "done":
+                raise ValueError("Extra data after JSON array")
+            elif state == "first" and buffer[pos] == "]":
+                self._state = "done"
+                pos += 1
+            else:
+                if not final and len(buffer) - pos < self._need:
+                    break
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    self._need = 2 * (len(buffer) - pos)
+                    break
+                # A number at the very end of the buffer may continue in the next chunk
+                if end >= len(buffer) and not final:
+                    self._need = len(buffer) - pos + 1
+                    break
+                self.items.append(_share_keys(item, self._keys))
+                self._need = 0
+                self._state = "comma"
+                pos = end
+        self._buffer = buffer[pos:]
+
+
+def _share_keys(value: Any, keys: dict[str, str]) -> Any:
+    """Rebuild dicts in ``value`` so equal keys are the same string object."""
+    if isinstance(value, dict):
+        return {keys.setdefault(k, k): _share_keys(v, keys) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_share_keys(v, keys) for v in value]
+    return value
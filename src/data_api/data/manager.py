@@ -1,12 +1,69 @@
 """
 Shared data manager instance for the application.
 
-This module provides a global nthudata instance that can be imported
-by any module without causing circular imports.
+This module provides a global nthudata instance (with its background refresher,
+derived view cache and startup warmup pipeline) that can be imported by any
+module without causing circular imports.
 """
 
+import httpx
+
+from data_api.core import config
 from data_api.core.settings import settings
 from data_api.data import NTHUDataManager
+from data_api.data.decoding import DEFAULT_OFFLOAD_THRESHOLD, JSONDecoder
+from data_api.data.refresher import BackgroundRefresher
+from data_api.data.resilience import RetryPolicy
+from data_api.data.views import DerivedViews
+from data_api.data.warmup import Warmup
 
 # Global data manager instance
-nthudata = NTHUDataManager(file_details_cache_expiry=settings.file_details_cache_expiry)
+nthudata = NTHUDataManager(
+    file_details_cache_expiry=settings.file_details_cache_expiry,
+    limits=httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    ),
+    timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+    snapshot_dir=settings.snapshot_dir,
+    shared_snapshots=settings.shared_snapshots,
+    stale_while_revalidate=settings.file_details_stale_while_revalidate,
+    max_staleness=settings.file_details_max_staleness,
+    decoder=JSONDecoder(
+        settings.json_decoder,
+        (
+            DEFAULT_OFFLOAD_THRESHOLD
+            if settings.json_offload_threshold is None
+            else settings.json_offload_threshold
+        ),
+    ),
+    cache_max_bytes=settings.data_cache_max_bytes,
+    pinned_endpoints=config.PREFETCH_ENDPOINTS,
+    retry=RetryPolicy(
+        attempts=settings.fetch_attempts,
+        base_delay=settings.fetch_backoff_base,
+        max_delay=settings.fetch_backoff_max,
+    ),
+    circuit_failure_threshold=settings.circuit_failure_threshold,
+    circuit_reset_timeout=settings.circuit_reset_timeout,
+    max_bytes=settings.fetch_max_bytes,
+    endpoint_max_bytes=settings.fetch_max_bytes_per_endpoint,
+    stream_min_bytes=settings.stream_parse_min_bytes,
+)
+
+# Global background refresher, started from the application lifespan
+refresher = BackgroundRefresher(
+    nthudata,
+    interval=settings.refresh_interval,
+    schedules=settings.refresh_schedules,
+)
+
+# Global cache of views derived from nthudata, registered by domain services
+views = DerivedViews(nthudata, max_bytes=settings.derived_views_max_bytes)
+
+# Global startup warmup pipeline, whose stages are added by the application lifespan
+warmup = Warmup(
+    retry_interval=settings.warmup_retry_interval,
+    max_retry_interval=settings.warmup_max_retry_interval,
+)
@@ -8,57 +8,422 @@ from data.nthusa.tw with improved architecture:
 - Configuration-based pre-fetching
 - Better error handling
 - Cleaner API
+- Single-flight coalescing of concurrent identical fetches
+- Optional on-disk snapshots for warm restarts
+- Optional host-wide sharing of snapshots between workers
+- Conditional requests (ETag / Last-Modified) to skip unchanged downloads
+- Memory-bounded LRU cache with pinned endpoints
+- Retry with jittered backoff and a per-host circuit breaker
+- Fast JSON decoding (orjson/msgspec when installed), off the event loop for large bodies
+- Streaming downloads with per-endpoint byte budgets and incremental array parsing
 """
 
-import json
+import asyncio
 import os
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
 import httpx
 
+from data_api.core import metrics
+from data_api.core.exceptions import UpstreamFetchError
+
+from .decoding import JSONDecoder, StreamingArrayParser
+from .resilience import CircuitBreaker, RetryPolicy
+from .shared import SharedStore
+from .sizing import estimate_size
+from .snapshot import SnapshotStore
+
+# Snapshot key used to persist the formatted file_details.json
+FILE_DETAILS_SNAPSHOT = "/file_details.json"
+
 
 class DataFetcher:
-    """Handles HTTP fetching of JSON data."""
+    """
+    Handles HTTP fetching of JSON data.
 
-    def __init__(self, base_url: str):
+    A single pooled ``httpx.AsyncClient`` is kept alive and reused across fetches so
+    that repeated requests to the same host skip the TCP/TLS/HTTP2 handshake.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        decoder: Optional[JSONDecoder] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_timeout: float = 30.0,
+        max_bytes: Optional[int] = None,
+        stream_min_bytes: Optional[int] = 1024 * 1024,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            base_url: Base URL of the upstream data source.
+            limits: Connection pool limits (defaults to httpx defaults).
+            timeout: Request timeouts (defaults to httpx defaults).
+            transport: Optional custom transport (e.g. for testing).
+            decoder: JSON decoder (defaults to the fastest installed backend).
+            retry: Retry policy for transient failures (defaults to ``RetryPolicy()``).
+            circuit_failure_threshold: Consecutive failed fetches that open a host's circuit.
+            circuit_reset_timeout: Seconds a host's circuit stays open before a probe.
+            max_bytes: Default maximum body size in bytes (None for unlimited).
+            stream_min_bytes: Minimum size of array bodies parsed incrementally while
+                downloading (None to always buffer the body).
+        """
         self.base_url = base_url
+        self.limits = limits or httpx.Limits()
+        self.timeout = timeout or httpx.Timeout(5.0)
+        self.transport = transport
+        self.decoder = decoder or JSONDecoder()
+        self.retry = retry or RetryPolicy()
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_reset_timeout = circuit_reset_timeout
+        self.max_bytes = max_bytes
+        self.stream_min_bytes = stream_min_bytes
+        # host -> circuit breaker
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # url -> {"bytes": ..., "duration": ..., "ttfb": ..., "throughput": bytes/s,
+        # "decode_duration": ..., "streamed": ..., "fetched_at": ..., "not_modified": ...}
+        # of the last successful fetch
+        self.fetch_stats: dict[str, dict] = {}
+        # url -> {"bytes": received, "total": expected or None, "started_at": ...}
+        # of downloads in progress
+        self.downloads: dict[str, dict] = {}
+        # url -> UpstreamFetchError.to_dict() plus "at", for URLs whose last fetch failed
+        self.errors: dict[str, dict] = {}
 
-    async def fetch_json(self, url: str) -> Optional[dict | list]:
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared client, creating it on first use.
+
+        The pool is bound to the event loop it was created in, so a new client is
+        created if the fetcher is used from a different loop.
         """
-        Fetch JSON data from a URL using httpx AsyncClient.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=self.transport is None,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and release pooled connections."""
+        client, self._client = self._client, None
+        loop, self._client_loop = self._client_loop, None
+        if client is not None and not client.is_closed and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    async def fetch(
+        self, url: str, validators: Optional[dict] = None, max_bytes: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Fetch JSON data, sending a conditional request when validators are given.
+
+        Transient failures are retried according to ``retry``. While the host's
+        circuit is open, no request is made at all. Failures are recorded in
+        ``errors`` as structured ``UpstreamFetchError`` dicts.
 
         Args:
             url: The URL to fetch JSON data from.
+            validators: {"etag": ..., "last_modified": ...} from a previous response.
+            max_bytes: Maximum body size for this URL (defaults to ``max_bytes``).
 
         Returns:
-            The parsed JSON data (dict or list), or None if an error occurs.
+            {"data": parsed JSON or None, "not_modified": bool, "validators": dict},
+            or None if an error occurs. ``data`` is None when upstream answered
+            304 Not Modified.
         """
-        async with httpx.AsyncClient(http2=True) as client:
+        host = httpx.URL(url).host
+        breaker = self.breakers.setdefault(
+            host, CircuitBreaker(self.circuit_failure_threshold, self.circuit_reset_timeout)
+        )
+        if not breaker.allow():
+            self._report(
+                UpstreamFetchError(url, "circuit_open", f"circuit open for {host}", attempts=0)
+            )
+            return None
+
+        start_time = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                async with client.stream("GET", url) as response:
-                    response.raise_for_status()
-                    data = await response.aread()
-                    return json.loads(data)
-            except httpx.RequestError as e:
-                print(f"Error fetching {url}: {e}")
+                result = await self._fetch_once(
+                    url,
+                    validators,
+                    start_time,
+                    max_bytes if max_bytes is not None else self.max_bytes,
+                )
+            except UpstreamFetchError as e:
+                error = e
+            else:
+                breaker.record_success()
+                self.errors.pop(url, None)
+                endpoint = self._endpoint_label(url)
+                stats = self.fetch_stats[url]
+                metrics.UPSTREAM_FETCH_DURATION.observe(stats["duration"], endpoint)
+                metrics.UPSTREAM_FETCH_BYTES.inc(endpoint, amount=stats["bytes"])
+                return result
+
+            error.attempts = attempt
+            if not error.retryable:
+                # Upstream is reachable, the response itself is unusable
+                breaker.record_success()
+                self._report(error)
                 return None
-            except json.JSONDecodeError as e:
-                print(f"Error decoding JSON from {url}: {e}")
+            # Stop early if concurrent fetches opened the circuit meanwhile
+            if attempt >= self.retry.attempts or breaker.state == "open":
+                was_open = breaker.opened_at is not None
+                breaker.record_failure()
+                if breaker.opened_at is not None and not was_open:
+                    print(f"Circuit for {host} opened after {breaker.failures} failed fetches")
+                self._report(error)
                 return None
+            await asyncio.sleep(self.retry.backoff(attempt))
+
+    async def _fetch_once(
+        self, url: str, validators: Optional[dict], start_time: float, max_bytes: Optional[int]
+    ) -> dict:
+        """
+        Make a single attempt of ``fetch``.
+
+        Raises:
+            UpstreamFetchError: If the request, the response status, the byte budget
+                or decoding fails.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        client = self._get_client()
+        attempt_start = time.perf_counter()
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                ttfb = time.perf_counter() - attempt_start
+                not_modified = response.status_code == 304
+                if not_modified:
+                    body = {"data": None, "bytes": 0, "streamed": False, "decode_duration": 0.0}
+                else:
+                    response.raise_for_status()
+                    body = await self._read_body(url, response, max_bytes)
+                download_duration = time.perf_counter() - attempt_start - ttfb
+                self.fetch_stats[url] = {
+                    "bytes": body["bytes"],
+                    "duration": time.perf_counter() - start_time,
+                    "ttfb": ttfb,
+                    "throughput": body["bytes"] / download_duration if download_duration else 0.0,
+                    "decode_duration": body["decode_duration"],
+                    "streamed": body["streamed"],
+                    "fetched_at": time.time(),
+                    "not_modified": not_modified,
+                }
+                return {
+                    "data": body["data"],
+                    "not_modified": not_modified,
+                    "validators": {
+                        "etag": response.headers.get("ETag") or (validators or {}).get("etag"),
+                        "last_modified": response.headers.get("Last-Modified")
+                        or (validators or {}).get("last_modified"),
+                    },
+                }
+        except httpx.TimeoutException as e:
+            raise UpstreamFetchError(url, "timeout", str(e) or type(e).__name__) from e
+        except httpx.ConnectError as e:
+            raise UpstreamFetchError(url, "connect", str(e) or type(e).__name__) from e
+        except httpx.RequestError as e:
+            raise UpstreamFetchError(url, "network", str(e) or type(e).__name__) from e
+        except httpx.HTTPStatusError as e:
+            raise UpstreamFetchError(
+                url, "http_status", str(e), status_code=e.response.status_code
+            ) from e
+        except ValueError as e:
+            raise UpstreamFetchError(url, "decode", str(e)) from e
+        finally:
+            self.downloads.pop(url, None)
+
+    async def _read_body(
+        self, url: str, response: httpx.Response, max_bytes: Optional[int]
+    ) -> dict:
+        """
+        Download and decode a response body within the byte budget.
+
+        Array bodies of at least ``stream_min_bytes`` (or of unknown length) are
+        parsed incrementally while downloading; other bodies are buffered and then
+        decoded with the fast decoder.
+
+        Returns:
+            {"data": parsed JSON, "bytes": decoded body size, "streamed": bool,
+            "decode_duration": seconds spent decoding}.
+
+        Raises:
+            UpstreamFetchError: If the body exceeds ``max_bytes``.
+            ValueError: If the body is not valid JSON.
+        """
+        # Content-Length is only comparable to the budget for uncompressed bodies
+        total = None
+        if "Content-Length" in response.headers and "Content-Encoding" not in response.headers:
+            total = int(response.headers["Content-Length"])
+        if max_bytes is not None and total is not None and total > max_bytes:
+            raise UpstreamFetchError(
+                url, "too_large", f"{total} bytes exceeds the budget of {max_bytes} bytes"
+            )
+
+        progress = self.downloads[url] = {"bytes": 0, "total": total, "started_at": time.time()}
+        parser: Optional[StreamingArrayParser] = None
+        chunks: list[bytes] = []
+        decode_duration = 0.0
+        async for chunk in response.aiter_bytes():
+            progress["bytes"] += len(chunk)
+            if max_bytes is not None and progress["bytes"] > max_bytes:
+                raise UpstreamFetchError(
+                    url, "too_large", f"body exceeds the budget of {max_bytes} bytes"
+                )
+            if (
+                parser is None
+                and not chunks
+                and self.stream_min_bytes is not None
+                and (total is None or total >= self.stream_min_bytes)
+                and StreamingArrayParser.accepts(chunk)
+            ):
+                parser = StreamingArrayParser()
+            if parser is not None:
+                decode_start = time.perf_counter()
+                parser.feed(chunk)
+                decode_duration += time.perf_counter() - decode_start
+            elif chunk:
+                chunks.append(chunk)
+
+        decode_start = time.perf_counter()
+        if parser is not None:
+            data = parser.close()
+        else:
+            raw = b"".join(chunks)
+            del chunks
+            data = await self.decoder.decode_async(raw)
+        decode_duration += time.perf_counter() - decode_start
+        return {
+            "data": data,
+            "bytes": progress["bytes"],
+            "streamed": parser is not None,
+            "decode_duration": decode_duration,
+        }
+
+    def _report(self, error: UpstreamFetchError) -> None:
+        """Record a failed fetch in ``errors`` and log it."""
+        self.errors[error.url] = {**error.to_dict(), "at": time.time()}
+        metrics.UPSTREAM_FETCH_ERRORS.inc(self._endpoint_label(error.url), error.kind)
+        print(f"Error fetching {error.url}: {error}")
+
+    def _endpoint_label(self, url: str) -> str:
+        """Metric label for a URL: the path below ``base_url`` (e.g. "/buses.json")."""
+        if url.startswith(self.base_url):
+            return url[len(self.base_url) :]
+        return url
+
+    async def fetch_json(self, url: str) -> Optional[dict | list]:
+        """
+        Fetch JSON data from a URL using the shared httpx AsyncClient.
+
+        Args:
+            url: The URL to fetch JSON data from.
+
+        Returns:
+            The parsed JSON data (dict or list), or None if an error occurs.
+        """
+        result = await self.fetch(url)
+        return result["data"] if result else None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single shared task.
+
+    While a call for a key is in flight, later callers await the same task instead
+    of starting their own. The task is shielded, so a cancelled caller does not
+    cancel the work for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func`` for ``key`` unless a call for the same key is already running.
+
+        Args:
+            key: Deduplication key.
+            func: Zero-argument coroutine function performing the work.
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def in_flight(self, key: str) -> bool:
+        """Return whether a call for ``key`` is currently running."""
+        return key in self._inflight
 
 
 class FileDetailsManager:
     """Manages file_details.json for tracking commit hashes."""
 
-    def __init__(self, fetcher: DataFetcher, file_details_url: str, cache_expiry: int = 300):
+    def __init__(
+        self,
+        fetcher: DataFetcher,
+        file_details_url: str,
+        cache_expiry: int = 300,
+        snapshots: Optional[SnapshotStore] = None,
+        shared: Optional[SharedStore] = None,
+        stale_while_revalidate: bool = True,
+        max_staleness: Optional[float] = None,
+    ):
         self.fetcher = fetcher
         self.file_details_url = file_details_url
         self.cache_expiry = cache_expiry
+        self.snapshots = snapshots
+        self.shared = shared
+        # Serve expired data immediately and revalidate in the background
+        self.stale_while_revalidate = stale_while_revalidate
+        # Age in seconds after which served data is considered degraded
+        self.max_staleness = max_staleness
+        self._revalidation: Optional[asyncio.Task] = None
+        # Refresh on the request path when expired; disabled while a background
+        # refresher keeps the cache up to date
+        self.auto_refresh = True
         self._cache = {
             "data": None,
             "last_updated": None,
+            "validators": None,
         }
+        # name -> (last_commit, last_updated), rebuilt once per refresh
+        self._index: dict[str, tuple[str, str]] = {}
+        # section -> names, e.g. "/" -> ["/buses.json", ...]
+        self._sections: dict[str, list[str]] = {}
+        self._single_flight = SingleFlight()
 
     async def get_file_details(self) -> Optional[list[dict]]:
         """
@@ -70,23 +435,112 @@ class FileDetailsManager:
         await self._update_cache()
         return self._cache["data"]
 
+    async def refresh(self) -> bool:
+        """
+        Refetch file_details.json regardless of cache expiry.
+
+        Returns:
+            True if the refresh succeeded.
+        """
+        return await self._single_flight.do(self.file_details_url, self._refresh)
+
+    def set_file_details(self, file_details: list[dict], last_updated: Optional[float] = None):
+        """
+        Seed the cache with already formatted file details (e.g. from a snapshot).
+
+        Args:
+            file_details: List of formatted file detail dictionaries.
+            last_updated: When the data was fetched (defaults to now).
+        """
+        self._store(file_details, time.time() if last_updated is None else last_updated)
+
+    def _store(self, file_details: list[dict], last_updated: float):
+        """Replace the cached file details and rebuild the lookup index."""
+        index = {}
+        sections: dict[str, list[str]] = {}
+        for file_info in file_details:
+            name = file_info["name"]
+            index[name] = (file_info["last_commit"], file_info["last_updated"])
+            sections.setdefault(name.rpartition("/")[0] or "/", []).append(name)
+
+        self._cache["data"] = file_details
+        self._cache["last_updated"] = last_updated
+        self._index = index
+        self._sections = sections
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since file details were last fetched, or None if never."""
+        if self._cache["last_updated"] is None:
+            return None
+        return time.time() - self._cache["last_updated"]
+
+    @property
+    def is_degraded(self) -> bool:
+        """Whether the served file details are older than ``max_staleness``."""
+        age = self.age
+        return self.max_staleness is not None and age is not None and age > self.max_staleness
+
     async def _update_cache(self):
         """Update the file_details.json cache if expired or not initialized."""
+        if not self._is_expired():
+            return
+
+        if self._cache["data"] is not None and self.stale_while_revalidate:
+            # Serve the current copy and revalidate once in the background
+            if self._revalidation is None or self._revalidation.done():
+                self._revalidation = asyncio.ensure_future(self.refresh())
+            return
+
+        await self.refresh()
+
+    def _is_expired(self) -> bool:
+        if self._cache["data"] is None or self._cache["last_updated"] is None:
+            return True
+        return self.auto_refresh and time.time() - self._cache["last_updated"] > self.cache_expiry
+
+    async def _refresh(self) -> bool:
+        """Fetch file_details.json and replace the cached copy."""
         current_time = time.time()
 
-        if (
-            self._cache["data"] is None
-            or self._cache["last_updated"] is None
-            or (current_time - self._cache["last_updated"] > self.cache_expiry)
-        ):
-            raw_data = await self.fetcher.fetch_json(self.file_details_url)
-
-            if raw_data:
-                formatted_data = self._format_file_details(raw_data)
-                self._cache["data"] = formatted_data
-                self._cache["last_updated"] = current_time
-            else:
-                print("Failed to update file_details.json.")
+        # Non-refresher workers take the copy written by the refresher if it is fresh.
+        # The refresher rewrites it on every check, so allow one missed check before
+        # polling upstream themselves.
+        if self.shared is not None and not self.shared.is_refresher():
+            shared = self.shared.read(FILE_DETAILS_SNAPSHOT, max_age=2 * self.cache_expiry)
+            if shared is not None:
+                self._store(shared[1], current_time)
+                return True
+
+        validators = self._cache["validators"] if self._cache["data"] is not None else None
+        result = await self.fetcher.fetch(self.file_details_url, validators)
+
+        if result and result["not_modified"]:
+            self._cache["last_updated"] = current_time
+            self._cache["validators"] = result["validators"]
+            # Mark the shared copy as checked, or the other workers see it expire
+            self._save_snapshot(self._cache["data"])
+            return True
+
+        raw_data = result["data"] if result else None
+        if raw_data:
+            formatted_data = self._format_file_details(raw_data)
+            self._store(formatted_data, current_time)
+            self._cache["validators"] = result["validators"]
+            self._save_snapshot(formatted_data)
+            return True
+        else:
+            print("Failed to update file_details.json.")
+            return False
+
+    def _save_snapshot(self, file_details: list[dict]) -> None:
+        """Write the formatted file details to the snapshot store, if any."""
+        if self.snapshots is None:
+            return
+        try:
+            self.snapshots.save(FILE_DETAILS_SNAPSHOT, None, file_details)
+        except OSError as e:
+            print(f"Failed to save file_details.json snapshot: {e}")
 
     @staticmethod
     def _format_file_details(file_details: dict) -> list[dict]:
@@ -113,39 +567,140 @@ class FileDetailsManager:
                     )
         return formatted
 
-    def get_commit_hash(self, endpoint_name: str, file_details: list[dict]) -> Optional[str]:
+    def get_commit_hash(
+        self, endpoint_name: str, file_details: Optional[list[dict]] = None
+    ) -> Optional[str]:
         """
         Get the expected commit hash for an endpoint from file details.
 
+        Uses the index built on refresh; a different ``file_details`` list is
+        searched linearly.
+
         Args:
             endpoint_name: The endpoint name (e.g., "/buses.json").
-            file_details: List of file detail dictionaries.
+            file_details: List of file detail dictionaries (defaults to the cached list).
 
         Returns:
             The commit hash string, or None if not found.
         """
+        if file_details is None or file_details is self._cache["data"]:
+            entry = self._index.get(endpoint_name)
+            return entry[0] if entry else None
+
         for file_info in file_details:
             if file_info["name"] == endpoint_name:
                 return file_info["last_commit"]
         return None
 
+    def get_entry(self, endpoint_name: str) -> Optional[tuple[str, str]]:
+        """
+        Get (last_commit, last_updated) for an endpoint.
+
+        Args:
+            endpoint_name: The endpoint name (e.g., "/buses.json").
+
+        Returns:
+            The (last_commit, last_updated) tuple, or None if not found.
+        """
+        return self._index.get(endpoint_name)
+
+    def changed_since(self, since: str) -> list[str]:
+        """
+        List endpoints updated after a given time.
+
+        Args:
+            since: Timestamp in the same ISO-8601 format as ``last_updated``.
+
+        Returns:
+            Endpoint names whose ``last_updated`` is later than ``since``.
+        """
+        return [name for name, (_, last_updated) in self._index.items() if last_updated > since]
+
+    def changed_commits(self, commits: dict[str, Optional[str]]) -> list[str]:
+        """
+        List endpoints whose commit hash differs from the given ones.
+
+        Args:
+            commits: Mapping of endpoint name to a previously seen commit hash.
+
+        Returns:
+            Endpoint names whose current commit hash differs.
+        """
+        return [name for name, commit in commits.items() if self.get_commit_hash(name) != commit]
+
+    def list_section(self, section: str = "/") -> list[str]:
+        """
+        List endpoint names in a file_details.json section.
+
+        Args:
+            section: Section name, "/" for top-level files (e.g. "dining").
+
+        Returns:
+            Endpoint names in the section.
+        """
+        return list(self._sections.get(section, []))
+
 
 class DataCache:
-    """Manages in-memory cache for data with commit hash validation."""
+    """
+    Manages in-memory cache for data with commit hash validation.
 
-    def __init__(self):
-        self._cache = {}
+    Entries are kept in least-recently-used order. When ``max_bytes`` is set, the
+    least recently used entries are evicted once the estimated total size of the
+    cached data exceeds it. Pinned keys (e.g. the pre-fetched endpoints) are
+    never evicted.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, pinned: Iterable[str] = ()):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Budget for the estimated total size of cached data (None for
+                unbounded).
+            pinned: Keys that are never evicted.
+        """
+        self.max_bytes = max_bytes
+        self.pinned = set(pinned)
+        # key -> {"data": ..., "commit_hash": ..., "validators": ..., "size": ...,
+        # "stored_at": ..., "hits": ...}, least recently used first
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self.evictions = 0
 
     def get(self, key: str) -> Optional[dict]:
-        """Get cached data for a key."""
+        """Get cached data for a key, counting a hit."""
+        cached = self._cache.get(key)
+        if cached is not None:
+            cached["hits"] += 1
+            self._cache.move_to_end(key)
+        return cached
+
+    def peek(self, key: str) -> Optional[dict]:
+        """Get cached data for a key without counting a hit or refreshing its recency."""
         return self._cache.get(key)
 
-    def set(self, key: str, data: dict | list, commit_hash: str):
-        """Set cached data with commit hash."""
+    def set(
+        self,
+        key: str,
+        data: dict | list,
+        commit_hash: str,
+        validators: Optional[dict] = None,
+    ):
+        """Set cached data with commit hash and optional HTTP validators."""
+        previous = self._cache.pop(key, None)
         self._cache[key] = {
             "data": data,
             "commit_hash": commit_hash,
+            "validators": validators,
+            "size": (
+                previous["size"]
+                if previous is not None and previous["data"] is data
+                else estimate_size(data)
+            ),
+            "stored_at": time.time(),
+            "hits": previous["hits"] if previous is not None else 0,
         }
+        self._evict()
 
     def is_valid(self, key: str, expected_commit_hash: str) -> bool:
         """Check if cached data is valid based on commit hash."""
@@ -161,6 +716,47 @@ class DataCache:
         else:
             self._cache.clear()
 
+    @property
+    def total_size(self) -> int:
+        """Estimated total size of cached data in bytes."""
+        return sum(entry["size"] for entry in self._cache.values())
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Per-key cache statistics, least recently used first.
+
+        Returns:
+            Dict mapping keys to {"size": estimated bytes, "age": seconds since
+            stored, "hits": ..., "commit_hash": ..., "pinned": bool}.
+        """
+        now = time.time()
+        return {
+            key: {
+                "size": entry["size"],
+                "age": now - entry["stored_at"],
+                "hits": entry["hits"],
+                "commit_hash": entry["commit_hash"],
+                "pinned": key in self.pinned,
+            }
+            for key, entry in self._cache.items()
+        }
+
+    def _evict(self) -> None:
+        """Evict least recently used unpinned entries until the size budget is met."""
+        if self.max_bytes is None:
+            return
+        total = self.total_size
+        newest = next(reversed(self._cache), None)
+        for key in list(self._cache):
+            if total <= self.max_bytes:
+                break
+            # The entry just stored is kept even if it alone exceeds the budget
+            if key in self.pinned or key == newest:
+                continue
+            total -= self._cache.pop(key)["size"]
+            self.evictions += 1
+            print(f"Evicted {key} from the data cache")
+
 
 class NTHUDataManager:
     """
@@ -169,22 +765,90 @@ class NTHUDataManager:
     Provides a centralized interface for fetching and caching data from data.nthusa.tw.
     """
 
-    def __init__(self, base_url: Optional[str] = None, file_details_cache_expiry: int = 300):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        file_details_cache_expiry: int = 300,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        snapshot_dir: Optional[str] = None,
+        shared_snapshots: bool = False,
+        stale_while_revalidate: bool = True,
+        max_staleness: Optional[float] = None,
+        decoder: Optional[JSONDecoder] = None,
+        cache_max_bytes: Optional[int] = None,
+        pinned_endpoints: Iterable[str] = (),
+        retry: Optional[RetryPolicy] = None,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_timeout: float = 30.0,
+        max_bytes: Optional[int] = None,
+        endpoint_max_bytes: Optional[dict[str, int]] = None,
+        stream_min_bytes: Optional[int] = 1024 * 1024,
+    ):
         """
         Initialize the data manager.
 
         Args:
             base_url: Base URL for data.nthusa.tw (defaults to env var or production URL).
             file_details_cache_expiry: Cache expiry time for file_details.json in seconds.
+            limits: Connection pool limits for the shared HTTP client.
+            timeout: Timeouts for the shared HTTP client.
+            transport: Optional custom transport for the shared HTTP client.
+            snapshot_dir: Directory for on-disk snapshots (disabled when None).
+            shared_snapshots: Share ``snapshot_dir`` with other workers on this host, so
+                that only one elected worker polls upstream.
+            stale_while_revalidate: Serve expired file details immediately and
+                revalidate them in the background.
+            max_staleness: Age in seconds after which data is reported as degraded.
+            decoder: JSON decoder for upstream payloads (defaults to the fastest installed).
+            cache_max_bytes: Budget for the estimated size of cached data (None for
+                unbounded).
+            pinned_endpoints: Endpoints never evicted from the cache (e.g. the
+                pre-fetched ones).
+            retry: Retry policy for transient upstream failures.
+            circuit_failure_threshold: Consecutive failed fetches that open the circuit.
+            circuit_reset_timeout: Seconds the circuit stays open before a probe.
+            max_bytes: Default maximum download size per endpoint (None for unlimited).
+            endpoint_max_bytes: Per-endpoint overrides of ``max_bytes``
+                (e.g. {"courses.json": 64 * 1024 * 1024}).
+            stream_min_bytes: Minimum size of array payloads parsed while downloading.
         """
         self.base_url = base_url or os.getenv("NTHU_DATA_URL", "https://data.nthusa.tw")
-        self.fetcher = DataFetcher(self.base_url)
+        self.fetcher = DataFetcher(
+            self.base_url,
+            limits=limits,
+            timeout=timeout,
+            transport=transport,
+            decoder=decoder,
+            retry=retry,
+            circuit_failure_threshold=circuit_failure_threshold,
+            circuit_reset_timeout=circuit_reset_timeout,
+            max_bytes=max_bytes,
+            stream_min_bytes=stream_min_bytes,
+        )
+        self.endpoint_max_bytes = {
+            self._normalize_endpoint_name(name): limit
+            for name, limit in (endpoint_max_bytes or {}).items()
+        }
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        self.shared = (
+            SharedStore(self.snapshots) if self.snapshots is not None and shared_snapshots else None
+        )
         self.file_details_manager = FileDetailsManager(
             self.fetcher,
             f"{self.base_url}/file_details.json",
             file_details_cache_expiry,
+            self.snapshots,
+            self.shared,
+            stale_while_revalidate,
+            max_staleness,
         )
-        self.cache = DataCache()
+        self.cache = DataCache(
+            cache_max_bytes, [self._normalize_endpoint_name(name) for name in pinned_endpoints]
+        )
+        self._single_flight = SingleFlight()
+        self._background_tasks: set[asyncio.Task] = set()
 
     async def get(self, endpoint_name: str) -> Optional[tuple[str, dict | list]]:
         """
@@ -202,47 +866,174 @@ class NTHUDataManager:
         # Get file details
         file_details = await self.file_details_manager.get_file_details()
         if file_details is None:
+            # Upstream unreachable: fall back to whatever we already have
+            cached = self.cache.get(endpoint_name)
+            if cached:
+                metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "stale")
+                return (cached["commit_hash"], cached["data"])
+            metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "miss")
             return None
 
         # Get expected commit hash
-        expected_commit_hash = self.file_details_manager.get_commit_hash(
-            endpoint_name, file_details
-        )
+        expected_commit_hash = self.file_details_manager.get_commit_hash(endpoint_name)
 
         # Check cache validity
         if self.cache.is_valid(endpoint_name, expected_commit_hash):
             cached = self.cache.get(endpoint_name)
+            metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "hit")
             return (cached["commit_hash"], cached["data"])
 
-        # Fetch fresh data
-        data_url = f"{self.base_url}{endpoint_name}"
-        fresh_data = await self.fetcher.fetch_json(data_url)
+        # Fetch fresh data, sharing one download among concurrent callers
+        fresh_data = await self._single_flight.do(
+            f"{endpoint_name}@{expected_commit_hash}",
+            lambda: self._fetch_and_cache(endpoint_name, expected_commit_hash),
+        )
 
         if fresh_data:
-            self.cache.set(endpoint_name, fresh_data, expected_commit_hash)
+            metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "miss")
             return (expected_commit_hash, fresh_data)
         else:
             # Try to return stale cache if available
             cached = self.cache.get(endpoint_name)
             if cached:
+                metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "stale")
                 return (cached["commit_hash"], cached["data"])
+            metrics.DATA_CACHE_REQUESTS.inc(endpoint_name, "miss")
+            return None
+
+    async def _fetch_and_cache(
+        self, endpoint_name: str, commit_hash: Optional[str]
+    ) -> Optional[dict | list]:
+        """Download an endpoint (conditionally if cached) and cache it on success."""
+        # Non-refresher workers load the refresher's snapshot when it matches
+        is_refresher = self.shared is None or self.shared.is_refresher()
+        if not is_refresher:
+            shared = await asyncio.to_thread(self.shared.read, endpoint_name)
+            if shared is not None and shared[0] == commit_hash:
+                self.cache.set(endpoint_name, shared[1], commit_hash)
+                return shared[1]
+
+        cached = self.cache.peek(endpoint_name)
+        result = await self.fetcher.fetch(
+            f"{self.base_url}{endpoint_name}",
+            cached.get("validators") if cached else None,
+            max_bytes=self.endpoint_max_bytes.get(endpoint_name),
+        )
+        if result is None:
             return None
 
-    async def prefetch(self, endpoints: list[str]) -> dict[str, bool]:
+        if result["not_modified"]:
+            if not cached:
+                return None
+            # Upstream confirmed our copy is current; only the commit hash moves on
+            self.cache.set(endpoint_name, cached["data"], commit_hash, result["validators"])
+            if self.snapshots is not None and is_refresher:
+                self._run_in_background(
+                    self._save_snapshot(endpoint_name, commit_hash, cached["data"])
+                )
+            return cached["data"]
+
+        fresh_data = result["data"]
+        if fresh_data:
+            self.cache.set(endpoint_name, fresh_data, commit_hash, result["validators"])
+            if self.snapshots is not None and is_refresher:
+                self._run_in_background(self._save_snapshot(endpoint_name, commit_hash, fresh_data))
+        return fresh_data
+
+    async def _save_snapshot(
+        self, endpoint_name: str, commit_hash: Optional[str], data: dict | list
+    ) -> None:
+        """Persist a payload to disk without blocking the event loop."""
+        try:
+            await asyncio.to_thread(self.snapshots.save, endpoint_name, commit_hash, data)
+        except OSError as e:
+            print(f"Failed to save snapshot for {endpoint_name}: {e}")
+
+    def _run_in_background(self, coro) -> asyncio.Task:
+        """Start a task and keep a reference to it until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def load_snapshots(self) -> list[str]:
+        """
+        Load on-disk snapshots into the in-memory cache.
+
+        This does not contact upstream, so it is safe to call before the network is
+        available. Loaded data should be checked with ``validate_snapshots``.
+
+        Returns:
+            List of endpoint names loaded from snapshots.
         """
-        Pre-fetch data for multiple endpoints.
+        if self.snapshots is None:
+            return []
+
+        snapshots = self.snapshots.load_all()
+        file_details = snapshots.pop(FILE_DETAILS_SNAPSHOT, None)
+        if file_details is not None:
+            snapshot_path = self.snapshots.path_for(FILE_DETAILS_SNAPSHOT)
+            self.file_details_manager.set_file_details(
+                file_details[1], last_updated=snapshot_path.stat().st_mtime
+            )
+
+        for endpoint_name, (commit_hash, data) in snapshots.items():
+            self.cache.set(endpoint_name, data, commit_hash)
+        return list(snapshots)
+
+    async def validate_snapshots(self, endpoints: list[str], **prefetch_kwargs) -> dict[str, dict]:
+        """
+        Refresh file_details.json and re-fetch endpoints whose commit hash changed.
+
+        Args:
+            endpoints: Endpoint names to validate.
+            **prefetch_kwargs: Passed through to ``prefetch``.
+
+        Returns:
+            The ``prefetch`` result for the given endpoints.
+        """
+        await self.file_details_manager.refresh()
+        return await self.prefetch(endpoints, **prefetch_kwargs)
+
+    async def prefetch(
+        self,
+        endpoints: list[str],
+        max_concurrency: int = 4,
+        timeout: Optional[float] = None,
+    ) -> dict[str, dict]:
+        """
+        Pre-fetch data for multiple endpoints concurrently.
 
         Args:
             endpoints: List of endpoint names to pre-fetch.
+            max_concurrency: Maximum number of endpoints fetched at the same time.
+            timeout: Per-endpoint timeout in seconds (None for no timeout).
 
         Returns:
-            Dictionary mapping endpoint names to success status.
+            Dictionary mapping endpoint names to
+            {"success": bool, "duration": seconds, "bytes": downloaded size}.
         """
-        results = {}
-        for endpoint in endpoints:
-            result = await self.get(endpoint)
-            results[endpoint] = result is not None
-        return results
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def prefetch_one(endpoint: str) -> tuple[str, dict]:
+            async with semaphore:
+                start_time = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(self.get(endpoint), timeout)
+                except asyncio.TimeoutError:
+                    print(f"Timed out pre-fetching {endpoint} after {timeout}s")
+                    result = None
+                duration = time.perf_counter() - start_time
+
+            data_url = f"{self.base_url}{self._normalize_endpoint_name(endpoint)}"
+            stats = self.fetcher.fetch_stats.get(data_url, {})
+            return endpoint, {
+                "success": result is not None,
+                "duration": duration,
+                "bytes": stats.get("bytes", 0) if result is not None else 0,
+            }
+
+        return dict(await asyncio.gather(*(prefetch_one(endpoint) for endpoint in endpoints)))
 
     async def get_file_details(self) -> Optional[list[dict]]:
         """
@@ -253,6 +1044,63 @@ class NTHUDataManager:
         """
         return await self.file_details_manager.get_file_details()
 
+    def status(self) -> dict:
+        """
+        Report cached datasets and upstream state without contacting upstream.
+
+        Returns:
+            Dict with "file_details" ({"age", "degraded"}), "datasets" mapping cached
+            endpoint names to their cache statistics plus the last fetch's
+            "fetch_duration", "fetched_bytes" and "fetched_at", "errors" of URLs whose
+            last fetch failed, "downloads" in progress and per-host circuit "breakers".
+        """
+        datasets = {}
+        for endpoint_name, stats in self.cache.stats().items():
+            fetch = self.fetcher.fetch_stats.get(f"{self.base_url}{endpoint_name}", {})
+            datasets[endpoint_name] = {
+                **stats,
+                "fetch_duration": fetch.get("duration"),
+                "fetched_bytes": fetch.get("bytes"),
+                "fetched_at": fetch.get("fetched_at"),
+            }
+        return {
+            "file_details": {"age": self.data_age, "degraded": self.is_degraded},
+            "datasets": datasets,
+            "errors": dict(self.fetcher.errors),
+            "downloads": {url: dict(progress) for url, progress in self.fetcher.downloads.items()},
+            "breakers": {
+                host: {"state": breaker.state, "failures": breaker.failures}
+                for host, breaker in self.fetcher.breakers.items()
+            },
+        }
+
+    def is_cached(self, endpoint_name: str) -> bool:
+        """Whether data for an endpoint is in the in-memory cache (possibly unvalidated)."""
+        return self.cache.peek(self._normalize_endpoint_name(endpoint_name)) is not None
+
+    @property
+    def data_age(self) -> Optional[float]:
+        """Seconds since file_details.json was last fetched, or None if never."""
+        return self.file_details_manager.age
+
+    @property
+    def is_degraded(self) -> bool:
+        """Whether served data exceeds the configured maximum staleness."""
+        return self.file_details_manager.is_degraded
+
+    async def aclose(self) -> None:
+        """
+        Wait for pending snapshot writes, give up the refresher role and close the
+        shared HTTP client.
+
+        Should be called on application shutdown.
+        """
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self.shared is not None:
+            self.shared.lock.release()
+        await self.fetcher.aclose()
+
     def _normalize_endpoint_name(self, endpoint_name: str) -> str:
         """
         Normalize endpoint name to ensure consistent format.
@@ -0,0 +1,151 @@
+"""
+Background refresher for NTHU data.
+
+Instead of checking freshness on the request path, a single background task
+periodically refreshes file_details.json, detects endpoints whose commit hash
+changed, re-fetches only those endpoints and runs the processors registered for
+them (e.g. rebuilding the bus schedule registries). Requests then only read
+data that is already materialized.
+
+Processors are tracked by the commit they last applied rather than by the
+cache, since other paths (snapshot validation, request-time ``get()``) may
+update the cache first.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from .nthudata import NTHUDataManager
+
+Processor = Callable[[], Awaitable[None]]
+
+
+class BackgroundRefresher:
+    """Periodically refreshes changed endpoints of an ``NTHUDataManager``."""
+
+    def __init__(
+        self,
+        manager: NTHUDataManager,
+        interval: float = 300,
+        schedules: Optional[dict[str, float]] = None,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            manager: Data manager to refresh.
+            interval: Seconds between file_details.json refreshes.
+            schedules: Optional per-endpoint minimum seconds between checks
+                (e.g. {"courses.json": 3600}); defaults to ``interval``.
+        """
+        self.manager = manager
+        self.interval = interval
+        self.schedules = {
+            manager._normalize_endpoint_name(name): seconds
+            for name, seconds in (schedules or {}).items()
+        }
+        self._processors: dict[str, list[Processor]] = {}
+        self._next_due: dict[str, float] = {}
+        # Endpoint -> commit hash its processors last ran for without errors
+        self._applied: dict[str, Optional[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[float] = None
+        self.last_changed: list[str] = []
+
+    def register(self, endpoint_name: str, *processors: Processor) -> None:
+        """
+        Keep an endpoint fresh, running ``processors`` after it changes.
+
+        Args:
+            endpoint_name: Endpoint name (e.g. "buses.json").
+            *processors: Coroutine functions run after the endpoint is re-fetched.
+        """
+        endpoint_name = self.manager._normalize_endpoint_name(endpoint_name)
+        registered = self._processors.setdefault(endpoint_name, [])
+        registered.extend(p for p in processors if p not in registered)
+        self._next_due.setdefault(endpoint_name, 0)
+
+    async def run_once(self) -> list[str]:
+        """
+        Refresh file_details.json and update every due endpoint whose commit changed.
+
+        An endpoint is re-fetched when its cached copy is out of date, and its
+        processors run whenever the current commit differs from the one they
+        last applied, even if something else already refreshed the cache.
+
+        Returns:
+            List of endpoint names that were re-fetched or re-processed.
+        """
+        await self.manager.file_details_manager.refresh()
+        file_details = await self.manager.get_file_details()
+        if file_details is None:
+            return []
+
+        now = time.monotonic()
+        changed = []
+        for endpoint_name, processors in self._processors.items():
+            if self._next_due[endpoint_name] > now:
+                continue
+            self._next_due[endpoint_name] = now + self.schedules.get(endpoint_name, self.interval)
+
+            expected_commit_hash = self.manager.file_details_manager.get_commit_hash(endpoint_name)
+            stale = not self.manager.cache.is_valid(endpoint_name, expected_commit_hash)
+            unapplied = (
+                bool(processors) and self._applied.get(endpoint_name) != expected_commit_hash
+            )
+            if not stale and not unapplied:
+                continue
+
+            if stale and await self.manager.get(endpoint_name) is None:
+                continue
+            changed.append(endpoint_name)
+
+            applied = True
+            for processor in processors:
+                try:
+                    await processor()
+                except Exception as e:
+                    applied = False
+                    print(f"Error processing {endpoint_name} after refresh: {e}")
+            if applied:
+                self._applied[endpoint_name] = expected_commit_hash
+
+        self.last_run = time.time()
+        self.last_changed = changed
+        return changed
+
+    def start(self) -> None:
+        """Start the background loop and stop refreshing on the request path."""
+        if self._task is not None and not self._task.done():
+            return
+        self.manager.file_details_manager.auto_refresh = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and restore refreshing on the request path."""
+        self.manager.file_details_manager.auto_refresh = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background loop is active."""
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        tick = min([self.interval, *self.schedules.values()])
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                changed = await self.run_once()
+                if changed:
+                    print(f"Refreshed {len(changed)} changed endpoints: {', '.join(changed)}")
+            except Exception as e:
+                print(f"Background refresh failed: {e}")
@@ -0,0 +1,86 @@
+"""
+Retry and circuit breaking for upstream fetches.
+
+Transient failures (timeouts, connection errors, 5xx/429 responses) are retried
+with jittered exponential backoff. Each upstream host has a circuit breaker:
+after repeated failed fetches it opens and further fetches fail immediately, so
+callers fall back to cached data instead of each paying the full connect
+timeout. After ``reset_timeout`` a single probe is let through; its outcome
+closes or re-opens the circuit.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to wait between attempts of one fetch."""
+
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before the next attempt ("full jitter" exponential backoff).
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1.
+
+        Returns:
+            Seconds to wait, uniformly drawn up to the capped exponential delay.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker with closed, open and half-open states."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failed fetches that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """ "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a fetch may be attempted now; claims the probe when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record that the host answered; closes the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed fetch; opens (or re-opens) the circuit at the threshold."""
+        self.failures += 1
+        self._probing = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
@@ -0,0 +1,108 @@
+"""
+Host-wide data sharing between uvicorn workers.
+
+With several workers on one host, only one of them (the refresher) talks to
+data.nthusa.tw. It is elected through an exclusive ``flock`` on a lock file in
+the shared snapshot directory and writes every payload it fetches as a
+snapshot. The other workers read ``file_details.json`` and endpoint payloads
+from those snapshots (memory-mapped, read-only) instead of polling upstream.
+The refresher rewrites the file_details.json snapshot on every successful
+check, even when upstream answers 304, so its age tells the followers when
+the last check happened.
+
+If the refresher dies, the kernel releases its lock and the next worker that
+needs fresh data takes over.
+"""
+
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from .snapshot import SnapshotStore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+LOCK_FILE = "refresher.lock"
+
+
+class LeaderLock:
+    """Non-blocking, process-lifetime exclusive lock used for refresher election."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def try_acquire(self) -> bool:
+        """
+        Try to become (or confirm being) the lock holder.
+
+        Returns:
+            True if this process holds the lock.
+        """
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Release the lock if held."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedStore:
+    """Snapshot directory shared by all workers on a host, with one elected refresher."""
+
+    def __init__(self, snapshots: SnapshotStore):
+        """
+        Initialize the shared store.
+
+        Args:
+            snapshots: Snapshot store located in the shared directory.
+        """
+        self.snapshots = snapshots
+        self.lock = LeaderLock(snapshots.directory / LOCK_FILE)
+
+    def is_refresher(self) -> bool:
+        """Return whether this worker is responsible for polling upstream."""
+        return self.lock.try_acquire()
+
+    def read(self, endpoint_name: str, max_age: Optional[float] = None):
+        """
+        Read a snapshot written by the refresher.
+
+        Args:
+            endpoint_name: Normalized endpoint name.
+            max_age: Ignore snapshots older than this many seconds (None for no limit).
+
+        Returns:
+            Tuple of (commit_hash, data), or None if missing or too old.
+        """
+        path = self.snapshots.path_for(endpoint_name)
+        try:
+            with open(path, "rb") as f:
+                if max_age is not None and time.time() - os.fstat(f.fileno()).st_mtime > max_age:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    snapshot = SnapshotStore.decode(mapped, path)
+        except (OSError, ValueError):
+            return None
+
+        if snapshot is None or snapshot[0] != endpoint_name:
+            return None
+        return snapshot[1], snapshot[2]
@@ -0,0 +1,43 @@
+"""Approximate memory accounting for cached data."""
+
+import sys
+from typing import Any
+
+# Lists longer than this are estimated from an evenly spaced sample of items
+SIZE_ESTIMATE_SAMPLE = 1000
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a Python object graph in bytes.
+
+    Containers are walked recursively and objects referenced several times are
+    counted once. Objects shared with other cached values are counted for each
+    of them, so estimates err on the large side. Long lists (e.g. the rows of
+    courses.json) are extrapolated from a sample of ``SIZE_ESTIMATE_SAMPLE`` items.
+
+    Args:
+        value: Parsed JSON data or a view derived from it.
+
+    Returns:
+        Estimated size in bytes.
+    """
+    return _estimate(value, set())
+
+
+def _estimate(value: Any, seen: set[int]) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _estimate(key, seen) + _estimate(item, seen)
+    elif isinstance(value, (list, tuple)) and len(value) > SIZE_ESTIMATE_SAMPLE:
+        step = len(value) / SIZE_ESTIMATE_SAMPLE
+        sampled = sum(_estimate(value[int(i * step)], seen) for i in range(SIZE_ESTIMATE_SAMPLE))
+        size += sampled * len(value) // SIZE_ESTIMATE_SAMPLE
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _estimate(item, seen)
+    return size
@@ -0,0 +1,129 @@
+"""
+On-disk snapshots of fetched data for warm restarts.
+
+Each endpoint's payload is persisted together with its commit hash, so a freshly
+started worker can serve the previous data before contacting data.nthusa.tw.
+
+Snapshots use a compact binary format: a small header followed by the
+zlib-compressed ``marshal`` encoding of ``(endpoint_name, commit_hash, data)``.
+``marshal`` only handles built-in types, which is exactly what decoded JSON
+consists of, and is much faster to load than re-parsing JSON. Since its format may change between
+Python versions, snapshots written by another interpreter version are ignored.
+"""
+
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+MAGIC = b"NTHUSNAP"
+FORMAT_VERSION = 1
+SUFFIX = ".snap"
+_HEADER = MAGIC + bytes([FORMAT_VERSION, sys.version_info[0], sys.version_info[1]])
+
+
+class SnapshotStore:
+    """Persists endpoint payloads to a directory, one file per endpoint."""
+
+    def __init__(self, directory: str | Path):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            directory: Directory for snapshot files (created if missing).
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def save(self, endpoint_name: str, commit_hash: Optional[str], data: dict | list) -> None:
+        """
+        Atomically write a snapshot for an endpoint, replacing any older one.
+
+        Args:
+            endpoint_name: Normalized endpoint name (e.g. "/buses.json").
+            commit_hash: Commit hash the data belongs to.
+            data: Decoded JSON payload.
+        """
+        payload = _HEADER + zlib.compress(marshal.dumps((endpoint_name, commit_hash, data)), 1)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path_for(endpoint_name))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def load(self, endpoint_name: str) -> Optional[tuple[Optional[str], dict | list]]:
+        """
+        Load the snapshot for an endpoint.
+
+        Args:
+            endpoint_name: Normalized endpoint name.
+
+        Returns:
+            Tuple of (commit_hash, data), or None if missing or unreadable.
+        """
+        snapshot = self._read(self.path_for(endpoint_name))
+        if snapshot is None or snapshot[0] != endpoint_name:
+            return None
+        return snapshot[1], snapshot[2]
+
+    def load_all(self) -> dict[str, tuple[Optional[str], dict | list]]:
+        """
+        Load every readable snapshot in the directory.
+
+        Returns:
+            Dictionary mapping endpoint names to (commit_hash, data).
+        """
+        snapshots = {}
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            snapshot = self._read(path)
+            if snapshot is not None:
+                endpoint_name, commit_hash, data = snapshot
+                snapshots[endpoint_name] = (commit_hash, data)
+        return snapshots
+
+    def delete(self, endpoint_name: str) -> None:
+        """Remove the snapshot for an endpoint if present."""
+        self.path_for(endpoint_name).unlink(missing_ok=True)
+
+    def path_for(self, endpoint_name: str) -> Path:
+        """Return the snapshot file path for an endpoint."""
+        # "/dining/shops.json" -> "dining%2Fshops.json.snap"
+        return self.directory / (endpoint_name.lstrip("/").replace("/", "%2F") + SUFFIX)
+
+    @classmethod
+    def _read(cls, path: Path) -> Optional[tuple[str, Optional[str], dict | list]]:
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            print(f"Ignoring unreadable snapshot {path}: {e}")
+            return None
+        return cls.decode(raw, path)
+
+    @staticmethod
+    def decode(raw, path: Path) -> Optional[tuple[str, Optional[str], dict | list]]:
+        """
+        Decode snapshot bytes.
+
+        Args:
+            raw: Snapshot file contents (any bytes-like object, e.g. an mmap).
+            path: Snapshot file path, used for error reporting.
+
+        Returns:
+            Tuple of (endpoint_name, commit_hash, data), or None if invalid.
+        """
+        header = bytes(raw[: len(_HEADER)])
+        if header != _HEADER:
+            return None
+        try:
+            body = zlib.decompress(memoryview(raw)[len(_HEADER) :])
+            endpoint_name, commit_hash, data = marshal.loads(body)
+            return endpoint_name, commit_hash, data
+        except (EOFError, ValueError, TypeError, zlib.error) as e:
+            print(f"Ignoring unreadable snapshot {path}: {e}")
+            return None
@@ -0,0 +1,174 @@
+"""
+Derived views of NTHU data, memoized per commit hash.
+
+Domain services register derivations (e.g. the flattened location list or the
+set of announcement departments) computed from an endpoint's raw JSON. A view
+is computed once per commit hash of its endpoint and recomputed automatically
+after ``nthudata`` sees a new hash, instead of being re-derived on every
+request. Cached views are evicted least-recently-used once their estimated
+total size exceeds a byte budget.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .nthudata import NTHUDataManager
+from .sizing import estimate_size
+
+Derivation = Callable[[Any], Any]
+
+
+def index_by(key: str) -> Derivation:
+    """
+    Build a derivation mapping ``entry[key]`` to entry for a list of dicts.
+
+    Args:
+        key: Field to index by; the first entry wins for duplicated values.
+
+    Returns:
+        Derivation suitable for ``DerivedViews.register``.
+    """
+
+    def derive(entries: list[dict]) -> dict[Any, dict]:
+        index: dict[Any, dict] = {}
+        for entry in entries:
+            index.setdefault(entry[key], entry)
+        return index
+
+    return derive
+
+
+class DerivedViews:
+    """Registry and cache of views derived from ``NTHUDataManager`` endpoints."""
+
+    def __init__(self, manager: NTHUDataManager, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the view cache.
+
+        Args:
+            manager: Data manager providing the raw endpoint data.
+            max_bytes: Budget for the estimated total size of cached views.
+        """
+        self.manager = manager
+        self.max_bytes = max_bytes
+        # name -> {"endpoint": ..., "derive": ...}
+        self._derivations: dict[str, dict] = {}
+        # name -> {"commit_hash": ..., "value": ..., "size": ..., "computed_at": ...},
+        # least recently used first
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        # name -> {"hits": ..., "misses": ..., "evictions": ...}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def register(self, name: str, endpoint_name: str, derive: Derivation) -> str:
+        """
+        Register a derivation.
+
+        Args:
+            name: Unique view name (e.g. "locations.flat").
+            endpoint_name: Endpoint the view is derived from (e.g. "maps.json").
+            derive: Pure function from the endpoint's raw data to the view. Its
+                result is shared between requests and must not be mutated.
+
+        Returns:
+            The view name, for use with ``get``.
+        """
+        self._derivations[name] = {
+            "endpoint": self.manager._normalize_endpoint_name(endpoint_name),
+            "derive": derive,
+        }
+        self._counters.setdefault(name, {"hits": 0, "misses": 0, "evictions": 0})
+        self._cache.pop(name, None)
+        return name
+
+    async def get(self, name: str) -> Optional[tuple[str, Any]]:
+        """
+        Get a view for the current commit hash of its endpoint.
+
+        Args:
+            name: Registered view name.
+
+        Returns:
+            Tuple of (commit_hash, view), or None if the endpoint is unavailable.
+        """
+        derivation = self._derivations[name]
+        result = await self.manager.get(derivation["endpoint"])
+        if result is None:
+            return None
+        commit_hash, data = result
+
+        counters = self._counters[name]
+        entry = self._cache.get(name)
+        if entry is not None and entry["commit_hash"] == commit_hash:
+            counters["hits"] += 1
+            self._cache.move_to_end(name)
+            return commit_hash, entry["value"]
+
+        counters["misses"] += 1
+        value = derivation["derive"](data)
+        self._cache[name] = {
+            "commit_hash": commit_hash,
+            "value": value,
+            "size": estimate_size(value),
+            "computed_at": time.time(),
+        }
+        self._cache.move_to_end(name)
+        self._evict()
+        return commit_hash, value
+
+    async def warm(self) -> bool:
+        """
+        Compute every registered view for the current data (e.g. at startup).
+
+        Returns:
+            Whether every view could be computed.
+        """
+        results = [await self.get(name) for name in list(self._derivations)]
+        return all(result is not None for result in results)
+
+    def invalidate(self, endpoint_name: Optional[str] = None) -> None:
+        """
+        Drop cached views.
+
+        Args:
+            endpoint_name: Only drop views derived from this endpoint (all if None).
+        """
+        if endpoint_name is not None:
+            endpoint_name = self.manager._normalize_endpoint_name(endpoint_name)
+        for name in list(self._cache):
+            if endpoint_name is None or self._derivations[name]["endpoint"] == endpoint_name:
+                del self._cache[name]
+
+    @property
+    def total_size(self) -> int:
+        """Estimated total size of cached views in bytes."""
+        return sum(entry["size"] for entry in self._cache.values())
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Per-view cache statistics.
+
+        Returns:
+            Dict mapping view name to its endpoint, hit/miss/eviction counters and,
+            when cached, the commit hash and estimated size of the cached view.
+        """
+        stats = {}
+        for name, derivation in self._derivations.items():
+            entry = self._cache.get(name)
+            stats[name] = {
+                "endpoint": derivation["endpoint"],
+                **self._counters[name],
+                "cached": entry is not None,
+                "commit_hash": entry["commit_hash"] if entry else None,
+                "size": entry["size"] if entry else 0,
+            }
+        return stats
+
+    def _evict(self) -> None:
+        """Evict least recently used views until the size budget is met."""
+        total = self.total_size
+        # Always keep the most recently used view, even if it alone exceeds the budget
+        while total > self.max_bytes and len(self._cache) > 1:
+            name, entry = self._cache.popitem(last=False)
+            total -= entry["size"]
+            self._counters[name]["evictions"] += 1
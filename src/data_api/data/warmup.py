@@ -0,0 +1,136 @@
+"""
+Startup warmup pipeline and readiness tracking.
+
+The application lifespan runs an ordered list of warmup stages (prefetching
+endpoints, running the domain processors, computing derived views). A worker
+reports ready only once every stage has succeeded. Stages that fail at startup
+(e.g. while the upstream is unreachable) are retried in the background with
+exponential backoff, so the worker becomes ready as soon as its hot data is
+materialized instead of staying cold until the first requests arrive.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+# Coroutine function returning whether the stage succeeded
+Stage = Callable[[], Awaitable[bool]]
+
+
+class Warmup:
+    """Ordered warmup stages with per-stage status and overall readiness."""
+
+    def __init__(self, retry_interval: float = 5.0, max_retry_interval: float = 60.0):
+        """
+        Initialize the pipeline.
+
+        Args:
+            retry_interval: Seconds before failed stages are first retried.
+            max_retry_interval: Upper bound for the doubling retry delay.
+        """
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._stages: dict[str, Stage] = {}
+        # name -> {"status": ..., "attempts": ..., "duration": ..., "error": ..., "completed_at": ...}
+        self.stages: dict[str, dict] = {}
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add_stage(self, name: str, stage: Stage) -> None:
+        """
+        Append a stage to the pipeline.
+
+        Args:
+            name: Stage name reported in the status (e.g. "prefetch").
+            stage: Coroutine function returning True once its data is materialized.
+        """
+        self._stages[name] = stage
+        self.stages[name] = {
+            "status": "pending",
+            "attempts": 0,
+            "duration": None,
+            "error": None,
+            "completed_at": None,
+        }
+
+    @property
+    def ready(self) -> bool:
+        """Whether every stage has succeeded."""
+        return all(state["status"] == "ok" for state in self.stages.values())
+
+    async def run(self) -> bool:
+        """
+        Run every stage that has not succeeded yet, in order.
+
+        Later stages run even if an earlier one failed, so partially available
+        data (e.g. from snapshots) is still processed.
+
+        Returns:
+            Whether the worker is ready afterwards.
+        """
+        if self.started_at is None:
+            self.started_at = time.time()
+        for name, stage in self._stages.items():
+            state = self.stages[name]
+            if state["status"] == "ok":
+                continue
+            state["status"] = "running"
+            state["attempts"] += 1
+            start_time = time.perf_counter()
+            try:
+                succeeded = await stage()
+                state["error"] = None if succeeded else "incomplete"
+            except Exception as e:
+                print(f"Warmup stage {name} failed: {e}")
+                succeeded = False
+                state["error"] = str(e)
+            state["duration"] = time.perf_counter() - start_time
+            state["status"] = "ok" if succeeded else "failed"
+            if succeeded:
+                state["completed_at"] = time.time()
+
+        if self.ready and self.ready_at is None:
+            self.ready_at = time.time()
+            print(f"Warmup complete in {self.ready_at - self.started_at:.2f}s, ready to serve")
+        return self.ready
+
+    def start(self) -> None:
+        """Keep retrying failed stages in the background until the worker is ready."""
+        if self.ready or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._retry_loop())
+
+    async def stop(self) -> None:
+        """Cancel background retries."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _retry_loop(self) -> None:
+        delay = self.retry_interval
+        while not self.ready:
+            failed = [name for name, state in self.stages.items() if state["status"] != "ok"]
+            print(f"Not ready ({', '.join(failed)}), retrying warmup in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            await self.run()
+            delay = min(delay * 2, self.max_retry_interval)
+
+    def status(self) -> dict:
+        """
+        Readiness report.
+
+        Returns:
+            Dict with "ready", "started_at", "ready_at" and the per-stage states.
+        """
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "ready_at": self.ready_at,
+            "stages": {name: dict(state) for name, state in self.stages.items()},
+        }
@@ -8,7 +8,7 @@ from typing import Optional
 
 from thefuzz import fuzz
 
-from data_api.data.manager import nthudata
+from data_api.data.manager import nthudata, views
 
 # Constants
 ANNOUNCEMENTS_JSON = "announcements.json"
@@ -16,6 +16,27 @@ ANNOUNCEMENTS_LIST_JSON = "announcements_list.json"
 FUZZY_SEARCH_THRESHOLD = 80
 
 
+def group_by_department(announcements: list[dict]) -> dict[str, list[dict]]:
+    """Group announcement entries by their department, keeping their order."""
+    grouped: dict[str, list[dict]] = {}
+    for announcement in announcements:
+        grouped.setdefault(announcement["department"], []).append(announcement)
+    return grouped
+
+
+ANNOUNCEMENTS_BY_DEPARTMENT = views.register(
+    "announcements.by_department", ANNOUNCEMENTS_JSON, group_by_department
+)
+ANNOUNCEMENTS_LIST_BY_DEPARTMENT = views.register(
+    "announcements_list.by_department", ANNOUNCEMENTS_LIST_JSON, group_by_department
+)
+DEPARTMENTS = views.register(
+    "announcements_list.departments",
+    ANNOUNCEMENTS_LIST_JSON,
+    lambda announcements_list: sorted({a["department"] for a in announcements_list}),
+)
+
+
 class AnnouncementsService:
     """Service for fetching and filtering announcements."""
 
@@ -31,18 +52,18 @@ class AnnouncementsService:
         Returns:
             tuple: (commit_hash, filtered_announcements)
         """
-        result = await nthudata.get(ANNOUNCEMENTS_JSON)
-        if result is None:
-            return None, []
-
-        commit_hash, announcements_data = result
-
         if department:
-            announcements_data = [
-                announcement
-                for announcement in announcements_data
-                if announcement["department"] == department
-            ]
+            result = await views.get(ANNOUNCEMENTS_BY_DEPARTMENT)
+            if result is None:
+                return None, []
+            commit_hash, by_department = result
+            announcements_data = by_department.get(department, [])
+        else:
+            result = await nthudata.get(ANNOUNCEMENTS_JSON)
+            if result is None:
+                return None, []
+            commit_hash, announcements_data = result
+
         if title:
             announcements_data = [
                 announcement
@@ -62,20 +83,17 @@ class AnnouncementsService:
         self, department: Optional[str] = None
     ) -> tuple[Optional[str], list[dict]]:
         """Get announcements list (without article content)."""
-        result = await nthudata.get(ANNOUNCEMENTS_LIST_JSON)
+        if not department:
+            result = await nthudata.get(ANNOUNCEMENTS_LIST_JSON)
+            if result is None:
+                return None, []
+            return result
+
+        result = await views.get(ANNOUNCEMENTS_LIST_BY_DEPARTMENT)
         if result is None:
             return None, []
-
-        commit_hash, announcements_list = result
-
-        if department:
-            announcements_list = [
-                announcement
-                for announcement in announcements_list
-                if announcement["department"] == department
-            ]
-
-        return commit_hash, announcements_list
+        commit_hash, by_department = result
+        return commit_hash, by_department.get(department, [])
 
     async def fuzzy_search_announcements(
         self,
@@ -146,14 +164,10 @@ class AnnouncementsService:
 
     async def list_departments(self) -> tuple[Optional[str], list[str]]:
         """Get list of all departments with announcements."""
-        result = await nthudata.get(ANNOUNCEMENTS_LIST_JSON)
+        result = await views.get(DEPARTMENTS)
         if result is None:
             return None, []
-
-        commit_hash, announcements_list = result
-
-        departments = {announcement["department"] for announcement in announcements_list}
-        return commit_hash, sorted(departments)
+        return result
 
 
 # Global service instance
@@ -1,5 +1,5 @@
 """Buses domain module."""
 
-from . import adapters, enums, models, services
+from . import adapters, enums, models, planner, services
 
-__all__ = ["models", "enums", "services", "adapters"]
+__all__ = ["models", "enums", "services", "adapters", "planner"]
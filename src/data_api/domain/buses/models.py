@@ -45,3 +45,14 @@ class BusDetailedSchedule:
     dep_info: dict[str, str]  # {"time": "...", "description": "..."}
     arr_info: list[dict[str, str]]  # [{"stop": "...", "arrive_time": "..."}]
     bus_type: str
+
+
+@dataclass
+class Trip:
+    """One scheduled bus run along a route, for journey planning."""
+
+    route: Route
+    departure: int  # minutes since midnight at the first stop of the route
+    bus: dict  # raw schedule entry (time, description, line, dep_stop, bus_type)
+    route_type: str  # 'main' or 'nanda'
+    direction: str  # 'up' or 'down'
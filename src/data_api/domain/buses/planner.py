@@ -0,0 +1,155 @@
+"""
+Buses journey planner.
+Earliest-arrival itineraries over the processed timetable, with transfers.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import Optional
+
+from . import models
+
+# Minutes needed to change from one bus to another at the same stop
+TRANSFER_MINUTES = 1
+
+
+@dataclass
+class Leg:
+    """A ride on one trip from a boarding stop to an alighting stop."""
+
+    trip: models.Trip
+    board: int  # position of the boarding stop on the route
+    alight: int  # position of the alighting stop on the route
+
+    @property
+    def board_time(self) -> int:
+        return self.trip.departure + self.trip.route.time_offsets[self.board]
+
+    @property
+    def alight_time(self) -> int:
+        return self.trip.departure + self.trip.route.time_offsets[self.alight]
+
+
+class _Pattern:
+    """Trips running the same route, sorted by departure."""
+
+    def __init__(self, route: models.Route, trips: list[models.Trip]):
+        self.route = route
+        self.trips = sorted(trips, key=lambda trip: trip.departure)
+        self.departures = [trip.departure for trip in self.trips]
+        first = self.trips[0]
+        last_stop = len(route.stops) - 1
+        # Buses toward Nanda only let passengers off at Nanda, buses back only board there
+        if first.route_type == "nanda" and first.direction == "up":
+            self.alight_positions = [last_stop]
+        else:
+            self.alight_positions = list(range(1, last_stop + 1))
+        if first.route_type == "nanda" and first.direction == "down":
+            self.board_positions = [0]
+        else:
+            self.board_positions = list(range(last_stop))
+
+
+class JourneyPlanner:
+    """
+    Earliest-arrival journey planner for one day type.
+
+    At construction, the trips are grouped into patterns (trips along the same
+    route) and every stop gets the sorted departure times of each pattern
+    boarding there. A query runs a time-dependent Dijkstra over the stops: from
+    each reached stop, the earliest boardable trip of every pattern is found by
+    bisection and ridden to each stop it may alight at. The legs before the last
+    one are then moved to the latest trips that still make their connection, so
+    the itinerary does not wait at a transfer stop longer than needed.
+    """
+
+    def __init__(self, trips: list[models.Trip]):
+        """
+        Build the per-stop departure arrays.
+
+        Args:
+            trips: Trips with a valid departure time
+        """
+        by_route: dict[str, list[models.Trip]] = {}
+        for trip in trips:
+            by_route.setdefault(trip.route.id, []).append(trip)
+
+        # Route ID -> pattern
+        self._patterns = {
+            route_id: _Pattern(route_trips[0].route, route_trips)
+            for route_id, route_trips in by_route.items()
+        }
+        # Stop ID -> [(pattern, position of the stop, departure minutes at the stop)]
+        self._departures: dict[str, list[tuple[_Pattern, int, list[int]]]] = {}
+        for pattern in self._patterns.values():
+            for position in pattern.board_positions:
+                offset = pattern.route.time_offsets[position]
+                self._departures.setdefault(pattern.route.stops[position].id, []).append(
+                    (pattern, position, [trip.departure + offset for trip in pattern.trips])
+                )
+
+    def plan(self, origin: str, destination: str, depart_after: int) -> Optional[list[Leg]]:
+        """
+        Find the itinerary arriving earliest, preferring fewer transfers on ties.
+
+        Args:
+            origin: Stop ID to start from (e.g. "S1")
+            destination: Stop ID to reach (e.g. "M3")
+            depart_after: Earliest departure in minutes since midnight
+
+        Returns:
+            The legs of the itinerary (empty if origin is the destination),
+            or None if the destination cannot be reached
+        """
+        if origin == destination:
+            return []
+
+        # Stop ID -> (arrival minutes, legs), and the leg reaching it
+        best: dict[str, tuple[int, int]] = {origin: (depart_after, 0)}
+        reached_by: dict[str, tuple[str, Leg]] = {}
+        queue = [(depart_after, 0, origin)]
+        while queue:
+            arrival, legs, stop = heappop(queue)
+            if stop == destination:
+                break
+            if best[stop] < (arrival, legs):
+                continue
+            ready = arrival if stop == origin else arrival + TRANSFER_MINUTES
+            for pattern, position, departures in self._departures.get(stop, ()):
+                index = bisect_left(departures, ready)
+                if index == len(departures):
+                    continue
+                trip = pattern.trips[index]
+                for alight in pattern.alight_positions:
+                    if alight <= position:
+                        continue
+                    target = pattern.route.stops[alight].id
+                    label = (trip.departure + pattern.route.time_offsets[alight], legs + 1)
+                    if label < best.get(target, (float("inf"), 0)):
+                        best[target] = label
+                        reached_by[target] = (stop, Leg(trip, position, alight))
+                        heappush(queue, (*label, target))
+
+        if destination not in reached_by:
+            return None
+        itinerary = []
+        stop = destination
+        while stop != origin:
+            stop, leg = reached_by[stop]
+            itinerary.append(leg)
+        itinerary.reverse()
+        self._postpone(itinerary)
+        return itinerary
+
+    def _postpone(self, itinerary: list[Leg]) -> None:
+        """Move each leg but the last to the latest trip still making the next connection."""
+        for i in range(len(itinerary) - 2, -1, -1):
+            leg = itinerary[i]
+            pattern = self._patterns[leg.trip.route.id]
+            latest_alight = itinerary[i + 1].board_time - TRANSFER_MINUTES
+            index = bisect_right(
+                pattern.departures, latest_alight - pattern.route.time_offsets[leg.alight]
+            )
+            # Trips of a pattern never overtake, so this is at least the current trip
+            itinerary[i] = Leg(pattern.trips[index - 1], leg.board, leg.alight)
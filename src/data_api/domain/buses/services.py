@@ -5,13 +5,16 @@ Handles data fetching, caching, and processing using the Graph module.
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from bisect import bisect_left
 from itertools import product
+from operator import itemgetter
 from typing import Any, Literal, Optional, cast
 
-from data_api.core import constants
-from data_api.data.manager import nthudata
-from data_api.domain.buses import enums, graph, models
+from data_api.core import constants, metrics
+from data_api.data.manager import nthudata, refresher
+from data_api.data.nthudata import SingleFlight
+from data_api.domain.buses import enums, graph, models, planner
 
 # Constants
 DATA_TTL_HOURS = constants.DATA_TTL_HOURS
@@ -27,8 +30,96 @@ ScheduleKey = tuple[str, str, str]
 ScheduleStore = dict[ScheduleKey, list[dict[str, Any]]]
 RouteInfoKey = tuple[str, str]
 
+# Stop name -> stop ID
+STOP_IDS = {stop.name: stop_id for stop_id, stop in graph.STOPS_DATA.items()}
+
+
+# Times are handled as minutes since midnight; "HH:MM" strings are only parsed
+# from the upstream data and formatted for responses.
+MINUTES_PER_DAY = 24 * 60
+# Departures listed before this time are past-midnight runs of the same timetable
+SERVICE_DAY_START = 4 * 60
+# Sort key of entries without a valid time, after every real time
+INVALID_TIME = 1 << 30
+
 
 # --- Helper Functions ---
+def time_to_minutes(time_str: Any) -> Optional[int]:
+    """
+    Parse an "HH:MM" string into minutes since midnight.
+
+    Args:
+        time_str: Time in "HH:MM" format (single-digit hours are accepted)
+
+    Returns:
+        Minutes in the range 0-1439, or None if the value is not a valid time
+    """
+    try:
+        hours, minutes = time_str.split(":")
+        hours, minutes = int(hours), int(minutes)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    """
+    Format minutes since midnight as "HH:MM", wrapping past-midnight values.
+
+    Args:
+        minutes: Minutes since midnight (may exceed one day)
+
+    Returns:
+        Time string in "HH:MM" format
+    """
+    hours, minutes = divmod(minutes % MINUTES_PER_DAY, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def departure_minutes(time_str: Any) -> int:
+    """
+    Sort key of a departure time within its timetable.
+
+    Departures before ``SERVICE_DAY_START`` belong to the end of the service
+    day, so e.g. "00:20" sorts after "23:50" and arrivals derived from it keep
+    their order.
+
+    Args:
+        time_str: Departure time in "HH:MM" format
+
+    Returns:
+        Minutes since the start of the service day's date, or ``INVALID_TIME``
+    """
+    minutes = time_to_minutes(time_str)
+    if minutes is None:
+        return INVALID_TIME
+    return minutes + MINUTES_PER_DAY if minutes < SERVICE_DAY_START else minutes
+
+
+def _query_minutes(time_str: Any, latest: int) -> int:
+    """
+    Place a query time in the service day of a timetable.
+
+    A time before ``SERVICE_DAY_START`` is still in the previous service day while
+    that day has post-midnight runs left; otherwise it looks ahead to the morning.
+
+    Args:
+        time_str: Query time in "HH:MM" format
+        latest: Sort key of the timetable's last departure (see ``departure_minutes``)
+
+    Returns:
+        Minutes comparable with ``departure_minutes`` keys, or ``INVALID_TIME``
+    """
+    minutes = time_to_minutes(time_str)
+    if minutes is None:
+        return INVALID_TIME
+    if minutes < SERVICE_DAY_START and latest >= minutes + MINUTES_PER_DAY:
+        return minutes + MINUTES_PER_DAY
+    return minutes
+
+
 def after_specific_time(target_list: list[dict], time_str: str, time_keys: list[str]) -> list[dict]:
     """
     Filter list to keep only items after specified time.
@@ -39,28 +130,24 @@ def after_specific_time(target_list: list[dict], time_str: str, time_keys: list[
         time_keys: Path to the time field (e.g., ["time"] or ["dep_info", "time"])
 
     Returns:
-        Filtered list containing only items with time >= time_str
+        Filtered list containing only items with time >= time_str, both placed in
+        the service day (see ``departure_minutes`` and ``_query_minutes``)
     """
     if not time_str or not target_list:
         return target_list or []
 
-    try:
-        ref_time = datetime.strptime(time_str, "%H:%M")
-        filtered = []
-        for item in target_list:
-            item_time_str = _extract_nested_value(item, time_keys)
-            if not isinstance(item_time_str, str):
-                continue
-
-            try:
-                item_time = datetime.strptime(item_time_str, "%H:%M")
-                if item_time >= ref_time:
-                    filtered.append(item)
-            except ValueError:
-                continue
-        return filtered
-    except ValueError:
+    item_minutes = [
+        departure_minutes(_extract_nested_value(item, time_keys)) for item in target_list
+    ]
+    latest = max((m for m in item_minutes if m != INVALID_TIME), default=-1)
+    ref_minutes = _query_minutes(time_str, latest)
+    if ref_minutes == INVALID_TIME:
         return []
+    return [
+        item
+        for item, minutes in zip(target_list, item_minutes)
+        if minutes != INVALID_TIME and minutes >= ref_minutes
+    ]
 
 
 def _extract_nested_value(data: dict, keys: list[str]) -> Any:
@@ -85,70 +172,229 @@ def add_time(time_str: str, minutes: int) -> str:
     Returns:
         New time string in "HH:MM" format, or original on error
     """
-    try:
-        dt = datetime.strptime(time_str, "%H:%M") + timedelta(minutes=minutes)
-        return dt.strftime("%H:%M")
-    except (ValueError, TypeError):
+    start = time_to_minutes(time_str)
+    if start is None:
         return time_str
+    return minutes_to_time(start + minutes)
 
 
 def sort_by_time(target: list[dict], time_keys: list[str]) -> None:
     """
     Sort list of dictionaries by time field in-place.
 
+    Times are ordered within the service day like the registries (see
+    ``departure_minutes``), with invalid ones last.
+
     Args:
         target: List to sort
         time_keys: Path to the time field (e.g., ["time"] or ["dep_info", "time"])
     """
+    target.sort(key=lambda x: departure_minutes(_extract_nested_value(x, time_keys)))
 
-    def get_sort_key(x):
-        time_str = _extract_nested_value(x, time_keys)
-        if not isinstance(time_str, str):
-            return datetime.max
-        try:
-            return datetime.strptime(time_str, "%H:%M")
-        except (ValueError, TypeError):
-            return datetime.max  # Push invalid to end
 
-    target.sort(key=get_sort_key)
+def _sort_decorated(decorated: list[tuple[int, dict]]) -> tuple[list[int], list[dict]]:
+    """Stable-sort (minutes, entry) pairs, returning the key and entry lists."""
+    decorated.sort(key=itemgetter(0))
+    return [minutes for minutes, _ in decorated], [entry for _, entry in decorated]
 
 
-class BusesService:
+def _slice_after(
+    keys: list[int], entries: list[dict], time_str: str, limit: Optional[int]
+) -> list[dict]:
     """
-    Bus schedule management service.
+    First ``limit`` entries at or after ``time_str`` of a sorted list, by bisection.
 
-    This service handles:
-    - Fetching and caching bus schedule data from remote source
-    - Processing raw schedules into detailed schedules with arrival times
-    - Managing route information and stop registries
-    - Providing query methods for schedules and stop information
+    Args:
+        keys: Sorted minutes parallel to ``entries``
+        entries: Entries sorted by time
+        time_str: Reference time in "HH:MM" format, or empty for no filtering; see
+            ``_query_minutes`` for times before ``SERVICE_DAY_START``
+        limit: Maximum number of entries (None for all)
+
+    Returns:
+        A slice of ``entries`` (the entry dicts themselves are not copied)
+    """
+    if not time_str:
+        return entries[:limit]
+    # Entries without a valid time sort last and never match a time
+    valid = bisect_left(keys, INVALID_TIME)
+    ref_minutes = _query_minutes(time_str, keys[valid - 1] if valid else -1)
+    if ref_minutes == INVALID_TIME:
+        return []
+    start = bisect_left(keys, ref_minutes, 0, valid)
+    end = valid
+    if limit is not None:
+        end = min(end, start + limit)
+    return entries[start:end]
+
+
+def _combined_sources(key: ScheduleKey) -> Optional[tuple[ScheduleKey, ScheduleKey]]:
+    """The two keys whose lists make up a combined ("all") key, or None for a base key."""
+    rtype, day, rdir = key
+    if rdir == "all":
+        return (rtype, day, "up"), (rtype, day, "down")
+    if rtype == "all":
+        return ("main", day, rdir), ("nanda", day, rdir)
+    return None
+
+
+def _merge_sorted(
+    first: list[int], second: list[int], *runs: tuple[list[dict], list[dict]]
+) -> tuple[list[int], list[list[dict]]]:
+    """
+    Merge two sorted runs in linear time, keeping equal times in run order.
+
+    Args:
+        first: Sorted minutes of the first run
+        second: Sorted minutes of the second run
+        runs: Pairs of entry lists parallel to ``first`` and ``second``
 
-    The service maintains three main data structures:
+    Returns:
+        The merged keys and, for each pair of ``runs``, the merged entries
+    """
+    # True where the merged list takes the next item of the second run
+    picks = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if second[j] < first[i]:
+            picks.append(True)
+            j += 1
+        else:
+            picks.append(False)
+            i += 1
+    picks.extend([False] * (len(first) - i))
+    picks.extend([True] * (len(second) - j))
+    return _pick(picks, first, second), [_pick(picks, a, b) for a, b in runs]
+
+
+def _pick(picks: list[bool], first: list, second: list) -> list:
+    first_items, second_items = iter(first), iter(second)
+    return [next(second_items) if take else next(first_items) for take in picks]
+
+
+class Timetable:
+    """
+    One processed version of buses.json.
+
+    Holds the three main data structures:
     1. raw_schedule_data: Basic departure times and info
     2. detailed_schedule_data: Schedules with calculated arrival times per stop
     3. stops_schedule_registry: Index of all buses arriving at each stop
+
+    Every list is kept sorted by time, with a parallel list of the times in
+    minutes (see ``departure_minutes``) used for sorting, merging and bisection,
+    so the "HH:MM" strings are parsed once per departure.
+
+    Only the per-route, per-direction lists are built when the data changes.
+    The combined views ("all" route types or directions) are merged from them
+    on first request and kept for the lifetime of the timetable.
     """
 
     def __init__(self) -> None:
         # Schedule data stores: (route_type, day, direction) -> list of schedules
-        self.raw_schedule_data = self._new_schedule_store()
-        self.detailed_schedule_data = self._new_schedule_store()
-        self._route_info: dict[RouteInfoKey, dict[str, Any]] = {}
+        # Combined ("all") keys are only present once materialized
+        self.raw_schedule_data: ScheduleStore = {}
+        self.detailed_schedule_data: ScheduleStore = {}
+        self.route_info: dict[RouteInfoKey, dict[str, Any]] = {}
 
         # Stop data aggregation (Stop ID -> {(RouteType, Day, Direction) -> List[Items]})
-        self.stops_schedule_registry: dict[str, dict[ScheduleKey, list[dict[str, Any]]]] = {}
+        self.stops_schedule_registry: dict[str, dict[ScheduleKey, list[dict[str, Any]]]] = {
+            s_id: {} for s_id in graph.STOPS_DATA.keys()
+        }
+
+        # Departure minutes parallel to the lists of both schedule stores
+        self.schedule_keys: dict[ScheduleKey, list[int]] = {}
+        # Arrival minutes parallel to the stop registry lists
+        self.stop_keys: dict[str, dict[ScheduleKey, list[int]]] = {
+            s_id: {} for s_id in graph.STOPS_DATA.keys()
+        }
+
+        # Track Gen2 (綜二館) departures for route calculation: (minutes, line)
+        self.gen2_departures: set[tuple[int, str]] = set()
+        # buses.json list each per-route, per-direction schedule was built from
+        self.sources: dict[ScheduleKey, Any] = {}
+        # Trips of each per-route, per-direction schedule, and the journey planner per day
+        self.trips: dict[ScheduleKey, list[models.Trip]] = {}
+        self.planners: dict[str, planner.JourneyPlanner] = {}
+
+    def materialize(self, key: ScheduleKey) -> None:
+        """Merge a combined schedule view of both stores on first use."""
+        sources = _combined_sources(key)
+        if sources is None or key in self.schedule_keys:
+            return
+        first, second = sources
+        self.materialize(first)
+        self.materialize(second)
+        keys, (raw, detailed) = _merge_sorted(
+            self.schedule_keys.get(first, []),
+            self.schedule_keys.get(second, []),
+            (self.raw_schedule_data.get(first, []), self.raw_schedule_data.get(second, [])),
+            (
+                self.detailed_schedule_data.get(first, []),
+                self.detailed_schedule_data.get(second, []),
+            ),
+        )
+        self.raw_schedule_data[key] = raw
+        self.detailed_schedule_data[key] = detailed
+        self.schedule_keys[key] = keys
+
+    def materialize_stop(self, stop_id: str, key: ScheduleKey) -> None:
+        """Merge a combined view of a stop's arrivals on first use."""
+        sources = _combined_sources(key)
+        stop_keys = self.stop_keys.get(stop_id)
+        if sources is None or stop_keys is None or key in stop_keys:
+            return
+        first, second = sources
+        self.materialize_stop(stop_id, first)
+        self.materialize_stop(stop_id, second)
+        stop_data = self.stops_schedule_registry[stop_id]
+        keys, (entries,) = _merge_sorted(
+            stop_keys.get(first, []),
+            stop_keys.get(second, []),
+            (stop_data.get(first, []), stop_data.get(second, [])),
+        )
+        stop_data[key] = entries
+        stop_keys[key] = keys
 
+
+class BusesService:
+    """
+    Bus schedule management service.
+
+    This service handles:
+    - Fetching and caching bus schedule data from remote source
+    - Processing raw schedules into detailed schedules with arrival times
+    - Managing route information and stop registries
+    - Providing query methods for schedules and stop information
+
+    The processed data lives in a ``Timetable``. When buses.json changes, the
+    new timetable is built off to the side (in a worker thread, reusing the
+    schedules whose source list did not change) and then swapped in with a
+    single assignment, so queries always read one complete version.
+    """
+
+    def __init__(self) -> None:
+        self._timetable = Timetable()
         self.last_commit_hash = None
         self._res_json: dict[str, Any] = {}
-        # Track Gen2 (綜二館) departures for route calculation
-        self._gen2_departures: set[str] = set()
+        # Coalesces concurrent rebuilds of the same commit
+        self._rebuilds = SingleFlight()
 
-    def _new_schedule_store(self) -> ScheduleStore:
-        """Create empty schedule store with all possible keys."""
-        return {
-            (rtype, day, direction): []
-            for rtype, day, direction in product(BUS_ROUTE_TYPE, BUS_DAY, BUS_DIRECTION)
-        }
+    @property
+    def raw_schedule_data(self) -> ScheduleStore:
+        return self._timetable.raw_schedule_data
+
+    @property
+    def detailed_schedule_data(self) -> ScheduleStore:
+        return self._timetable.detailed_schedule_data
+
+    @property
+    def stops_schedule_registry(self) -> dict[str, dict[ScheduleKey, list[dict[str, Any]]]]:
+        return self._timetable.stops_schedule_registry
+
+    @property
+    def _route_info(self) -> dict[RouteInfoKey, dict[str, Any]]:
+        return self._timetable.route_info
 
     async def update_data(self) -> None:
         """
@@ -167,42 +413,103 @@ class BusesService:
         if not isinstance(payload, dict):
             return
 
-        self._res_json = payload
+        if payload and res_commit_hash != self.last_commit_hash:
+            await self._rebuilds.do(
+                str(res_commit_hash), lambda: self._rebuild(payload, res_commit_hash)
+            )
 
-        if self._res_json and res_commit_hash != self.last_commit_hash:
-            self._process_all_data()
-            self.last_commit_hash = res_commit_hash
+    async def update_on_request(self) -> None:
+        """
+        Update bus schedule data from the request path, unless refreshed in the background.
+
+        While the background refresher runs, it rebuilds the timetable after
+        buses.json changes, so requests only read the materialized timetable.
+        """
+        if not refresher.running:
+            await self.update_data()
+
+    async def _rebuild(self, payload: dict, commit_hash: Optional[str]) -> None:
+        """Build the timetable of ``payload`` in a worker thread and swap it in."""
+        if commit_hash == self.last_commit_hash:
+            return
+        # Metrics are only updated on the event loop, so time the thread from here
+        with metrics.PROCESSING_DURATION.time("buses"):
+            timetable = await asyncio.to_thread(self._build_timetable, payload, self._timetable)
+        # Swap everything at once, nothing awaits in between
+        self._timetable = timetable
+        self._res_json = payload
+        self.last_commit_hash = commit_hash
 
     def _process_all_data(self) -> None:
+        """Rebuild the timetable from the current buses.json payload and swap it in."""
+        with metrics.PROCESSING_DURATION.time("buses"):
+            self._timetable = self._build_timetable(self._res_json, self._timetable)
+
+    def _build_timetable(self, payload: dict, previous: Optional[Timetable] = None) -> Timetable:
         """
         Main processing pipeline for bus data.
 
         Steps:
-        1. Reset all data structures
-        2. Populate route info (metadata)
-        3. Process raw schedules from JSON
-        4. Generate detailed schedules with arrival times
-        5. Sort all schedules by time
-        6. Derive combined views (all routes, all directions)
+        1. Populate route info (metadata)
+        2. Collect Gen2 departures, which affect every main campus route
+        3. Per route, day and direction: process the raw schedule, then generate
+           detailed schedules and stop arrivals (reused from ``previous`` if the
+           source list and the Gen2 departures it depends on are unchanged)
+        4. Build the journey planner of each day from the trips
+
+        Combined views (all routes, all directions) are derived on request.
+
+        Args:
+            payload: Decoded buses.json
+            previous: Timetable of the previous version, if any
+
+        Returns:
+            The new timetable, not yet visible to queries
         """
-        self._reset_registries()
-        self._populate_info_data()
-        self._populate_raw_schedule()
-        self._generate_detailed_schedule_and_stops()
-        self._sort_schedule_store(self.raw_schedule_data, ["time"])
-        self._sort_schedule_store(self.detailed_schedule_data, ["dep_info", "time"])
-        self._sort_stop_registry_lists()
-        self._derive_combined_views()
-
-    def _reset_registries(self) -> None:
-        self._gen2_departures.clear()
-        self.raw_schedule_data = self._new_schedule_store()
-        self.detailed_schedule_data = self._new_schedule_store()
-        self._route_info = {}
-        self.stops_schedule_registry = {s_id: {} for s_id in graph.STOPS_DATA.keys()}
+        timetable = Timetable()
+        self._populate_info_data(timetable, payload)
+        self._collect_gen2_departures(timetable, payload)
+        for key in product(BUS_ROUTE_TYPE_WITHOUT_ALL, BUS_DAY, BUS_DIRECTION_WITHOUT_ALL):
+            raw_list = payload.get(self._get_schedule_json_key(*key), [])
+            timetable.sources[key] = raw_list
+            if previous is not None and self._is_unchanged(previous, timetable, key):
+                self._reuse_schedule(timetable, previous, key)
+            else:
+                self._build_schedule(timetable, key, raw_list)
+        for day in BUS_DAY:
+            timetable.planners[day] = planner.JourneyPlanner(
+                [trip for key, trips in timetable.trips.items() if key[1] == day for trip in trips]
+            )
+        return timetable
+
+    def _is_unchanged(self, previous: Timetable, timetable: Timetable, key: ScheduleKey) -> bool:
+        """Whether the schedule of ``key`` can be reused from the previous timetable."""
+        if key not in previous.sources or previous.sources[key] != timetable.sources[key]:
+            return False
+        # Main campus routes depend on the Gen2 departures of every main schedule
+        return key[0] != "main" or previous.gen2_departures == timetable.gen2_departures
+
+    def _reuse_schedule(self, timetable: Timetable, previous: Timetable, key: ScheduleKey) -> None:
+        timetable.raw_schedule_data[key] = previous.raw_schedule_data[key]
+        timetable.detailed_schedule_data[key] = previous.detailed_schedule_data[key]
+        timetable.schedule_keys[key] = previous.schedule_keys[key]
+        timetable.trips[key] = previous.trips[key]
+        for stop_id, stop_keys in previous.stop_keys.items():
+            if key in stop_keys:
+                timetable.stop_keys[stop_id][key] = stop_keys[key]
+                timetable.stops_schedule_registry[stop_id][key] = previous.stops_schedule_registry[
+                    stop_id
+                ][key]
+
+    def _build_schedule(self, timetable: Timetable, key: ScheduleKey, raw_list: Any) -> None:
+        """Process one raw schedule into the stores and the stop registry."""
+        keys, enhanced_list = self._populate_raw_schedule(key, raw_list)
+        timetable.schedule_keys[key] = keys
+        timetable.raw_schedule_data[key] = enhanced_list
+        self._generate_detailed_schedule_and_stops(timetable, key)
 
     # --- 1. Info Data ---
-    def _populate_info_data(self) -> None:
+    def _populate_info_data(self, timetable: Timetable, payload: dict) -> None:
         mapping = {
             ("main", "up"): "towardTSMCBuildingInfo",
             ("main", "down"): "towardMainGateInfo",
@@ -210,23 +517,19 @@ class BusesService:
             ("nanda", "down"): "towardMainCampusInfo",
         }
         for (rtype, rdir), json_key in mapping.items():
-            self._route_info[(rtype, rdir)] = self._res_json.get(json_key, {})
+            timetable.route_info[(rtype, rdir)] = payload.get(json_key, {})
 
     # --- 2. Raw Schedule ---
-    def _populate_raw_schedule(self) -> None:
-        """Process raw bus schedules from JSON data."""
-        for rtype, day, rdir in product(
-            BUS_ROUTE_TYPE_WITHOUT_ALL, BUS_DAY, BUS_DIRECTION_WITHOUT_ALL
-        ):
-            json_key = self._get_schedule_json_key(rtype, day, rdir)
-            raw_list = self._res_json.get(json_key, [])
-
-            enhanced_list = []
-            for item in raw_list:
-                bus = self._enhance_schedule_item(item, rtype, day, rdir)
-                enhanced_list.append(bus)
-
-            self.raw_schedule_data[(rtype, day, rdir)] = enhanced_list
+    def _populate_raw_schedule(
+        self, key: ScheduleKey, raw_list: Any
+    ) -> tuple[list[int], list[dict]]:
+        """Process a raw bus schedule from JSON data, sorted by departure time."""
+        rtype, day, rdir = key
+        decorated = []
+        for item in raw_list if isinstance(raw_list, list) else []:
+            bus = self._enhance_schedule_item(item, rtype, day, rdir)
+            decorated.append((departure_minutes(bus.get("time")), bus))
+        return _sort_decorated(decorated)
 
     def _get_schedule_json_key(self, rtype: str, day: str, rdir: str) -> str:
         """Generate JSON key for bus schedule lookup."""
@@ -244,8 +547,6 @@ class BusesService:
 
         if rtype == "nanda":
             self._enhance_nanda_schedule(bus, rdir)
-        elif rtype == "main":
-            self._track_gen2_departures_if_needed(bus)
 
         return bus
 
@@ -254,14 +555,15 @@ class BusesService:
         bus["dep_stop"] = "校門" if rdir == "up" else "南大"
         bus["line"] = graph.resolver.get_nanda_line(bus.get("description", ""))
 
-    def _track_gen2_departures_if_needed(self, bus: dict) -> None:
+    def _collect_gen2_departures(self, timetable: Timetable, payload: dict) -> None:
         """Track Gen2 (綜二) departures for main campus route calculation."""
-        if "綜二" in bus.get("dep_stop", ""):
-            line = bus.get("line", "")
-            time = bus.get("time", "")
-            predicted_gate_time = add_time(time, 7)
-            self._gen2_departures.add(f"{predicted_gate_time}{line}")
-            self._gen2_departures.add(f"0{predicted_gate_time}{line}")
+        for day, rdir in product(BUS_DAY, BUS_DIRECTION_WITHOUT_ALL):
+            raw_list = payload.get(self._get_schedule_json_key("main", day, rdir), [])
+            for bus in raw_list if isinstance(raw_list, list) else []:
+                if "綜二" in bus.get("dep_stop", ""):
+                    dep_minutes = departure_minutes(bus.get("time"))
+                    if dep_minutes != INVALID_TIME:
+                        timetable.gen2_departures.add((dep_minutes + 7, bus.get("line", "")))
 
     def _classify_bus_type(self, rtype: str, day: str, desc: str) -> str:
         """
@@ -288,76 +590,82 @@ class BusesService:
         return enums.BusType.middle_sized_bus.value
 
     # --- 3. Detailed Schedule & Route Calculation ---
-    def _generate_detailed_schedule_and_stops(self) -> None:
-        """Generate detailed schedules with arrival times for each stop."""
-        for rtype, day, rdir in product(
-            BUS_ROUTE_TYPE_WITHOUT_ALL, BUS_DAY, BUS_DIRECTION_WITHOUT_ALL
-        ):
-            raw_list = self.raw_schedule_data.get((rtype, day, rdir), [])
-            if not isinstance(raw_list, list):
-                continue
-
-            detailed_list = []
-            for bus in raw_list:
-                detailed_entry = self._create_detailed_schedule_entry(bus, rtype, day, rdir)
-                detailed_list.append(detailed_entry)
-
-            self.detailed_schedule_data[(rtype, day, rdir)] = detailed_list
-
-    def _create_detailed_schedule_entry(self, bus: dict, rtype: str, day: str, rdir: str) -> dict:
-        """Create a detailed schedule entry with stop arrival times."""
-        route = self._get_route_from_graph(bus, rtype, rdir)
-        stops_time_info = []
-
-        if route:
-            start_time = bus.get("time", "00:00")
-            stops_time_info = self._calculate_stop_arrival_times(
-                route, start_time, bus, rtype, day, rdir
+    def _generate_detailed_schedule_and_stops(self, timetable: Timetable, key: ScheduleKey) -> None:
+        """Generate the detailed schedule of ``key`` with arrival times for each stop."""
+        rtype, day, rdir = key
+        # Stop ID -> [(arrival minutes, entry)]
+        arrivals: dict[str, list[tuple[int, dict]]] = {}
+
+        # The raw list is already sorted, so the detailed one shares its keys
+        detailed_list = []
+        trips = timetable.trips[key] = []
+        for bus, dep_minutes in zip(timetable.raw_schedule_data[key], timetable.schedule_keys[key]):
+            route = self._get_route_from_graph(timetable, bus, dep_minutes, rtype, rdir)
+            stops_time_info = []
+            if route:
+                stops_time_info = self._calculate_stop_arrival_times(
+                    route, dep_minutes, bus, arrivals
+                )
+                if dep_minutes != INVALID_TIME:
+                    trips.append(models.Trip(route, dep_minutes, bus, rtype, rdir))
+            detailed_list.append(
+                {
+                    "dep_info": bus,
+                    "stops_time": stops_time_info,
+                    "bus_type": bus.get("bus_type", ""),
+                }
             )
+        timetable.detailed_schedule_data[key] = detailed_list
 
-        return {
-            "dep_info": bus,
-            "stops_time": stops_time_info,
-            "bus_type": bus.get("bus_type", ""),
-        }
+        for stop_id, decorated in arrivals.items():
+            keys, entries = _sort_decorated(decorated)
+            timetable.stops_schedule_registry.setdefault(stop_id, {})[key] = entries
+            timetable.stop_keys.setdefault(stop_id, {})[key] = keys
 
     def _calculate_stop_arrival_times(
         self,
         route: models.Route,
-        start_time: str,
+        dep_minutes: int,
         bus: dict,
-        rtype: str,
-        day: str,
-        rdir: str,
+        arrivals: dict[str, list[tuple[int, dict]]],
     ) -> list[dict]:
         """Calculate arrival times for each stop on the route."""
+        start_time = bus.get("time", "00:00")
         stops_time_info = []
         for stop, offset in zip(route.stops, route.time_offsets):
-            arr_time = add_time(start_time, offset)
+            if dep_minutes == INVALID_TIME:
+                arr_minutes, arr_time = INVALID_TIME, start_time
+            else:
+                # Runs crossing midnight keep counting past 1440 so they stay in order
+                arr_minutes = dep_minutes + offset
+                arr_time = minutes_to_time(arr_minutes)
             stops_time_info.append({"stop": stop.name, "arrive_time": arr_time})
 
             # Register this bus arrival at the stop
-            self._add_to_stop_registry(
-                stop.id,
-                rtype,
-                day,
-                rdir,
-                {
-                    "arrive_time": arr_time,
-                    "dep_time": start_time,
-                    "dep_stop": bus.get("dep_stop", ""),
-                    "description": bus.get("description", ""),
-                    "bus_type": bus.get("bus_type", ""),
-                },
+            arrivals.setdefault(stop.id, []).append(
+                (
+                    arr_minutes,
+                    {
+                        "arrive_time": arr_time,
+                        "dep_time": start_time,
+                        "dep_stop": bus.get("dep_stop", ""),
+                        "description": bus.get("description", ""),
+                        "bus_type": bus.get("bus_type", ""),
+                    },
+                )
             )
         return stops_time_info
 
-    def _get_route_from_graph(self, bus: dict, rtype: str, rdir: str) -> Optional[models.Route]:
+    def _get_route_from_graph(
+        self, timetable: Timetable, bus: dict, dep_minutes: int, rtype: str, rdir: str
+    ) -> Optional[models.Route]:
         """
         Determine the route for a bus schedule entry.
 
         Args:
+            timetable: Timetable being built, with its Gen2 departures
             bus: Bus schedule dictionary with time, line, dep_stop, etc.
+            dep_minutes: Departure time of the bus in minutes
             rtype: Route type ('main' or 'nanda')
             rdir: Direction ('up' or 'down')
 
@@ -365,22 +673,20 @@ class BusesService:
             Route object if found, None otherwise
         """
         if rtype == "main":
-            return self._resolve_main_campus_route(bus)
+            return self._resolve_main_campus_route(timetable, bus, dep_minutes)
         elif rtype == "nanda":
             return self._resolve_nanda_route(bus, rdir)
         return None
 
-    def _resolve_main_campus_route(self, bus: dict) -> Optional[models.Route]:
+    def _resolve_main_campus_route(
+        self, timetable: Timetable, bus: dict, dep_minutes: int
+    ) -> Optional[models.Route]:
         """Resolve main campus route based on line, departure stop, and time."""
         line = bus.get("line", "")
         dep_stop = bus.get("dep_stop", "")
-        time_val = bus.get("time", "")
 
         # Check if this bus departs from Gen2 (綜二) by inference
-        identifier = f"{time_val}{line}"
-        is_from_gen2 = (
-            identifier in self._gen2_departures or f"0{identifier}" in self._gen2_departures
-        )
+        is_from_gen2 = (dep_minutes, line) in timetable.gen2_departures
 
         return graph.resolver.resolve_main_campus_route(line, dep_stop, is_from_gen2)
 
@@ -389,75 +695,6 @@ class BusesService:
         direction = cast(Literal["up", "down"], rdir)
         return graph.resolver.resolve_nanda_route(direction, bus.get("description", ""))
 
-    def _add_to_stop_registry(
-        self, stop_id: str, rtype: str, day: str, rdir: str, data: dict
-    ) -> None:
-        stop_data = self.stops_schedule_registry.setdefault(stop_id, {})
-        stop_data.setdefault((rtype, day, rdir), []).append(data)
-
-    def _sort_schedule_store(self, store: ScheduleStore, time_path: list[str]) -> None:
-        for entries in store.values():
-            if isinstance(entries, list) and entries:
-                sort_by_time(entries, time_path)
-
-    def _sort_stop_registry_lists(self) -> None:
-        for stop_data in self.stops_schedule_registry.values():
-            for entries in stop_data.values():
-                if entries:
-                    sort_by_time(entries, ["arrive_time"])
-
-    # --- 4. Post-Processing ("All" fields) ---
-    def _derive_combined_views(self) -> None:
-        self._combine_route_types_for_store(self.raw_schedule_data, ["time"])
-        self._combine_route_types_for_store(self.detailed_schedule_data, ["dep_info", "time"])
-        self._combine_route_types_for_stops()
-
-        self._combine_directions_for_store(self.raw_schedule_data, ["time"])
-        self._combine_directions_for_store(self.detailed_schedule_data, ["dep_info", "time"])
-        self._combine_directions_for_stops()
-
-    def _combine_route_types_for_store(self, store: ScheduleStore, time_path: list[str]) -> None:
-        for day, rdir in product(BUS_DAY, BUS_DIRECTION_WITHOUT_ALL):
-            combined = [
-                *store.get(("main", day, rdir), []),
-                *store.get(("nanda", day, rdir), []),
-            ]
-            if combined:
-                sort_by_time(combined, time_path)
-            store[("all", day, rdir)] = combined
-
-    def _combine_directions_for_store(self, store: ScheduleStore, time_path: list[str]) -> None:
-        for rtype, day in product(BUS_ROUTE_TYPE, BUS_DAY):
-            combined = [
-                *store.get((rtype, day, "up"), []),
-                *store.get((rtype, day, "down"), []),
-            ]
-            if combined:
-                sort_by_time(combined, time_path)
-            store[(rtype, day, "all")] = combined
-
-    def _combine_route_types_for_stops(self) -> None:
-        for stop_data in self.stops_schedule_registry.values():
-            for day, rdir in product(BUS_DAY, BUS_DIRECTION_WITHOUT_ALL):
-                combined = [
-                    *stop_data.get(("main", day, rdir), []),
-                    *stop_data.get(("nanda", day, rdir), []),
-                ]
-                if combined:
-                    sort_by_time(combined, ["arrive_time"])
-                stop_data[("all", day, rdir)] = combined
-
-    def _combine_directions_for_stops(self) -> None:
-        for stop_data in self.stops_schedule_registry.values():
-            for rtype, day in product(BUS_ROUTE_TYPE, BUS_DAY):
-                combined = [
-                    *stop_data.get((rtype, day, "up"), []),
-                    *stop_data.get((rtype, day, "down"), []),
-                ]
-                if combined:
-                    sort_by_time(combined, ["arrive_time"])
-                stop_data[(rtype, day, "all")] = combined
-
     def _get_route_data_bundle(self, rtype: str) -> dict:
         mapping_name = "TSMC_building" if rtype == "main" else "nanda"
         down_name = "main_gate" if rtype == "main" else "main_campus"
@@ -494,8 +731,11 @@ class BusesService:
     def get_schedule(
         self, *, route_type: str, day: str, direction: str, detailed: bool = False
     ) -> list[dict]:
-        store = self.detailed_schedule_data if detailed else self.raw_schedule_data
-        return store.get((route_type, day, direction), [])
+        timetable = self._timetable
+        key = (route_type, day, direction)
+        timetable.materialize(key)
+        store = timetable.detailed_schedule_data if detailed else timetable.raw_schedule_data
+        return store.get(key, [])
 
     def gen_bus_stops_info(self) -> list[dict]:
         return [
@@ -508,14 +748,156 @@ class BusesService:
             for s in graph.STOPS_DATA.values()
         ]
 
+    def get_next_departures(
+        self,
+        *,
+        route_type: str,
+        day: str,
+        direction: str,
+        after: str,
+        limit: Optional[int] = None,
+        detailed: bool = False,
+    ) -> list[dict]:
+        """
+        Departures at or after a time, found by bisection on the sorted schedule.
+
+        Args:
+            route_type: Route type ('main', 'nanda' or 'all')
+            day: Day type ('weekday' or 'weekend')
+            direction: Direction ('up', 'down' or 'all')
+            after: Reference time in "HH:MM" format, or empty for the whole day
+            limit: Maximum number of departures (None for all)
+            detailed: Whether to return detailed schedules with stop arrival times
+
+        Returns:
+            The matching schedule entries in departure order
+        """
+        timetable = self._timetable
+        key = (route_type, day, direction)
+        timetable.materialize(key)
+        store = timetable.detailed_schedule_data if detailed else timetable.raw_schedule_data
+        return _slice_after(timetable.schedule_keys.get(key, []), store.get(key, []), after, limit)
+
     def get_stop_schedule(self, stop_name: str, rtype: str, day: str, rdir: str) -> list[dict]:
-        stop_id = next((k for k, v in graph.STOPS_DATA.items() if v.name == stop_name), None)
+        stop_id = STOP_IDS.get(stop_name)
         if not stop_id:
             return []
 
-        registry_data = self.stops_schedule_registry.get(stop_id, {})
+        timetable = self._timetable
+        timetable.materialize_stop(stop_id, (rtype, day, rdir))
+        registry_data = timetable.stops_schedule_registry.get(stop_id, {})
         return registry_data.get((rtype, day, rdir), [])
 
+    def get_next_arrivals(
+        self,
+        stop_name: str,
+        rtype: str,
+        day: str,
+        rdir: str,
+        after: str,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Arrivals at a stop at or after a time, found by bisection.
+
+        Args:
+            stop_name: Chinese stop name (e.g. "北校門口")
+            rtype: Route type ('main', 'nanda' or 'all')
+            day: Day type ('weekday' or 'weekend')
+            rdir: Direction ('up', 'down' or 'all')
+            after: Reference time in "HH:MM" format, or empty for the whole day
+            limit: Maximum number of arrivals (None for all)
+
+        Returns:
+            The matching stop registry entries in arrival order
+        """
+        stop_id = STOP_IDS.get(stop_name)
+        if not stop_id:
+            return []
+
+        timetable = self._timetable
+        key = (rtype, day, rdir)
+        timetable.materialize_stop(stop_id, key)
+        return _slice_after(
+            timetable.stop_keys.get(stop_id, {}).get(key, []),
+            timetable.stops_schedule_registry.get(stop_id, {}).get(key, []),
+            after,
+            limit,
+        )
+
+    def plan_journey(
+        self, from_stop: str, to_stop: str, day: str, depart_after: str
+    ) -> Optional[dict]:
+        """
+        Earliest-arrival itinerary between two stops, with transfers.
+
+        Args:
+            from_stop: Chinese name of the stop to start from (e.g. "南大校區校門口右側(食品路校牆邊)")
+            to_stop: Chinese name of the stop to reach (e.g. "楓林小徑")
+            day: Day type ('weekday' or 'weekend')
+            depart_after: Earliest departure in "HH:MM" format
+
+        Returns:
+            The itinerary with its legs, or None if no bus reaches the stop that day
+
+        Raises:
+            ValueError: If a stop name or the time is invalid.
+        """
+        origin, destination = STOP_IDS.get(from_stop), STOP_IDS.get(to_stop)
+        if origin is None or destination is None:
+            raise ValueError(f"Unknown bus stop: {from_stop if origin is None else to_stop}")
+        # Like the departures, times before SERVICE_DAY_START fall after midnight
+        start = departure_minutes(depart_after)
+        if start == INVALID_TIME:
+            raise ValueError(f"Invalid time: {depart_after}")
+
+        journey_planner = self._timetable.planners.get(day)
+        if journey_planner is None:
+            return None
+        legs = journey_planner.plan(origin, destination, start)
+        if legs is None and start >= MINUTES_PER_DAY:
+            # The night's runs are over, so look ahead to the morning ones
+            start -= MINUTES_PER_DAY
+            legs = journey_planner.plan(origin, destination, start)
+        if legs is None:
+            return None
+
+        departure = legs[0].board_time if legs else start
+        arrival = legs[-1].alight_time if legs else start
+        return {
+            "from_stop": from_stop,
+            "to_stop": to_stop,
+            "day": day,
+            "depart_after": minutes_to_time(start),
+            "departure_time": minutes_to_time(departure),
+            "arrival_time": minutes_to_time(arrival),
+            "duration": arrival - departure,
+            "transfers": max(len(legs) - 1, 0),
+            "legs": [self._format_leg(leg) for leg in legs],
+        }
+
+    def _format_leg(self, leg: planner.Leg) -> dict:
+        trip = leg.trip
+        return {
+            "route_type": trip.route_type,
+            "direction": trip.direction,
+            "line": trip.bus.get("line", ""),
+            "bus_type": trip.bus.get("bus_type", ""),
+            "description": trip.bus.get("description", ""),
+            "dep_time": trip.bus.get("time", ""),
+            "board_stop": trip.route.stops[leg.board].name,
+            "board_time": minutes_to_time(leg.board_time),
+            "alight_stop": trip.route.stops[leg.alight].name,
+            "alight_time": minutes_to_time(leg.alight_time),
+            "stops": [
+                {"stop": stop.name, "arrive_time": minutes_to_time(trip.departure + offset)}
+                for stop, offset in zip(
+                    trip.route.stops[leg.board : leg.alight + 1],
+                    trip.route.time_offsets[leg.board : leg.alight + 1],
+                )
+            ],
+        }
+
 
 # Global Instance
 buses_service = BusesService()
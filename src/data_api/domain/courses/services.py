@@ -7,6 +7,7 @@ Handles course data fetching, processing, and querying.
 import operator
 from typing import Optional
 
+from data_api.core import metrics
 from data_api.data.manager import nthudata
 from data_api.domain.courses.models import Conditions, CourseData
 
@@ -28,7 +29,8 @@ class CoursesService:
         self.last_commit_hash, raw_data = result
 
         # Convert dicts to CourseData objects
-        self.course_data = list(map(CourseData.from_dict, raw_data))
+        with metrics.PROCESSING_DURATION.time("courses"):
+            self.course_data = list(map(CourseData.from_dict, raw_data))
 
     def list_selected_fields(self, field: str) -> list[str]:
         """Return all non-empty values for a specific field."""
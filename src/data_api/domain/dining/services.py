@@ -9,7 +9,7 @@ from typing import Optional
 
 from thefuzz import fuzz
 
-from data_api.data.manager import nthudata
+from data_api.data.manager import nthudata, views
 from data_api.domain.dining import enums
 
 JSON_PATH = "dining.json"
@@ -35,6 +35,22 @@ def is_restaurant_open(restaurant: dict, day: str) -> bool:
     return True
 
 
+def open_restaurants_by_day(dining_data: list[dict]) -> dict[str, list[dict]]:
+    """Restaurants that may be open, for each schedule day (weekday, saturday, sunday)."""
+    return {
+        day: [
+            restaurant
+            for building in dining_data
+            for restaurant in building["restaurants"]
+            if is_restaurant_open(restaurant, day)
+        ]
+        for day in enums.DiningScheduleKeyword.DAY_EN_TO_ZH
+    }
+
+
+OPEN_RESTAURANTS_BY_DAY = views.register("dining.open_by_day", JSON_PATH, open_restaurants_by_day)
+
+
 class DiningService:
     """Service for dining data operations."""
 
@@ -74,28 +90,34 @@ class DiningService:
 
     async def get_open_restaurants(self, schedule: str) -> tuple[Optional[str], list[dict]]:
         """Get currently open restaurants based on schedule."""
-        result = await nthudata.get(JSON_PATH)
+        if schedule == "today":
+            current_day = datetime.now().strftime("%A").lower()
+            if current_day in ["saturday", "sunday"]:
+                day = current_day
+            else:
+                day = "weekday"
+        else:
+            day = schedule
+
+        result = await views.get(OPEN_RESTAURANTS_BY_DAY)
         if result is None:
             return None, []
 
-        commit_hash, dining_data = result
+        commit_hash, open_by_day = result
+        if day in open_by_day:
+            return commit_hash, open_by_day[day]
 
-        open_restaurants = []
-        for building in dining_data:
-            for restaurant in building["restaurants"]:
-                if schedule == "today":
-                    current_day = datetime.now().strftime("%A").lower()
-                    if current_day in ["saturday", "sunday"]:
-                        day = current_day
-                    else:
-                        day = "weekday"
-                else:
-                    day = schedule
-
-                if is_restaurant_open(restaurant, day):
-                    open_restaurants.append(restaurant)
-
-        return commit_hash, open_restaurants
+        # Uncommon schedule values are not precomputed
+        result = await nthudata.get(JSON_PATH)
+        if result is None:
+            return None, []
+        commit_hash, dining_data = result
+        return commit_hash, [
+            restaurant
+            for building in dining_data
+            for restaurant in building["restaurants"]
+            if is_restaurant_open(restaurant, day)
+        ]
 
     async def fuzzy_search_dining_data(
         self, building_name: Optional[str] = None, restaurant_name: Optional[str] = None
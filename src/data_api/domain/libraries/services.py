@@ -8,12 +8,16 @@ from typing import Optional
 
 from thefuzz import fuzz
 
-from data_api.data.manager import nthudata
+from data_api.data.manager import nthudata, views
+from data_api.data.views import index_by
 
 JSON_PATH = "libraries.json"
 FUZZY_SEARCH_THRESHOLD = 70
 
 
+LIBRARIES_BY_NAME = views.register("libraries.by_name", JSON_PATH, index_by("name"))
+
+
 class LibrariesService:
     """Service for library data operations."""
 
@@ -26,15 +30,12 @@ class LibrariesService:
 
     async def get_library_by_name(self, name: str) -> tuple[Optional[str], Optional[dict]]:
         """Get library by name."""
-        result = await nthudata.get(JSON_PATH)
+        result = await views.get(LIBRARIES_BY_NAME)
         if result is None:
             return None, None
 
-        commit_hash, libraries_data = result
-        for library in libraries_data:
-            if library["name"] == name:
-                return commit_hash, library
-        return commit_hash, None
+        commit_hash, libraries_by_name = result
+        return commit_hash, libraries_by_name.get(name)
 
     async def fuzzy_search_libraries(self, query: str) -> tuple[Optional[str], list[dict]]:
         """Fuzzy search libraries by name."""
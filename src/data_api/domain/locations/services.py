@@ -8,51 +8,50 @@ from typing import Optional
 
 from thefuzz import fuzz
 
-from data_api.data.manager import nthudata
+from data_api.data.manager import views
 
 JSON_PATH = "maps.json"
 FUZZY_SEARCH_THRESHOLD = 60
 
 
+def flatten_locations(map_data: dict) -> list[dict]:
+    """Flatten campus -> name -> coordinates into a list of locations."""
+    return [
+        {
+            "name": location_name,
+            "latitude": coordinates["latitude"],
+            "longitude": coordinates["longitude"],
+        }
+        for campus_locations in map_data.values()
+        for location_name, coordinates in campus_locations.items()
+    ]
+
+
+FLAT_LOCATIONS = views.register("locations.flat", JSON_PATH, flatten_locations)
+
+
 class LocationsService:
     """Service for location data operations."""
 
     async def get_all_locations(self) -> tuple[Optional[str], list[dict]]:
         """Get all locations."""
-        result = await nthudata.get(JSON_PATH)
+        result = await views.get(FLAT_LOCATIONS)
         if result is None:
             return None, []
-
-        commit_hash, map_data = result
-        locations = [
-            {
-                "name": location_name,
-                "latitude": coordinates["latitude"],
-                "longitude": coordinates["longitude"],
-            }
-            for campus_locations in map_data.values()
-            for location_name, coordinates in campus_locations.items()
-        ]
-        return commit_hash, locations
+        return result
 
     async def fuzzy_search_locations(self, query: str) -> tuple[Optional[str], list[dict]]:
         """Fuzzy search locations by name."""
-        result = await nthudata.get(JSON_PATH)
+        result = await views.get(FLAT_LOCATIONS)
         if result is None:
             return None, []
 
-        commit_hash, map_data = result
+        commit_hash, locations = result
         tmp_results = []
-        for campus_locations in map_data.values():
-            for location_name, coordinates in campus_locations.items():
-                similarity = fuzz.partial_ratio(query, location_name)
-                if similarity >= FUZZY_SEARCH_THRESHOLD:
-                    location = {
-                        "name": location_name,
-                        "latitude": coordinates["latitude"],
-                        "longitude": coordinates["longitude"],
-                    }
-                    tmp_results.append((similarity, location))
+        for location in locations:
+            similarity = fuzz.partial_ratio(query, location["name"])
+            if similarity >= FUZZY_SEARCH_THRESHOLD:
+                tmp_results.append((similarity, location))
 
         # Sort by exact match first, then by similarity
         tmp_results.sort(key=lambda x: (x[1]["name"] == query, x[0]), reverse=True)
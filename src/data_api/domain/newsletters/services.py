@@ -6,11 +6,15 @@ Handles newsletter data fetching.
 
 from typing import Optional
 
-from data_api.data.manager import nthudata
+from data_api.data.manager import nthudata, views
+from data_api.data.views import index_by
 
 JSON_PATH = "newsletters.json"
 
 
+NEWSLETTERS_BY_NAME = views.register("newsletters.by_name", JSON_PATH, index_by("name"))
+
+
 class NewslettersService:
     """Service for newsletter data operations."""
 
@@ -23,15 +27,12 @@ class NewslettersService:
 
     async def get_newsletter_by_name(self, name: str) -> tuple[Optional[str], Optional[dict]]:
         """Get newsletter by name."""
-        result = await nthudata.get(JSON_PATH)
+        result = await views.get(NEWSLETTERS_BY_NAME)
         if result is None:
             return None, None
 
-        commit_hash, newsletter_data = result
-        for newsletter in newsletter_data:
-            if newsletter["name"] == name:
-                return commit_hash, newsletter
-        return commit_hash, None
+        commit_hash, newsletters_by_name = result
+        return commit_hash, newsletters_by_name.get(name)
 
 
 # Global service instance
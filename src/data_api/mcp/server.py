@@ -10,7 +10,29 @@ Curated MCP tools designed for LLM agents, following agent-first design principl
 These tools are designed to answer common questions about NTHU campus life.
 """
 
+import time
+
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
+
+from data_api.core import metrics
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records the latency and outcome of every MCP tool call."""
+
+    async def on_call_tool(self, context, call_next):
+        start_time = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "ok"
+            return result
+        finally:
+            metrics.MCP_TOOL_DURATION.observe(
+                time.perf_counter() - start_time, context.message.name, status
+            )
+
 
 # Create curated MCP server
 mcp = FastMCP(
@@ -28,6 +50,7 @@ You can help with:
 
 Always respond in the user's language (Traditional Chinese or English).
 """,
+    middleware=[ToolMetricsMiddleware()],
 )
 
 # Import tools after mcp is created to avoid circular imports
@@ -1,7 +1,7 @@
 """Bus-related MCP tools."""
 
 from datetime import datetime
-from typing import Literal
+from typing import Literal, Optional
 
 from data_api.domain.buses import services as buses_services
 from data_api.domain.buses.enums import BusStopsName
@@ -24,30 +24,25 @@ async def _get_next_buses(
     Returns:
         Dictionary with upcoming bus schedules and route information.
     """
-    await buses_services.buses_service.update_data()
+    await buses_services.buses_service.update_on_request()
 
     current = datetime.now()
     current_time = current.time().strftime("%H:%M")
     current_day = "weekday" if current.weekday() < 5 else "weekend"
 
-    # Get detailed schedules
-    raw_data = buses_services.buses_service.get_schedule(
+    # Get detailed schedules of the buses after current time
+    upcoming = buses_services.buses_service.get_next_departures(
         route_type=route,
         day=current_day,
         direction=direction,
+        after=current_time,
+        limit=limit,
         detailed=True,
     )
 
-    # Filter to buses after current time
-    filtered = buses_services.after_specific_time(
-        raw_data,
-        current_time,
-        ["dep_info", "time"],
-    )
-
     # Format response
     buses = []
-    for bus in filtered[:limit]:
+    for bus in upcoming:
         dep_info = bus.get("dep_info", {})
         buses.append(
             {
@@ -88,7 +83,7 @@ async def _get_bus_stops(
     Returns:
         Dictionary with query bus stop details and upcoming bus schedules.
     """
-    await buses_services.buses_service.update_data()
+    await buses_services.buses_service.update_on_request()
     stops = buses_services.buses_service.gen_bus_stops_info()
 
     current = datetime.now()
@@ -116,16 +111,9 @@ async def _get_bus_stops(
 
     result["stop_info"] = [s for s in all_stops["stops"] if s["name"] == stop_name_str]
 
-    # Get schedule for the specific stop
-    raw_data = buses_services.buses_service.get_stop_schedule(
-        stop_name_str, route, current_day, direction
-    )
-
-    # Filter to buses after current time
-    filtered = buses_services.after_specific_time(
-        raw_data,
-        current_time,
-        ["arrive_time"],
+    # Get schedule for the specific stop after current time
+    upcoming = buses_services.buses_service.get_next_arrivals(
+        stop_name_str, route, current_day, direction, current_time, limit
     )
 
     result["stop_name"] = stop_name_str
@@ -139,12 +127,50 @@ async def _get_bus_stops(
             "description": bus.get("description"),
             "bus_type": bus.get("bus_type"),
         }
-        for bus in filtered[:limit]
+        for bus in upcoming
     ]
 
     return result
 
 
+async def _plan_bus_journey(
+    from_stop: BusStopsName | str,
+    to_stop: BusStopsName | str,
+    depart_after: Optional[str] = None,
+) -> dict:
+    """
+    Plan the earliest-arriving bus journey between two stops, with transfers.
+
+    Args:
+        from_stop: Stop to start from.
+        to_stop: Stop to reach.
+        depart_after: Earliest departure time in "HH:MM" format (default: now).
+
+    Returns:
+        Dictionary with the itinerary, or an error message if no bus reaches the stop today.
+    """
+    await buses_services.buses_service.update_on_request()
+
+    current = datetime.now()
+    current_time = current.time().strftime("%H:%M")
+    current_day = "weekday" if current.weekday() < 5 else "weekend"
+
+    from_name = BusStopsName(from_stop).value
+    to_name = BusStopsName(to_stop).value
+    try:
+        plan = buses_services.buses_service.plan_journey(
+            from_name, to_name, current_day, depart_after or current_time
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    if plan is None:
+        return {
+            "error": f"No bus from {from_name} to {to_name} after "
+            f"{depart_after or current_time} today ({current_day} schedule)"
+        }
+    return plan
+
+
 @mcp.tool(
     description="Get the next available campus buses. "
     "Use this when someone asks about bus schedules, when the next bus is, or how to get around campus."
@@ -175,3 +201,19 @@ async def get_bus_stops(
 ) -> dict:
     """Get bus stop locations and upcoming buses for a specific stop."""
     return await _get_bus_stops(stop_name, route, direction, limit)
+
+
+@mcp.tool(
+    description="Plan a campus bus journey between two stops, arriving as early as possible. "
+    "Use this when someone asks how to get from one place on campus to another by bus, "
+    "including trips between the Main Campus and Nanda Campus that need a transfer. "
+    "Returns each bus to take with boarding and alighting stops and times. "
+    "Available stops: 北校門口, 綜二館, 楓林小徑, 人社院&生科館, 台積館, 奕園停車場, 教育學院大樓&南門停車場, 南大校區校門口右側(食品路校牆邊)"
+)
+async def plan_bus_journey(
+    from_stop: BusStopsName,
+    to_stop: BusStopsName,
+    depart_after: Optional[str] = None,
+) -> dict:
+    """Plan the earliest-arriving bus journey between two stops."""
+    return await _plan_bus_journey(from_stop, to_stop, depart_after)
@@ -0,0 +1,25 @@
+"""
+Offline stand-in for the upstream sites, for tests and benchmarks.
+
+Serves recorded fixtures for data.nthusa.tw, the library sites and the
+power-management site, with configurable latency, failures and commit-hash
+rotation.
+
+In-process (routes every httpx request, including the library and energy
+clients, to the fixtures):
+
+    upstream = MockUpstream(latency=0.05)
+    with upstream.install():
+        ...
+
+As a server for data.nthusa.tw (run from tests/):
+
+    python -m mock_upstream --port 8001
+    NTHU_DATA_URL=http://127.0.0.1:8001 uvicorn data_api.api.api:app
+
+Re-record the fixtures from the live sites with ``python -m mock_upstream.record``.
+"""
+
+from .server import DATA_HOST, FIXTURES_DIR, MockUpstream
+
+__all__ = ["DATA_HOST", "FIXTURES_DIR", "MockUpstream"]
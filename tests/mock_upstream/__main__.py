@@ -0,0 +1,39 @@
+"""Serve the recorded data.nthusa.tw fixtures over HTTP."""
+
+import argparse
+
+import uvicorn
+
+from .server import MockUpstream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to every response"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of a 503")
+    parser.add_argument(
+        "--rotation-interval",
+        type=float,
+        default=None,
+        help="seconds between commit-hash changes of a random file",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        rotation_interval=args.rotation_interval,
+        seed=args.seed,
+    )
+    uvicorn.run(upstream, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
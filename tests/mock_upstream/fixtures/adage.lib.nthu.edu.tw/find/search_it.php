@@ -0,0 +1,12 @@
+<html>
+ <head><meta charset="utf-8"><title>失物招領查詢</title></head>
+ <body>
+  <table>
+  <tr><td>序號</td><td>拾獲時間</td><td>拾獲地點</td><td>描述</td></tr>
+  <tr><td>1</td><td>2024-09-01</td><td>總圖1F</td><td>黑色雨傘</td></tr>
+  <tr><td>2</td><td>2024-09-02</td><td>總圖3F 自習區</td><td>學生證</td></tr>
+  <tr><td>3</td><td>2024-09-03</td><td>人社分館</td><td>藍色水壺</td></tr>
+  <tr><td>4</td><td>2024-09-04</td><td>總圖B1</td><td>耳機</td></tr>
+  </table>
+ </body>
+</html>
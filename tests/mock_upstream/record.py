@@ -0,0 +1,98 @@
+"""
+Re-record the fixtures from the live upstream sites.
+
+Usage (from tests/):
+    python -m mock_upstream.record [--max-rows 200]
+
+Every data.nthusa.tw file listed in file_details.json is downloaded, with JSON
+arrays truncated to ``--max-rows`` entries to keep the fixtures small.
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from .server import DATA_HOST, FIXTURES_DIR
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"}
+
+# Library and energy pages fetched by the services themselves: (method, url)
+PAGES = [
+    ("GET", "https://libsms.lib.nthu.edu.tw/RWDAPI_New/GetDevUseStatus.aspx"),
+    ("POST", "https://adage.lib.nthu.edu.tw/find/search_it.php"),
+    *(
+        ("GET", f"https://www.lib.nthu.edu.tw/bulletin/RSS/export/rss_{rss_type}.xml")
+        for rss_type in ("news", "eresources", "exhibit", "branches")
+    ),
+    *(("GET", f"http://140.114.188.86/powermanage/fn1/kw{i}.aspx") for i in (1, 2, 3)),
+]
+
+
+def save(url: httpx.URL, body: bytes, fixtures_dir: Path) -> None:
+    path = fixtures_dir / url.host / url.path.lstrip("/")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    print(f"{url} -> {path.relative_to(fixtures_dir)} ({len(body)} bytes)")
+
+
+def truncate(body: bytes, max_rows: int) -> bytes:
+    """Keep at most ``max_rows`` entries of a JSON array body."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(data, list) and len(data) > max_rows:
+        return json.dumps(data[:max_rows], ensure_ascii=False, indent=2).encode()
+    return body
+
+
+async def record(fixtures_dir: Path, max_rows: int) -> None:
+    ctx = ssl.create_default_context()
+    # The library sites use a TWCA certificate without the intermediate
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    async with httpx.AsyncClient(verify=ctx, headers=HEADERS, timeout=30.0) as client:
+        response = await client.get(f"https://{DATA_HOST}/file_details.json")
+        response.raise_for_status()
+        for section, files in response.json()["file_details"].items():
+            prefix = "" if section == "/" else section
+            for file_info in files:
+                url = httpx.URL(f"https://{DATA_HOST}{prefix}/{file_info['name']}")
+                file_response = await client.get(url)
+                if file_response.is_success:
+                    save(url, truncate(file_response.content, max_rows), fixtures_dir)
+
+        date_end = datetime.now()
+        form = {
+            "place": "0",
+            "date_start": (date_end - timedelta(days=180)).strftime("%Y-%m-%d"),
+            "date_end": date_end.strftime("%Y-%m-%d"),
+            "catalog": "ALL",
+            "keyword": "",
+            "SUMIT": "送出",
+        }
+        for method, url in PAGES:
+            try:
+                page = await client.request(method, url, data=form if method == "POST" else None)
+                page.raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"Skipping {url}: {e}")
+                continue
+            save(page.url, page.content, fixtures_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixtures-dir", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--max-rows", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(record(args.fixtures_dir, args.max_rows))
+
+
+if __name__ == "__main__":
+    main()
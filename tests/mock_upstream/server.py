@@ -0,0 +1,182 @@
+"""
+ASGI stand-in for the upstream sites, serving recorded fixtures.
+
+Fixtures live in ``fixtures/<host>/<path>``. For data.nthusa.tw,
+``file_details.json`` is generated from the fixtures present, with commit
+hashes that can be rotated to simulate upstream updates. Responses carry an
+ETag (the commit hash) and honor If-None-Match.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import httpx
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+DATA_HOST = "data.nthusa.tw"
+
+
+def content_type(body: bytes) -> str:
+    """Guess the content type of a fixture from its first bytes."""
+    head = body.lstrip()[:5]
+    if head[:1] in (b"{", b"["):
+        return "application/json"
+    if head == b"<?xml":
+        return "application/xml"
+    return "text/html; charset=utf-8"
+
+
+class MockUpstream:
+    """Serves recorded upstream responses with configurable latency, failures and updates."""
+
+    def __init__(
+        self,
+        fixtures_dir: Path = FIXTURES_DIR,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        rotation_interval: Optional[float] = None,
+        seed: int = 0,
+        max_requests: int = 1000,
+    ):
+        """
+        Initialize the mock upstream.
+
+        Args:
+            fixtures_dir: Directory with one sub-directory of recorded files per host.
+            latency: Seconds added to every response.
+            jitter: Additional random latency of up to this many seconds.
+            failure_rate: Probability of answering 503 instead of the fixture.
+            rotation_interval: Seconds after which the commit hash of a random
+                data.nthusa.tw file changes (None for never).
+            seed: Seed for jitter, failures and rotation, for reproducible runs.
+            max_requests: Number of most recent requests kept in ``requests``, so a
+                long-running server does not grow without bound.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rotation_interval = rotation_interval
+        self.random = random.Random(seed)
+        # (host, path) -> body
+        self.files: dict[tuple[str, str], bytes] = {
+            (
+                path.relative_to(fixtures_dir).parts[0],
+                "/" + "/".join(path.relative_to(fixtures_dir).parts[1:]),
+            ): path.read_bytes()
+            for path in sorted(fixtures_dir.rglob("*"))
+            if path.is_file()
+        }
+        # data.nthusa.tw path -> number of updates
+        self.versions: dict[str, int] = {path: 0 for host, path in self.files if host == DATA_HOST}
+        # Most recent (host, path) requests, oldest first
+        self.requests: deque[tuple[str, str]] = deque(maxlen=max_requests)
+        self._last_rotation = time.monotonic()
+
+    def commit(self, path: str) -> str:
+        """Current commit hash of a data.nthusa.tw file (e.g. "/buses.json")."""
+        return hashlib.sha1(f"{path}@{self.versions[path]}".encode()).hexdigest()[:12]
+
+    def rotate(self, *paths: str) -> None:
+        """Change the commit hash of the given data.nthusa.tw files (all if none given)."""
+        for path in paths or list(self.versions):
+            self.versions["/" + path.lstrip("/")] += 1
+
+    def set(self, path: str, body: bytes, host: str = DATA_HOST) -> None:
+        """Replace a fixture, rotating its commit hash on data.nthusa.tw."""
+        path = "/" + path.lstrip("/")
+        self.files[(host, path)] = body
+        if host == DATA_HOST:
+            self.versions.setdefault(path, -1)
+            self.rotate(path)
+
+    def file_details(self) -> dict:
+        """file_details.json for the current data.nthusa.tw fixtures."""
+        sections: dict[str, list[dict]] = {}
+        for path in sorted(self.versions):
+            section, _, name = path.rpartition("/")
+            sections.setdefault(section or "/", []).append(
+                {
+                    "name": name,
+                    "last_commit": self.commit(path),
+                    "last_updated": "2024-09-01T00:00:00+08:00",
+                }
+            )
+        return {"file_details": sections}
+
+    def transport(self) -> httpx.ASGITransport:
+        """An httpx transport answering from this mock (e.g. for ``NTHUDataManager``)."""
+        return httpx.ASGITransport(app=self)
+
+    @contextmanager
+    def install(self) -> Iterator["MockUpstream"]:
+        """
+        Route every request made through httpx's default transport to this mock.
+
+        This covers the clients the services create themselves (library and
+        energy), not only ``nthudata``. Note that data cached by the global
+        ``nthudata`` outlives the context.
+        """
+        transport = self.transport()
+
+        async def handle_async_request(_, request: httpx.Request) -> httpx.Response:
+            return await transport.handle_async_request(request)
+
+        original = httpx.AsyncHTTPTransport.handle_async_request
+        httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+        try:
+            yield self
+        finally:
+            httpx.AsyncHTTPTransport.handle_async_request = original
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        request = Request(scope, receive)
+        host = request.url.hostname or DATA_HOST
+        if host in ("127.0.0.1", "localhost", "testserver"):
+            # Standalone server behind NTHU_DATA_URL
+            host = DATA_HOST
+        self.requests.append((host, request.url.path))
+        response = await self._respond(host, request)
+        await response(scope, receive, send)
+
+    async def _respond(self, host: str, request: Request) -> Response:
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            return Response("Service Unavailable", status_code=503)
+
+        path = request.url.path
+        if host == DATA_HOST:
+            self._maybe_rotate()
+            if path == "/file_details.json":
+                return JSONResponse(self.file_details())
+
+        body = self.files.get((host, path))
+        if body is None:
+            return Response("Not Found", status_code=404)
+        headers = {}
+        if host == DATA_HOST:
+            etag = f'"{self.commit(path)}"'
+            if request.headers.get("If-None-Match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+        return Response(body, media_type=content_type(body), headers=headers)
+
+    def _maybe_rotate(self) -> None:
+        if self.rotation_interval is None or not self.versions:
+            return
+        now = time.monotonic()
+        if now - self._last_rotation >= self.rotation_interval:
+            self._last_rotation = now
+            self.rotate(self.random.choice(sorted(self.versions)))
@@ -3,6 +3,7 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from data_api.api import api
 from data_api.api.api import app
 
 
@@ -178,3 +179,33 @@ class TestDepartmentsEndpoints:
             params = {"query": query}
             response = await client.get("/departments/search/", params=params)
             assert response.status_code == 200
+
+
+class TestCombinedApp:
+    """Tests for the lifespan and middleware of the exported app."""
+
+    async def test_lifespan_runs_warmup(self, monkeypatch):
+        """Test that the exported app's lifespan runs the warmup stages."""
+        calls = []
+
+        def stage(name):
+            async def run():
+                calls.append(name)
+                return True
+
+            return run
+
+        monkeypatch.setattr(api, "prefetch_endpoints", stage("prefetch"))
+        monkeypatch.setattr(api, "initialize_processors", stage("processors"))
+        monkeypatch.setattr(api.views, "warm", stage("views"))
+        monkeypatch.setattr(api.settings, "refresh_interval", 0)
+
+        async with app.router.lifespan_context(app):
+            assert calls == ["prefetch", "processors", "views"]
+            assert api.warmup.ready
+
+    async def test_middleware_applies(self):
+        """Test that the process time middleware runs on the exported app."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/favicon.ico")
+        assert "X-Process-Time" in response.headers
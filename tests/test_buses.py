@@ -1,10 +1,30 @@
 """Tests for buses endpoints."""
 
+import asyncio
+import json
+import threading
+import time
+from itertools import product
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from mock_upstream import FIXTURES_DIR
 
 from data_api.api import schemas
 from data_api.api.api import app
+from data_api.core import metrics
+from data_api.domain.buses import planner, services
+
+ALL_SCHEDULE_KEYS = list(product(services.BUS_ROUTE_TYPE, services.BUS_DAY, services.BUS_DIRECTION))
+
+
+@pytest.fixture
+def service():
+    """Create a service processed from the recorded timetable."""
+    service = services.BusesService()
+    service._res_json = json.loads((FIXTURES_DIR / "data.nthusa.tw" / "buses.json").read_text())
+    service._process_all_data()
+    return service
 
 
 class TestBusesRoutes:
@@ -118,3 +138,704 @@ class TestBusesStops:
             f"/buses/stops/{stop_name}/?bus_type={bus_type}&day={day}&direction={direction}&details={details}"
         )
         assert response.status_code == 200
+
+
+class TestBusesTimes:
+    """Tests for the minute-based time helpers."""
+
+    async def test_time_to_minutes(self):
+        """Test parsing valid and invalid times."""
+        assert services.time_to_minutes("07:30") == 450
+        assert services.time_to_minutes("7:05") == 425
+        assert services.time_to_minutes("24:00") is None
+        assert services.time_to_minutes("noon") is None
+        assert services.time_to_minutes(None) is None
+
+    async def test_minutes_to_time_wraps_past_midnight(self):
+        """Test formatting minutes beyond one day."""
+        assert services.minutes_to_time(450) == "07:30"
+        assert services.minutes_to_time(24 * 60 + 5) == "00:05"
+
+    async def test_departure_minutes_past_midnight(self):
+        """Test early morning departures sort after late evening ones."""
+        assert services.departure_minutes("00:20") > services.departure_minutes("23:50")
+        assert services.departure_minutes("bad") == services.INVALID_TIME
+
+    async def test_add_time(self):
+        """Test adding minutes across midnight and invalid input."""
+        assert services.add_time("23:55", 10) == "00:05"
+        assert services.add_time("08:00", -15) == "07:45"
+        assert services.add_time("bad", 5) == "bad"
+
+    async def test_after_specific_time(self):
+        """Test filtering items at or after a time."""
+        items = [{"time": "07:30"}, {"time": "08:00"}, {"time": "bad"}, {"time": "09:15"}]
+        assert services.after_specific_time(items, "08:00", ["time"]) == items[1:2] + items[3:]
+        assert services.after_specific_time(items, "", ["time"]) == items
+        assert services.after_specific_time(items, "bad", ["time"]) == []
+
+    async def test_after_specific_time_past_midnight(self):
+        """Test a query after midnight only keeps the runs still to come that night."""
+        items = [{"time": "07:30"}, {"time": "23:50"}, {"time": "00:20"}]
+        assert services.after_specific_time(items, "00:10", ["time"]) == items[2:]
+        assert services.after_specific_time(items, "23:00", ["time"]) == items[1:]
+        # Once the night's runs are over, the morning ones are next
+        assert services.after_specific_time(items, "01:00", ["time"]) == items
+
+    async def test_sort_by_time(self):
+        """Test sorting with post-midnight times after the day and invalid ones last."""
+        items = [{"time": "09:00"}, {"time": "bad"}, {"time": "00:10"}, {"time": "7:30"}]
+        services.sort_by_time(items, ["time"])
+        assert [item["time"] for item in items] == ["7:30", "09:00", "00:10", "bad"]
+
+
+class TestBusesProcessing:
+    """Tests for processing a bus timetable into the registries."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a service processed from a small timetable with late-night runs."""
+        service = services.BusesService()
+        service._res_json = {
+            "weekdayBusScheduleTowardTSMCBuilding": [
+                {"time": "00:10", "description": "", "dep_stop": "校門", "line": "red"},
+                {"time": "23:57", "description": "", "dep_stop": "校門", "line": "green"},
+            ],
+            "weekdayBusScheduleTowardNanda": [
+                {"time": "07:30", "description": ""},
+                {"time": "23:40", "description": ""},
+            ],
+        }
+        service._process_all_data()
+        return service
+
+    async def test_past_midnight_departures_sorted_last(self, service: services.BusesService):
+        """Test a departure after midnight sorts after the evening ones."""
+        schedule = service.get_schedule(route_type="all", day="weekday", direction="up")
+        assert [bus["time"] for bus in schedule] == ["07:30", "23:40", "23:57", "00:10"]
+        parts = [
+            service.get_schedule(route_type=rtype, day="weekday", direction="up")
+            for rtype in ("main", "nanda")
+        ]
+        expected = [bus for part in parts for bus in part]
+        services.sort_by_time(expected, ["time"])
+        assert schedule == expected
+
+    async def test_arrivals_crossing_midnight_keep_order(self, service: services.BusesService):
+        """Test stop arrivals wrap to "00:MM" but stay after earlier arrivals."""
+        detailed = service.get_schedule(
+            route_type="main", day="weekday", direction="up", detailed=True
+        )
+        last_stop = detailed[0]["stops_time"][-1]["arrive_time"]
+        assert detailed[0]["dep_info"]["time"] == "23:57"
+        assert last_stop.startswith("00:")
+
+        stop_name = detailed[0]["stops_time"][-1]["stop"]
+        arrivals = service.get_stop_schedule(stop_name, "main", "weekday", "up")
+        assert [bus["dep_time"] for bus in arrivals] == ["23:57", "00:10"]
+
+    async def test_next_departures_include_past_midnight_runs(self, service: services.BusesService):
+        """Test a late query still finds the run after midnight."""
+        upcoming = service.get_next_departures(
+            route_type="all", day="weekday", direction="up", after="23:45"
+        )
+        assert [bus["time"] for bus in upcoming] == ["23:57", "00:10"]
+
+    async def test_next_departures_after_midnight(self, service: services.BusesService):
+        """Test a query after midnight skips the evening runs that already left."""
+        kwargs = {"route_type": "all", "day": "weekday", "direction": "up"}
+        upcoming = service.get_next_departures(after="00:10", limit=2, **kwargs)
+        assert [bus["time"] for bus in upcoming] == ["00:10"]
+        detailed = service.get_schedule(
+            route_type="main", day="weekday", direction="up", detailed=True
+        )
+        stop_name = detailed[0]["stops_time"][0]["stop"]
+        arrivals = service.get_next_arrivals(stop_name, "all", "weekday", "up", "00:05")
+        assert [bus["dep_time"] for bus in arrivals] == ["00:10"]
+
+    @pytest.mark.parametrize("after", ["00:11", "01:00", "03:59"])
+    async def test_next_departures_after_last_run(self, service: services.BusesService, after: str):
+        """Test a query after the last post-midnight run returns the morning runs."""
+        upcoming = service.get_next_departures(
+            route_type="all", day="weekday", direction="up", after=after, limit=2
+        )
+        assert [bus["time"] for bus in upcoming] == ["07:30", "23:40"]
+
+    @pytest.mark.parametrize(
+        "after, expected",
+        [
+            ("23:45", ["23:57", "00:10"]),
+            ("23:58", ["00:10"]),
+            ("00:00", ["00:10"]),
+            ("00:10", ["00:10"]),
+            ("00:11", ["07:30", "23:40", "23:57", "00:10"]),
+            ("03:59", ["07:30", "23:40", "23:57", "00:10"]),
+        ],
+    )
+    async def test_bisection_matches_linear_filter_past_midnight(
+        self, service: services.BusesService, after: str, expected: list[str]
+    ):
+        """Test bisection agrees with filtering the whole list around midnight."""
+        for route_type, day, direction in ALL_SCHEDULE_KEYS:
+            kwargs = {"route_type": route_type, "day": day, "direction": direction}
+            schedule = service.get_schedule(**kwargs)
+            upcoming = service.get_next_departures(after=after, **kwargs)
+            assert upcoming == services.after_specific_time(schedule, after, ["time"])
+        upcoming = service.get_next_departures(
+            route_type="all", day="weekday", direction="up", after=after
+        )
+        assert [bus["time"] for bus in upcoming] == expected
+
+
+class TestBusesNextDepartures:
+    """Tests for the bisection based next departure and arrival queries."""
+
+    @pytest.mark.parametrize("after", ["00:00", "07:30", "12:01", "18:45", "21:50", "23:59"])
+    @pytest.mark.parametrize("detailed", [True, False])
+    async def test_matches_linear_filter(
+        self, service: services.BusesService, after: str, detailed: bool
+    ):
+        """Test bisection returns the same departures as filtering the whole list."""
+        time_path = ["dep_info", "time"] if detailed else ["time"]
+        for route_type, day, direction in ALL_SCHEDULE_KEYS:
+            schedule = service.get_schedule(
+                route_type=route_type, day=day, direction=direction, detailed=detailed
+            )
+            expected = services.after_specific_time(schedule, after, time_path)
+            assert (
+                service.get_next_departures(
+                    route_type=route_type,
+                    day=day,
+                    direction=direction,
+                    after=after,
+                    detailed=detailed,
+                )
+                == expected
+            )
+
+    async def test_limit_and_shared_entries(self, service: services.BusesService):
+        """Test the limit applies and entries are returned without copies."""
+        schedule = service.get_schedule(route_type="main", day="weekday", direction="up")
+        upcoming = service.get_next_departures(
+            route_type="main", day="weekday", direction="up", after="12:00", limit=3
+        )
+        start = next(i for i, bus in enumerate(schedule) if bus["time"] >= "12:00")
+        assert len(upcoming) == 3
+        assert all(a is b for a, b in zip(upcoming, schedule[start : start + 3]))
+
+    async def test_empty_and_invalid_time(self, service: services.BusesService):
+        """Test an empty time returns the whole day and an invalid one nothing."""
+        schedule = service.get_schedule(route_type="all", day="weekend", direction="all")
+        kwargs = {"route_type": "all", "day": "weekend", "direction": "all"}
+        assert service.get_next_departures(after="", **kwargs) == schedule
+        assert service.get_next_departures(after="", limit=2, **kwargs) == schedule[:2]
+        assert service.get_next_departures(after="25:00", **kwargs) == []
+
+    @pytest.mark.parametrize("after", ["06:00", "12:34", "21:40"])
+    async def test_next_arrivals_match_linear_filter(
+        self, service: services.BusesService, after: str
+    ):
+        """Test stop arrivals by bisection equal filtering the stop registry."""
+        for stop_name in services.STOP_IDS:
+            for rtype, day, rdir in ALL_SCHEDULE_KEYS:
+                arrivals = service.get_stop_schedule(stop_name, rtype, day, rdir)
+                expected = services.after_specific_time(arrivals, after, ["arrive_time"])[:5]
+                assert service.get_next_arrivals(stop_name, rtype, day, rdir, after, 5) == expected
+
+    @pytest.mark.parametrize("after", ["01:00", "03:30"])
+    async def test_early_morning_returns_first_runs(
+        self, service: services.BusesService, after: str
+    ):
+        """Test a query before the first bus returns the day from its first run."""
+        kwargs = {"route_type": "all", "day": "weekday", "direction": "all"}
+        schedule = service.get_schedule(**kwargs)
+        upcoming = service.get_next_departures(after=after, **kwargs)
+        assert upcoming and upcoming == schedule
+        assert upcoming[0]["time"] == min(bus["time"] for bus in schedule)
+
+    async def test_next_arrivals_unknown_stop(self, service: services.BusesService):
+        """Test an unknown stop has no arrivals."""
+        assert service.get_next_arrivals("不存在", "all", "weekday", "all", "08:00") == []
+
+
+class TestBusesCombinedViews:
+    """Tests for the lazily merged "all" views."""
+
+    async def test_merge_sorted_keeps_run_order_for_ties(self):
+        """Test merging two runs is stable and carries the entries along."""
+        first, second = [1, 3, 3, 9], [0, 3, 10, 11]
+        keys, (entries,) = services._merge_sorted(
+            first, second, ([f"a{k}" for k in first], [f"b{k}" for k in second])
+        )
+        assert keys == [0, 1, 3, 3, 3, 9, 10, 11]
+        assert entries == ["b0", "a1", "a3", "a3", "b3", "a9", "b10", "b11"]
+        assert services._merge_sorted([], [2], ([], ["x"])) == ([2], [["x"]])
+
+    async def test_combined_views_built_on_request(self, service: services.BusesService):
+        """Test reprocessing leaves combined views for the first request."""
+        key = ("all", "weekday", "all")
+        assert key not in service.raw_schedule_data
+
+        schedule = service.get_schedule(route_type="all", day="weekday", direction="all")
+        # Route types are combined first, then directions
+        parts = [
+            service.get_schedule(route_type=rtype, day="weekday", direction=rdir)
+            for rdir, rtype in product(["up", "down"], ["main", "nanda"])
+        ]
+        expected = [bus for part in parts for bus in part]
+        services.sort_by_time(expected, ["time"])
+        assert schedule == expected
+        assert service.raw_schedule_data[key] is schedule
+
+    async def test_combined_stop_views_built_on_request(self, service: services.BusesService):
+        """Test a stop's combined view merges its per-route arrivals."""
+        arrivals = service.get_stop_schedule("北校門口", "all", "weekend", "all")
+        parts = [
+            service.get_stop_schedule("北校門口", rtype, "weekend", rdir)
+            for rtype, rdir in product(["main", "nanda"], ["up", "down"])
+        ]
+        assert sorted(map(id, arrivals)) == sorted(id(bus) for part in parts for bus in part)
+        assert [bus["arrive_time"] for bus in arrivals] == sorted(
+            bus["arrive_time"] for bus in arrivals
+        )
+
+    async def test_reprocessing_drops_combined_views(self, service: services.BusesService):
+        """Test combined views are rebuilt from the new data after reprocessing."""
+        service.get_schedule(route_type="all", day="weekday", direction="up")
+        service._res_json = {
+            "weekdayBusScheduleTowardNanda": [{"time": "10:00", "description": ""}]
+        }
+        service._process_all_data()
+        schedule = service.get_schedule(route_type="all", day="weekday", direction="up")
+        assert [bus["time"] for bus in schedule] == ["10:00"]
+
+
+def tagged_timetable(tag: str) -> dict:
+    """A small buses.json whose descriptions all carry ``tag``."""
+    return {
+        "weekdayBusScheduleTowardTSMCBuilding": [
+            {"time": f"{hour:02d}:10", "description": tag, "dep_stop": "校門", "line": "red"}
+            for hour in range(7, 22)
+        ],
+        "weekdayBusScheduleTowardMainGate": [
+            {"time": f"{hour:02d}:30", "description": tag, "dep_stop": "台積館", "line": "green"}
+            for hour in range(7, 22)
+        ],
+        "weekdayBusScheduleTowardNanda": [
+            {"time": f"{hour:02d}:40", "description": tag} for hour in range(7, 22, 2)
+        ],
+    }
+
+
+class TestBusesReprocessing:
+    """Tests for incremental reprocessing and the atomic timetable swap."""
+
+    async def test_unchanged_schedules_are_reused(self, service: services.BusesService):
+        """Test only the changed timetable is rebuilt."""
+        before = service._timetable
+        payload = dict(service._res_json)
+        payload["weekendBusScheduleTowardNanda"] = [{"time": "12:00", "description": ""}]
+        service._res_json = payload
+        service._process_all_data()
+
+        changed = ("nanda", "weekend", "up")
+        assert service._timetable is not before
+        assert [bus["time"] for bus in service.raw_schedule_data[changed]] == ["12:00"]
+        for key in before.sources:
+            if key != changed:
+                assert service.raw_schedule_data[key] is before.raw_schedule_data[key]
+                assert service.detailed_schedule_data[key] is before.detailed_schedule_data[key]
+
+    async def test_gen2_change_rebuilds_main_routes(self, service: services.BusesService):
+        """Test a new Gen2 departure rebuilds every main campus schedule."""
+        before = service._timetable
+        payload = dict(service._res_json)
+        payload["weekendBusScheduleTowardMainGate"] = [
+            *payload["weekendBusScheduleTowardMainGate"],
+            {"time": "22:00", "description": "", "dep_stop": "綜二館", "line": "red"},
+        ]
+        service._res_json = payload
+        service._process_all_data()
+
+        for key in before.sources:
+            reused = service.raw_schedule_data[key] is before.raw_schedule_data[key]
+            assert reused == (key[0] == "nanda")
+
+    async def test_rebuild_matches_full_processing(self, service: services.BusesService):
+        """Test an incremental rebuild equals processing from scratch."""
+        payload = dict(service._res_json)
+        payload["weekdayBusScheduleTowardTSMCBuilding"] = payload[
+            "weekdayBusScheduleTowardTSMCBuilding"
+        ][::2]
+        service._res_json = payload
+        service._process_all_data()
+
+        fresh = services.BusesService()
+        fresh._res_json = payload
+        fresh._process_all_data()
+        for key in ALL_SCHEDULE_KEYS:
+            kwargs = {"route_type": key[0], "day": key[1], "direction": key[2]}
+            assert service.get_schedule(detailed=True, **kwargs) == fresh.get_schedule(
+                detailed=True, **kwargs
+            )
+            for stop_name in services.STOP_IDS:
+                assert service.get_stop_schedule(stop_name, *key) == fresh.get_stop_schedule(
+                    stop_name, *key
+                )
+
+    async def test_queries_during_swap_see_one_version(self, monkeypatch):
+        """Test queries running while a new version is built never see a mix."""
+        service = services.BusesService()
+        versions = {"hash": ("v1", tagged_timetable("v1"))}
+
+        class FakeData:
+            async def get(self, endpoint: str):
+                return versions["hash"]
+
+        monkeypatch.setattr(services, "nthudata", FakeData())
+        await service.update_data()
+
+        build = service._build_timetable
+
+        def slow_build(payload, previous=None):
+            time.sleep(0.05)
+            return build(payload, previous)
+
+        monkeypatch.setattr(service, "_build_timetable", slow_build)
+        versions["hash"] = ("v2", tagged_timetable("v2"))
+        update = asyncio.create_task(service.update_data())
+
+        seen = []
+        while not update.done():
+            schedule = service.get_schedule(
+                route_type="all", day="weekday", direction="all", detailed=True
+            )
+            arrivals = service.get_next_arrivals("北校門口", "all", "weekday", "all", "")
+            tags = {bus["dep_info"]["description"] for bus in schedule}
+            tags |= {bus["description"] for bus in arrivals}
+            assert len(tags) == 1
+            seen.append((tags.pop(), service.last_commit_hash))
+            await asyncio.sleep(0.001)
+        await update
+
+        assert ("v1", "v1") in seen
+        assert all(tag == commit_hash for tag, commit_hash in seen)
+        schedule = service.get_schedule(route_type="nanda", day="weekday", direction="up")
+        assert schedule[0]["description"] == "v2"
+
+    async def test_concurrent_updates_build_once(self, monkeypatch):
+        """Test concurrent updates for the same commit share one rebuild."""
+        service = services.BusesService()
+
+        class FakeData:
+            async def get(self, endpoint: str):
+                return "v1", tagged_timetable("v1")
+
+        builds = []
+        build = service._build_timetable
+
+        def counting_build(payload, previous=None):
+            builds.append(payload)
+            time.sleep(0.01)
+            return build(payload, previous)
+
+        monkeypatch.setattr(services, "nthudata", FakeData())
+        monkeypatch.setattr(service, "_build_timetable", counting_build)
+        await asyncio.gather(*(service.update_data() for _ in range(5)))
+        await service.update_data()
+
+        assert len(builds) == 1
+        assert service.last_commit_hash == "v1"
+
+    async def test_processing_metric_recorded_on_event_loop(self, monkeypatch):
+        """Test the rebuild is timed from the event loop thread, not the worker thread."""
+        service = services.BusesService()
+        threads = []
+        monkeypatch.setattr(
+            metrics.PROCESSING_DURATION,
+            "observe",
+            lambda seconds, *labels: threads.append((threading.get_ident(), labels)),
+        )
+        await service._rebuild(tagged_timetable("v1"), "v1")
+        assert threads == [(threading.get_ident(), ("buses",))]
+
+
+def reference_arrival(
+    timetable: services.Timetable, origin: str, destination: str, day: str, start: int
+):
+    """Earliest arrival by relaxing every trip round by round, for up to three rides."""
+    trips = [
+        trip for key, day_trips in timetable.trips.items() if key[1] == day for trip in day_trips
+    ]
+    arrival = {origin: start}
+    for _ in range(3):
+        improved = dict(arrival)
+        for trip in trips:
+            stops = [stop.id for stop in trip.route.stops]
+            last = len(stops) - 1
+            nanda_up = trip.route_type == "nanda" and trip.direction == "up"
+            nanda_down = trip.route_type == "nanda" and trip.direction == "down"
+            boarded = False
+            for position, (stop_id, offset) in enumerate(zip(stops, trip.route.time_offsets)):
+                time_at_stop = trip.departure + offset
+                can_alight = position > 0 and (not nanda_up or position == last)
+                if boarded and can_alight and time_at_stop < improved.get(stop_id, float("inf")):
+                    improved[stop_id] = time_at_stop
+                if stop_id in arrival and not (nanda_down and position > 0) and position < last:
+                    ready = arrival[stop_id] + (
+                        0 if stop_id == origin else planner.TRANSFER_MINUTES
+                    )
+                    boarded = boarded or time_at_stop >= ready
+        arrival = improved
+    return arrival.get(destination)
+
+
+class TestBusesJourneyPlanner:
+    """Tests for the earliest-arrival journey planner."""
+
+    async def test_transfer_from_nanda_to_main_campus(self, service: services.BusesService):
+        """Test a trip from Nanda to Maple Path changes to a main campus bus."""
+        plan = service.plan_journey(
+            "南大校區校門口右側(食品路校牆邊)", "楓林小徑", "weekday", "12:00"
+        )
+        assert plan["transfers"] == 1
+        first, second = plan["legs"]
+        assert (first["route_type"], first["direction"]) == ("nanda", "down")
+        assert (second["route_type"], second["direction"]) == ("main", "up")
+        assert first["alight_stop"] == second["board_stop"]
+        assert second["board_time"] > first["alight_time"]
+        assert plan["departure_time"] >= "12:00"
+        assert plan["arrival_time"] == second["alight_time"]
+
+    @pytest.mark.parametrize("day", ["weekday", "weekend"])
+    @pytest.mark.parametrize("after", ["06:00", "09:05", "13:47", "19:30"])
+    async def test_matches_reference_search(
+        self, service: services.BusesService, day: str, after: str
+    ):
+        """Test the planner finds the earliest arrival for every pair of stops."""
+        start = services.time_to_minutes(after)
+        for origin, destination in product(services.STOP_IDS, repeat=2):
+            if origin == destination:
+                continue
+            plan = service.plan_journey(origin, destination, day, after)
+            expected = reference_arrival(
+                service._timetable,
+                services.STOP_IDS[origin],
+                services.STOP_IDS[destination],
+                day,
+                start,
+            )
+            if expected is None:
+                assert plan is None
+                continue
+            assert services.departure_minutes(plan["arrival_time"]) == expected
+
+            # The legs connect and respect the Nanda boarding rules
+            assert plan["legs"][0]["board_stop"] == origin
+            assert plan["legs"][-1]["alight_stop"] == destination
+            assert plan["departure_time"] >= after
+            for leg, next_leg in zip(plan["legs"], plan["legs"][1:]):
+                assert leg["alight_stop"] == next_leg["board_stop"]
+                assert next_leg["board_time"] > leg["alight_time"]
+            for leg in plan["legs"]:
+                if leg["route_type"] == "nanda" and leg["direction"] == "up":
+                    assert leg["alight_stop"] == "南大校區校門口右側(食品路校牆邊)"
+                if leg["route_type"] == "nanda" and leg["direction"] == "down":
+                    assert leg["board_stop"] == "南大校區校門口右側(食品路校牆邊)"
+
+    async def test_transfer_wait_is_minimized(self, service: services.BusesService, monkeypatch):
+        """Test earlier legs take the latest bus that still makes the connection."""
+        args = ("楓林小徑", "南大校區校門口右側(食品路校牆邊)", "weekday", "12:00")
+        plan = service.plan_journey(*args)
+        monkeypatch.setattr(planner.JourneyPlanner, "_postpone", lambda self, itinerary: None)
+        earliest = service.plan_journey(*args)
+
+        assert plan["arrival_time"] == earliest["arrival_time"]
+        assert plan["departure_time"] > earliest["departure_time"]
+        assert plan["legs"][1] == earliest["legs"][1]
+
+    async def test_same_stop_and_unreachable(self, service: services.BusesService):
+        """Test a journey to the same stop is empty and none is found after the last bus."""
+        plan = service.plan_journey("台積館", "台積館", "weekday", "08:00")
+        assert plan["legs"] == [] and plan["duration"] == 0
+        assert (
+            service.plan_journey("台積館", "南大校區校門口右側(食品路校牆邊)", "weekend", "23:30")
+            is None
+        )
+
+    async def test_depart_after_midnight(self):
+        """Test a journey planned after midnight takes the run still to come that night."""
+        service = services.BusesService()
+        service._res_json = {
+            "weekdayBusScheduleTowardTSMCBuilding": [
+                {"time": "07:30", "description": "", "dep_stop": "校門", "line": "red"},
+                {"time": "23:50", "description": "", "dep_stop": "校門", "line": "red"},
+                {"time": "00:20", "description": "", "dep_stop": "校門", "line": "red"},
+            ],
+        }
+        service._process_all_data()
+        stops = service.get_schedule(
+            route_type="main", day="weekday", direction="up", detailed=True
+        )
+        origin, destination = stops[0]["stops_time"][0]["stop"], stops[0]["stops_time"][-1]["stop"]
+
+        plan = service.plan_journey(origin, destination, "weekday", "00:10")
+        assert plan["depart_after"] == "00:10"
+        assert plan["departure_time"] == "00:20"
+        # After the last night run, the morning runs are next
+        assert service.plan_journey(origin, destination, "weekday", "00:21")["departure_time"] == (
+            "07:30"
+        )
+        assert service.plan_journey(origin, destination, "weekday", "23:00")["departure_time"] == (
+            "23:50"
+        )
+
+    async def test_plan_early_morning(self, service: services.BusesService):
+        """Test a journey planned at 01:00 takes the first morning buses."""
+        plan = service.plan_journey("北校門口", "台積館", "weekday", "01:00")
+        first = service.get_next_departures(
+            route_type="main", day="weekday", direction="up", after="01:00", limit=1
+        )
+        assert plan is not None and plan["depart_after"] == "01:00"
+        assert plan["departure_time"] >= first[0]["time"]
+        assert plan["legs"][0]["board_stop"] == "北校門口"
+
+    async def test_invalid_input(self, service: services.BusesService):
+        """Test unknown stops and invalid times are rejected."""
+        with pytest.raises(ValueError):
+            service.plan_journey("不存在", "台積館", "weekday", "08:00")
+        with pytest.raises(ValueError):
+            service.plan_journey("北校門口", "台積館", "weekday", "8 am")
+
+
+class TestBusesPlanEndpoint:
+    """Tests for the journey planning endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def recorded(self, monkeypatch):
+        """Serve the recorded timetable to a fresh global service."""
+        payload = json.loads((FIXTURES_DIR / "data.nthusa.tw" / "buses.json").read_text())
+
+        class FakeData:
+            async def get(self, endpoint: str):
+                return "recorded", payload
+
+        monkeypatch.setattr(services, "nthudata", FakeData())
+        monkeypatch.setattr(services, "buses_service", services.BusesService())
+
+    @pytest.fixture
+    async def client(self):
+        """Create async test client."""
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+        ) as client:
+            yield client
+
+    async def test_plan(self, client: AsyncClient):
+        """Test planning a journey with a transfer."""
+        response = await client.get(
+            "/buses/plan",
+            params={
+                "from": "南大校區校門口右側(食品路校牆邊)",
+                "to": "楓林小徑",
+                "depart_after": "12:00",
+                "day": "weekday",
+            },
+        )
+        assert response.status_code == 200
+        plan = response.json()
+        assert plan["transfers"] == 1
+        assert [leg["route_type"] for leg in plan["legs"]] == ["nanda", "main"]
+
+    async def test_plan_early_morning(self, client: AsyncClient):
+        """Test a journey planned after midnight finds the morning buses."""
+        params = {"from": "北校門口", "to": "台積館", "depart_after": "01:00", "day": "weekday"}
+        response = await client.get("/buses/plan", params=params)
+        assert response.status_code == 200
+        assert response.json()["legs"]
+
+    async def test_plan_current_time(self, client: AsyncClient):
+        """Test planning from now answers with an itinerary or no bus."""
+        response = await client.get("/buses/plan", params={"from": "北校門口", "to": "台積館"})
+        assert response.status_code in (200, 404)
+
+    async def test_plan_errors(self, client: AsyncClient):
+        """Test invalid times, unknown stops and unreachable stops."""
+        params = {"from": "台積館", "to": "北校門口", "day": "weekday"}
+        response = await client.get("/buses/plan", params={**params, "depart_after": "noon"})
+        assert response.status_code == 400
+        response = await client.get("/buses/plan", params={**params, "to": "不存在"})
+        assert response.status_code == 422
+        response = await client.get("/buses/plan", params={**params, "depart_after": "23:50"})
+        assert response.status_code == 404
+
+    async def test_plan_mcp_tool(self):
+        """Test the MCP tool returns the itinerary or an error."""
+        from data_api.mcp.tools.buses import _plan_bus_journey
+
+        result = await _plan_bus_journey("北校門口", "台積館", depart_after="08:00")
+        assert result["legs"][0]["board_stop"] == "北校門口"
+        assert result["legs"][-1]["alight_stop"] == "台積館"
+
+        result = await _plan_bus_journey("北校門口", "台積館", depart_after="bad")
+        assert "error" in result
+
+
+class TestBusesRequestPath:
+    """Tests for leaving bus updates to the background refresher."""
+
+    @pytest.fixture
+    def fetches(self, monkeypatch):
+        """Serve a processed timetable and record every buses.json fetch."""
+        fetches = []
+        service = services.BusesService()
+        service._res_json = tagged_timetable("v1")
+        service._process_all_data()
+        service.last_commit_hash = "v1"
+
+        class FakeData:
+            async def get(self, endpoint: str):
+                # A new commit is pending; only the refresher should pick it up
+                fetches.append(endpoint)
+                return "v2", tagged_timetable("v2")
+
+        monkeypatch.setattr(services, "nthudata", FakeData())
+        monkeypatch.setattr(services, "buses_service", service)
+        return fetches
+
+    @pytest.fixture
+    async def client(self):
+        """Create async test client."""
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+        ) as client:
+            yield client
+
+    async def test_no_fetch_while_refresher_runs(self, fetches: list, client: AsyncClient):
+        """Test requests read the materialized timetable while the refresher runs."""
+        from data_api.mcp.tools.buses import _get_next_buses
+
+        services.refresher.start()
+        try:
+            response = await client.get(
+                "/buses/schedules/",
+                params={"bus_type": "main", "day": "weekday", "direction": "up"},
+            )
+            await _get_next_buses(limit=5)
+        finally:
+            await services.refresher.stop()
+
+        assert response.status_code == 200
+        assert response.headers["X-Data-Commit-Hash"] == "v1"
+        assert {bus["description"] for bus in response.json()} == {"v1"}
+        assert fetches == []
+
+    async def test_fetch_without_refresher(self, fetches: list, client: AsyncClient):
+        """Test requests update the timetable themselves when no refresher runs."""
+        response = await client.get(
+            "/buses/schedules/",
+            params={"bus_type": "main", "day": "weekday", "direction": "up"},
+        )
+        assert response.status_code == 200
+        assert {bus["description"] for bus in response.json()} == {"v2"}
+        assert fetches == ["buses.json"]
@@ -0,0 +1,80 @@
+"""Tests for the JSON decoding backends."""
+
+import json
+import threading
+
+import httpx
+import pytest
+
+from data_api.data.decoding import DECODERS, JSONDecoder, StreamingArrayParser, get_decoder
+from data_api.data.nthudata import DataFetcher
+
+
+class TestJSONDecoder:
+    """Tests for JSONDecoder class."""
+
+    @pytest.mark.parametrize("backend", list(DECODERS))
+    async def test_backends_agree(self, backend):
+        """Test that every installed backend decodes the same payload."""
+        raw = '{"課程": [1, 2.5, null, true], "name": "資料結構"}'.encode()
+        assert JSONDecoder(backend).decode(raw) == {
+            "課程": [1, 2.5, None, True],
+            "name": "資料結構",
+        }
+
+    async def test_unknown_backend_falls_back(self):
+        """Test that an unavailable backend falls back to the preferred one."""
+        assert get_decoder("missing") == get_decoder()
+        assert get_decoder("json")[0] == "json"
+
+    async def test_large_body_decoded_off_loop(self):
+        """Test that bodies above the threshold are decoded in a worker thread."""
+        threads = []
+
+        def decode(raw: bytes):
+            threads.append(threading.current_thread())
+            return DECODERS["json"](raw)
+
+        decoder = JSONDecoder("json", offload_threshold=10)
+        decoder._decode = decode
+        assert await decoder.decode_async(b"[1]") == [1]
+        assert await decoder.decode_async(b"[1, 2, 3, 4, 5]") == [1, 2, 3, 4, 5]
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
+
+    async def test_invalid_json_returns_none(self):
+        """Test that undecodable bodies are reported as None by the fetcher."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"{oops"))
+        fetcher = DataFetcher("https://example.com", transport=transport)
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        await fetcher.aclose()
+
+
+class TestStreamingArrayParser:
+    """Tests for StreamingArrayParser class."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+    async def test_matches_full_decode(self, chunk_size):
+        """Test that parsing in chunks of any size equals decoding the whole body."""
+        data = [{"科號": "CS 1", "學分": 3}, [1, 2.5e3, None], 'a\\"]b', 12345, True, {}]
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        parser = StreamingArrayParser()
+        for start in range(0, len(raw), chunk_size):
+            parser.feed(raw[start : start + chunk_size])
+        assert parser.close() == data
+
+    async def test_shares_keys(self):
+        """Test that equal keys of different elements are the same object."""
+        parser = StreamingArrayParser()
+        parser.feed(b'[{"name": 1}, ')
+        parser.feed(b'{"name": 2}]')
+        first, second = parser.close()
+        assert next(iter(first)) is next(iter(second))
+
+    @pytest.mark.parametrize("raw", [b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1], 2", b"[1,]"])
+    async def test_invalid_arrays(self, raw):
+        """Test that malformed or truncated arrays raise ValueError."""
+        parser = StreamingArrayParser()
+        with pytest.raises(ValueError):
+            parser.feed(raw)
+            parser.close()
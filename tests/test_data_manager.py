@@ -1,10 +1,91 @@
 """Tests for the data manager module."""
 
+import asyncio
+import time
+
+import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from data_api.api.api import app
-from data_api.data.nthudata import DataCache, DataFetcher, FileDetailsManager
+from data_api.data.nthudata import (
+    DataCache,
+    DataFetcher,
+    FileDetailsManager,
+    NTHUDataManager,
+    SingleFlight,
+)
+
+FILE_DETAILS = {
+    "file_details": {
+        "/": [
+            {"name": "courses.json", "last_commit": "abc123", "last_updated": "2024-01-01"},
+        ]
+    }
+}
+
+OLD_DETAILS = [{"name": "/old.json", "last_commit": "old", "last_updated": "2023-01-01"}]
+
+
+class TestDataFetcher:
+    """Tests for DataFetcher class."""
+
+    async def test_reuses_shared_client(self):
+        """Test that consecutive fetches share one pooled client."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        fetcher = DataFetcher("https://example.com", transport=transport)
+
+        assert await fetcher.fetch_json("https://example.com/a.json") == {"ok": True}
+        client = fetcher._client
+        assert await fetcher.fetch_json("https://example.com/b.json") == {"ok": True}
+        assert fetcher._client is client
+
+        await fetcher.aclose()
+        assert client.is_closed
+        assert fetcher._client is None
+
+    async def test_request_error_returns_none(self):
+        """Test that connection errors are reported as None."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("unreachable", request=request)
+
+        fetcher = DataFetcher("https://example.com", transport=httpx.MockTransport(handler))
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        await fetcher.aclose()
+
+    async def test_streams_large_arrays(self):
+        """Test that array bodies above the threshold are parsed while downloading."""
+        rows = [{"id": i} for i in range(100)]
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=rows))
+        fetcher = DataFetcher("https://example.com", transport=transport, stream_min_bytes=10)
+        assert await fetcher.fetch_json("https://example.com/a.json") == rows
+
+        stats = fetcher.fetch_stats["https://example.com/a.json"]
+        assert stats["streamed"] is True
+        assert stats["ttfb"] >= 0
+        assert stats["bytes"] > 10
+        assert fetcher.downloads == {}
+        await fetcher.aclose()
+
+    async def test_byte_budget(self):
+        """Test that bodies over the byte budget are rejected without retries."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=list(range(1000)))
+
+        fetcher = DataFetcher(
+            "https://example.com", transport=httpx.MockTransport(handler), max_bytes=100
+        )
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        assert fetcher.errors["https://example.com/a.json"]["kind"] == "too_large"
+        assert len(requests) == 1
+
+        result = await fetcher.fetch("https://example.com/a.json", max_bytes=10_000)
+        assert result["data"] == list(range(1000))
+        await fetcher.aclose()
 
 
 class TestFileDetailsManager:
@@ -69,6 +150,161 @@ class TestFileDetailsManager:
         commit_hash = manager.get_commit_hash("/unknown.json", file_details)
         assert commit_hash is None
 
+    async def test_commit_hash_index(self):
+        """Test index-based lookups and queries on cached file details."""
+        fetcher = DataFetcher("https://example.com")
+        manager = FileDetailsManager(fetcher, "https://example.com/file_details.json")
+        manager.set_file_details(
+            [
+                {"name": "/buses.json", "last_commit": "abc123", "last_updated": "2024-01-01"},
+                {"name": "/courses.json", "last_commit": "bcd234", "last_updated": "2024-03-01"},
+                {
+                    "name": "dining/shops.json",
+                    "last_commit": "def456",
+                    "last_updated": "2024-02-01",
+                },
+            ]
+        )
+
+        assert manager.get_commit_hash("/buses.json") == "abc123"
+        assert manager.get_commit_hash("/unknown.json") is None
+        assert manager.get_entry("dining/shops.json") == ("def456", "2024-02-01")
+        assert manager.changed_since("2024-01-15") == ["/courses.json", "dining/shops.json"]
+        assert manager.changed_commits({"/buses.json": "abc123", "/courses.json": "old"}) == [
+            "/courses.json"
+        ]
+        assert manager.list_section("/") == ["/buses.json", "/courses.json"]
+        assert manager.list_section("dining") == ["dining/shops.json"]
+        assert manager.list_section("unknown") == []
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving stale file details while revalidating."""
+
+    def make_manager(self, handler, **kwargs) -> FileDetailsManager:
+        fetcher = DataFetcher("https://example.com", transport=httpx.MockTransport(handler))
+        return FileDetailsManager(fetcher, "https://example.com/file_details.json", **kwargs)
+
+    async def test_serve_stale_and_revalidate_once(self):
+        """Test that expired details are served immediately with one background refresh."""
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=FILE_DETAILS)
+
+        manager = self.make_manager(handler, cache_expiry=60)
+        manager.set_file_details(OLD_DETAILS, last_updated=0)
+
+        results = await asyncio.gather(*(manager.get_file_details() for _ in range(20)))
+        assert all(result == OLD_DETAILS for result in results)
+
+        await manager._revalidation
+        assert requests == 1
+        assert manager._cache["data"][0]["name"] == "/courses.json"
+        assert manager.age < 60
+        await manager.fetcher.aclose()
+
+    async def test_blocking_refresh_when_disabled(self):
+        """Test that expired details are refetched inline without stale-while-revalidate."""
+        manager = self.make_manager(
+            lambda request: httpx.Response(200, json=FILE_DETAILS),
+            stale_while_revalidate=False,
+        )
+        manager.set_file_details(OLD_DETAILS, last_updated=0)
+
+        details = await manager.get_file_details()
+        assert details[0]["name"] == "/courses.json"
+        await manager.fetcher.aclose()
+
+    async def test_degraded_after_max_staleness(self):
+        """Test that data older than max staleness is reported as degraded."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("unreachable", request=request)
+
+        manager = self.make_manager(handler, max_staleness=3600)
+        assert manager.age is None
+        assert manager.is_degraded is False
+
+        manager.set_file_details(OLD_DETAILS, last_updated=time.time() - 7200)
+        assert await manager.get_file_details() == OLD_DETAILS
+        await manager._revalidation
+
+        assert manager.age > 3600
+        assert manager.is_degraded is True
+        await manager.fetcher.aclose()
+
+    async def test_data_manager_exposes_age(self):
+        """Test that the data manager reports the age of its file details."""
+        manager = NTHUDataManager(base_url="https://example.com", max_staleness=3600)
+        assert manager.data_age is None
+        assert manager.is_degraded is False
+
+        manager.file_details_manager.set_file_details([], last_updated=time.time() - 7200)
+        assert manager.data_age > 3600
+        assert manager.is_degraded is True
+
+
+class TestConditionalRequests:
+    """Tests for ETag / Last-Modified revalidation."""
+
+    async def test_not_modified_reuses_cached_data(self):
+        """Test that a 304 keeps the cached payload under the new commit hash."""
+        commits = {"courses.json": "abc123"}
+        sent_validators = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/file_details.json":
+                files = [
+                    {"name": name, "last_commit": commit, "last_updated": "2024-01-01"}
+                    for name, commit in commits.items()
+                ]
+                return httpx.Response(200, json={"file_details": {"/": files}})
+            sent_validators.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(handler)
+        )
+        assert await manager.get("courses.json") == ("abc123", [{"id": 1}])
+
+        commits["courses.json"] = "def456"
+        await manager.file_details_manager.refresh()
+        assert await manager.get("courses.json") == ("def456", [{"id": 1}])
+
+        assert sent_validators == [None, '"v1"']
+        stats = manager.fetcher.fetch_stats["https://example.com/courses.json"]
+        assert stats["not_modified"] is True
+        assert stats["bytes"] == 0
+        await manager.aclose()
+
+    async def test_file_details_not_modified(self):
+        """Test that file_details.json is revalidated with Last-Modified."""
+        last_modified = "Wed, 01 May 2024 00:00:00 GMT"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-Modified-Since") == last_modified:
+                return httpx.Response(304)
+            return httpx.Response(200, json=FILE_DETAILS, headers={"Last-Modified": last_modified})
+
+        fetcher = DataFetcher("https://example.com", transport=httpx.MockTransport(handler))
+        manager = FileDetailsManager(fetcher, "https://example.com/file_details.json")
+
+        assert await manager.refresh() is True
+        details = manager._cache["data"]
+        manager._cache["last_updated"] = 0
+
+        assert await manager.refresh() is True
+        assert manager._cache["data"] is details
+        assert manager.age < 60
+        assert fetcher.fetch_stats["https://example.com/file_details.json"]["not_modified"]
+        await fetcher.aclose()
+
 
 class TestDataCache:
     """Tests for DataCache class."""
@@ -112,6 +348,134 @@ class TestDataCache:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
 
+    async def test_evicts_least_recently_used(self):
+        """Test that least recently used entries are evicted beyond the byte budget."""
+        cache = DataCache()
+        cache.set("key1", ["x" * 1000], "hash1")
+        cache.max_bytes = cache.total_size * 2
+        cache.set("key2", ["y" * 1000], "hash2")
+        cache.get("key1")
+
+        cache.set("key3", ["z" * 1000], "hash3")
+        assert list(cache.stats()) == ["key1", "key3"]
+        assert cache.evictions == 1
+        assert cache.total_size <= cache.max_bytes
+
+    async def test_pinned_entries_not_evicted(self):
+        """Test that pinned entries stay cached over the byte budget."""
+        cache = DataCache(max_bytes=1, pinned=["pinned"])
+        cache.set("pinned", ["x" * 1000], "hash1")
+        cache.set("key2", ["y" * 1000], "hash2")
+        cache.set("key3", ["z" * 1000], "hash3")
+
+        assert list(cache.stats()) == ["pinned", "key3"]
+        assert cache.stats()["pinned"]["pinned"] is True
+
+    async def test_stats(self):
+        """Test per-key size, age and hit statistics."""
+        cache = DataCache()
+        cache.set("key1", {"data": "value"}, "hash1")
+        cache.get("key1")
+        cache.get("key1")
+        cache.peek("key1")
+
+        stats = cache.stats()["key1"]
+        assert stats["hits"] == 2
+        assert stats["size"] > 0
+        assert 0 <= stats["age"] < 60
+        assert stats["commit_hash"] == "hash1"
+
+
+class TestSingleFlight:
+    """Tests for request coalescing."""
+
+    async def test_concurrent_calls_share_one_task(self):
+        """Test that concurrent calls for one key run the function once."""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(single_flight.do("key", work) for _ in range(10)))
+        assert results == [1] * 10
+        assert calls == 1
+        assert not single_flight.in_flight("key")
+
+    async def test_concurrent_get_fetches_upstream_once(self):
+        """Test that 500 concurrent gets trigger exactly one upstream download."""
+        counts = {"/file_details.json": 0, "/courses.json": 0}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            counts[request.url.path] += 1
+            await asyncio.sleep(0.01)
+            if request.url.path == "/file_details.json":
+                return httpx.Response(200, json=FILE_DETAILS)
+            return httpx.Response(200, json=[{"id": "11210CS 100100"}])
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(handler)
+        )
+        results = await asyncio.gather(*(manager.get("courses.json") for _ in range(500)))
+        await manager.aclose()
+
+        assert counts == {"/file_details.json": 1, "/courses.json": 1}
+        assert all(result == ("abc123", [{"id": "11210CS 100100"}]) for result in results)
+
+
+class TestPrefetch:
+    """Tests for concurrent pre-fetching."""
+
+    async def test_prefetch_bounded_concurrency(self):
+        """Test that prefetch runs endpoints concurrently up to the cap."""
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            if request.url.path == "/file_details.json":
+                return httpx.Response(200, json=FILE_DETAILS)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return httpx.Response(200, json=[1, 2, 3])
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(handler)
+        )
+        endpoints = [f"data_{i}.json" for i in range(6)]
+        results = await manager.prefetch(endpoints, max_concurrency=2)
+        await manager.aclose()
+
+        assert peak == 2
+        assert list(results) == endpoints
+        for result in results.values():
+            assert result["success"] is True
+            assert result["bytes"] == len(b"[1,2,3]")
+            assert result["duration"] > 0
+
+    async def test_prefetch_timeout(self):
+        """Test that a slow endpoint is reported as failed after the timeout."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/file_details.json":
+                return httpx.Response(200, json=FILE_DETAILS)
+            await asyncio.sleep(1)
+            return httpx.Response(200, json=[])
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(handler)
+        )
+        results = await manager.prefetch(["courses.json"], timeout=0.05)
+        await manager.aclose()
+
+        assert results["courses.json"]["success"] is False
+        assert results["courses.json"]["bytes"] == 0
+
 
 class TestDataManagerIntegration:
     """Integration tests for data manager with API endpoints."""
@@ -0,0 +1,141 @@
+"""Tests for the background refresher."""
+
+import asyncio
+
+import httpx
+
+from data_api.data.nthudata import NTHUDataManager
+from data_api.data.refresher import BackgroundRefresher
+
+
+class MockUpstream:
+    """Mock data.nthusa.tw whose commit hashes can be rotated per file."""
+
+    def __init__(self, *names: str):
+        self.commits = {name: "v1" for name in names}
+        self.requests: list[str] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        if path == "/file_details.json":
+            files = [
+                {"name": name, "last_commit": commit, "last_updated": "2024-01-01"}
+                for name, commit in self.commits.items()
+            ]
+            return httpx.Response(200, json={"file_details": {"/": files}})
+        return httpx.Response(200, json={"commit": self.commits[path.lstrip("/")]})
+
+    def manager(self) -> NTHUDataManager:
+        return NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(self.handler)
+        )
+
+
+class TestBackgroundRefresher:
+    """Tests for BackgroundRefresher class."""
+
+    async def test_refetch_only_changed_endpoints(self):
+        """Test that only endpoints with a new commit hash are re-fetched."""
+        upstream = MockUpstream("buses.json", "dining.json")
+        manager = upstream.manager()
+        processed = []
+
+        async def process_buses():
+            processed.append((await manager.get("buses.json"))[1])
+
+        refresher = BackgroundRefresher(manager, interval=0)
+        refresher.register("buses.json", process_buses)
+        refresher.register("dining.json")
+
+        assert await refresher.run_once() == ["/buses.json", "/dining.json"]
+        assert processed == [{"commit": "v1"}]
+
+        upstream.commits["buses.json"] = "v2"
+        upstream.requests.clear()
+        assert await refresher.run_once() == ["/buses.json"]
+        assert upstream.requests == ["/file_details.json", "/buses.json"]
+        assert processed == [{"commit": "v1"}, {"commit": "v2"}]
+        await manager.aclose()
+
+    async def test_processors_run_when_cache_refreshed_elsewhere(self):
+        """Test processors still apply a commit that a request already fetched."""
+        upstream = MockUpstream("buses.json")
+        manager = upstream.manager()
+        processed = []
+
+        async def process_buses():
+            processed.append((await manager.get("buses.json"))[1])
+
+        refresher = BackgroundRefresher(manager, interval=0)
+        refresher.register("buses.json", process_buses)
+        assert await refresher.run_once() == ["/buses.json"]
+
+        upstream.commits["buses.json"] = "v2"
+        await manager.file_details_manager.refresh()
+        assert await manager.get("buses.json") == ("v2", {"commit": "v2"})
+        upstream.requests.clear()
+
+        assert await refresher.run_once() == ["/buses.json"]
+        assert upstream.requests == ["/file_details.json"]
+        assert processed == [{"commit": "v1"}, {"commit": "v2"}]
+        assert await refresher.run_once() == []
+        await manager.aclose()
+
+    async def test_failed_processor_is_retried(self):
+        """Test a processor that raised runs again on the next refresh."""
+        upstream = MockUpstream("buses.json")
+        manager = upstream.manager()
+        calls = []
+
+        async def process_buses():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        refresher = BackgroundRefresher(manager, interval=0)
+        refresher.register("buses.json", process_buses)
+        assert await refresher.run_once() == ["/buses.json"]
+        assert await refresher.run_once() == ["/buses.json"]
+        assert await refresher.run_once() == []
+        assert calls == [0, 1]
+        await manager.aclose()
+
+    async def test_per_endpoint_schedule(self):
+        """Test that endpoints with a longer schedule are not checked every run."""
+        upstream = MockUpstream("buses.json", "courses.json")
+        manager = upstream.manager()
+        refresher = BackgroundRefresher(manager, interval=0, schedules={"courses.json": 3600})
+        refresher.register("buses.json")
+        refresher.register("courses.json")
+
+        assert await refresher.run_once() == ["/buses.json", "/courses.json"]
+
+        upstream.commits = {"buses.json": "v2", "courses.json": "v2"}
+        upstream.requests.clear()
+        assert await refresher.run_once() == ["/buses.json"]
+        assert "/courses.json" not in upstream.requests
+        await manager.aclose()
+
+    async def test_request_path_does_not_refresh_while_running(self):
+        """Test that requests do not refetch file_details.json while the refresher runs."""
+        upstream = MockUpstream("buses.json")
+        manager = upstream.manager()
+        manager.file_details_manager.cache_expiry = 0
+        refresher = BackgroundRefresher(manager, interval=3600)
+
+        await manager.get("buses.json")
+        refresher.start()
+        assert refresher.running
+        upstream.requests.clear()
+
+        await asyncio.sleep(0.01)
+        assert await manager.get("buses.json") == ("v1", {"commit": "v1"})
+        assert upstream.requests == []
+
+        await refresher.stop()
+        assert not refresher.running
+        await manager.get("buses.json")
+        await manager.file_details_manager._revalidation
+        assert upstream.requests == ["/file_details.json"]
+        await manager.aclose()
@@ -0,0 +1,142 @@
+"""Tests for upstream retries and circuit breaking."""
+
+import httpx
+
+from data_api.data.nthudata import DataFetcher, NTHUDataManager
+from data_api.data.resilience import CircuitBreaker, RetryPolicy
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0)
+
+
+class FlakyUpstream:
+    """Mock upstream that fails a number of requests before answering."""
+
+    def __init__(self, failures: int = 0, status_code: int = 200):
+        self.failures = failures
+        self.status_code = status_code
+        self.requests = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.failures > 0:
+            self.failures -= 1
+            raise httpx.ConnectError("unreachable", request=request)
+        if request.url.path == "/file_details.json":
+            files = [{"name": "buses.json", "last_commit": "abc123", "last_updated": ""}]
+            return httpx.Response(200, json={"file_details": {"/": files}})
+        return httpx.Response(self.status_code, json={"ok": True})
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy class."""
+
+    async def test_backoff_is_capped_and_jittered(self):
+        """Test that backoff delays grow exponentially up to the cap."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+        delays = [policy.backoff(attempt) for attempt in (1, 2, 5) for _ in range(50)]
+        assert all(0 <= delay <= 3.0 for delay in delays)
+        assert max(delays[:50]) <= 1.0
+        assert len(set(delays)) > 1
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker class."""
+
+    async def test_opens_and_probes(self):
+        """Test closed -> open -> half-open -> closed transitions."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "half_open"
+
+        breaker.reset_timeout = 60
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+
+        breaker.reset_timeout = 0
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # Only one probe at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestFetcherRetries:
+    """Tests for retries and circuit breaking in DataFetcher."""
+
+    async def test_retries_transient_failures(self):
+        """Test that connection errors are retried until a response arrives."""
+        upstream = FlakyUpstream(failures=2)
+        fetcher = DataFetcher(
+            "https://example.com", transport=httpx.MockTransport(upstream.handler), retry=NO_DELAY
+        )
+        assert await fetcher.fetch_json("https://example.com/a.json") == {"ok": True}
+        assert upstream.requests == 3
+        assert fetcher.errors == {}
+        await fetcher.aclose()
+
+    async def test_exhausted_retries_report_attempts(self, capsys):
+        """Test the logged error counts every attempt made."""
+        upstream = FlakyUpstream(failures=5)
+        fetcher = DataFetcher(
+            "https://example.com", transport=httpx.MockTransport(upstream.handler), retry=NO_DELAY
+        )
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        assert fetcher.errors["https://example.com/a.json"]["attempts"] == 3
+        assert "after 3 attempt(s)" in capsys.readouterr().out
+        await fetcher.aclose()
+
+    async def test_client_errors_are_not_retried(self):
+        """Test that 4xx responses fail once with a structured error."""
+        upstream = FlakyUpstream(status_code=404)
+        fetcher = DataFetcher(
+            "https://example.com", transport=httpx.MockTransport(upstream.handler), retry=NO_DELAY
+        )
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        assert upstream.requests == 1
+
+        error = fetcher.errors["https://example.com/a.json"]
+        assert (error["kind"], error["status_code"], error["attempts"]) == ("http_status", 404, 1)
+        assert fetcher.breakers["example.com"].state == "closed"
+        await fetcher.aclose()
+
+    async def test_open_circuit_skips_upstream(self):
+        """Test that an open circuit fails fast without contacting upstream."""
+        upstream = FlakyUpstream(failures=100)
+        fetcher = DataFetcher(
+            "https://example.com",
+            transport=httpx.MockTransport(upstream.handler),
+            retry=NO_DELAY,
+            circuit_failure_threshold=2,
+        )
+        for _ in range(2):
+            assert await fetcher.fetch_json("https://example.com/a.json") is None
+        assert upstream.requests == 6
+        assert fetcher.breakers["example.com"].state == "open"
+
+        assert await fetcher.fetch_json("https://example.com/a.json") is None
+        assert upstream.requests == 6
+        assert fetcher.errors["https://example.com/a.json"]["kind"] == "circuit_open"
+        await fetcher.aclose()
+
+    async def test_manager_serves_cache_while_circuit_open(self):
+        """Test that the data manager falls back to cached data when upstream is down."""
+        upstream = FlakyUpstream()
+        manager = NTHUDataManager(
+            base_url="https://example.com",
+            transport=httpx.MockTransport(upstream.handler),
+            retry=NO_DELAY,
+            circuit_failure_threshold=1,
+        )
+        assert await manager.get("buses.json") == ("abc123", {"ok": True})
+
+        upstream.failures = 100
+        manager.cache.clear()
+        manager.cache.set("/buses.json", {"ok": "cached"}, "old")
+        manager.file_details_manager._cache["data"] = None
+
+        assert await manager.get("buses.json") == ("old", {"ok": "cached"})
+        requests = upstream.requests
+        assert await manager.get("buses.json") == ("old", {"ok": "cached"})
+        assert upstream.requests == requests
+        await manager.aclose()
@@ -0,0 +1,178 @@
+"""Tests for the on-disk snapshot store."""
+
+import asyncio
+import os
+import time
+
+import httpx
+
+from data_api.data.nthudata import NTHUDataManager
+from data_api.data.snapshot import SnapshotStore
+
+FILE_DETAILS = {
+    "file_details": {
+        "/": [
+            {"name": "buses.json", "last_commit": "abc123", "last_updated": "2024-01-01"},
+        ]
+    }
+}
+
+
+class TestSnapshotStore:
+    """Tests for SnapshotStore class."""
+
+    async def test_save_and_load(self, tmp_path):
+        """Test a snapshot round-trips with its commit hash."""
+        store = SnapshotStore(tmp_path)
+        data = {"weekdayBusScheduleTowardNanda": [{"time": "08:10", "description": "大"}]}
+        store.save("/buses.json", "abc123", data)
+
+        assert store.load("/buses.json") == ("abc123", data)
+        assert store.load("/missing.json") is None
+
+    async def test_load_all_nested_endpoint(self, tmp_path):
+        """Test loading snapshots for nested endpoint names."""
+        store = SnapshotStore(tmp_path)
+        store.save("/dining/shops.json", "def456", [1, 2, 3])
+        store.save("/buses.json", "abc123", {})
+
+        assert store.load_all() == {
+            "/dining/shops.json": ("def456", [1, 2, 3]),
+            "/buses.json": ("abc123", {}),
+        }
+
+    async def test_ignore_corrupted_snapshot(self, tmp_path):
+        """Test that unreadable snapshot files are skipped."""
+        store = SnapshotStore(tmp_path)
+        store.save("/buses.json", "abc123", {})
+        (tmp_path / "courses.json.snap").write_bytes(b"not a snapshot")
+
+        assert list(store.load_all()) == ["/buses.json"]
+
+
+class TestWarmRestart:
+    """Tests for serving snapshots when upstream is unreachable."""
+
+    async def test_serve_snapshot_without_upstream(self, tmp_path):
+        """Test a new manager serves the previous snapshot if upstream is down."""
+
+        def online(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/file_details.json":
+                return httpx.Response(200, json=FILE_DETAILS)
+            return httpx.Response(200, json={"ok": True})
+
+        def offline(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("unreachable", request=request)
+
+        first = NTHUDataManager(
+            base_url="https://example.com",
+            transport=httpx.MockTransport(online),
+            snapshot_dir=str(tmp_path),
+        )
+        assert await first.get("buses.json") == ("abc123", {"ok": True})
+        await first.aclose()
+
+        second = NTHUDataManager(
+            base_url="https://example.com",
+            transport=httpx.MockTransport(offline),
+            snapshot_dir=str(tmp_path),
+        )
+        assert second.load_snapshots() == ["/buses.json"]
+        assert await second.get("buses.json") == ("abc123", {"ok": True})
+
+        results = await second.validate_snapshots(["buses.json"])
+        assert results["buses.json"]["success"] is True
+        assert await second.get("buses.json") == ("abc123", {"ok": True})
+        await second.aclose()
+
+
+class TestSharedSnapshots:
+    """Tests for sharing snapshots between workers."""
+
+    async def test_follower_reads_refresher_snapshots(self, tmp_path):
+        """Test that only the elected refresher polls upstream."""
+        requests = {"refresher": 0, "follower": 0}
+
+        def handler_for(worker: str):
+            def handler(request: httpx.Request) -> httpx.Response:
+                requests[worker] += 1
+                if request.url.path == "/file_details.json":
+                    return httpx.Response(200, json=FILE_DETAILS)
+                return httpx.Response(200, json={"worker": worker})
+
+            return handler
+
+        refresher = NTHUDataManager(
+            base_url="https://example.com",
+            transport=httpx.MockTransport(handler_for("refresher")),
+            snapshot_dir=str(tmp_path),
+            shared_snapshots=True,
+        )
+        follower = NTHUDataManager(
+            base_url="https://example.com",
+            transport=httpx.MockTransport(handler_for("follower")),
+            snapshot_dir=str(tmp_path),
+            shared_snapshots=True,
+        )
+
+        assert refresher.shared.is_refresher() is True
+        assert follower.shared.is_refresher() is False
+
+        assert await refresher.get("buses.json") == ("abc123", {"worker": "refresher"})
+        await asyncio.gather(*refresher._background_tasks)
+
+        assert await follower.get("buses.json") == ("abc123", {"worker": "refresher"})
+        assert requests == {"refresher": 2, "follower": 0}
+
+        # The refresher role moves to another worker once released
+        await refresher.aclose()
+        assert follower.shared.is_refresher() is True
+        await follower.aclose()
+
+    async def test_follower_reads_snapshot_the_refresher_revalidated(self, tmp_path):
+        """Test only the refresher polls upstream once the file details expire."""
+        requests = []
+
+        def handler_for(worker: str):
+            def handler(request: httpx.Request) -> httpx.Response:
+                requests.append((worker, request.url.path))
+                if request.url.path == "/file_details.json":
+                    if request.headers.get("If-None-Match") == '"v1"':
+                        return httpx.Response(304, headers={"ETag": '"v1"'})
+                    return httpx.Response(200, json=FILE_DETAILS, headers={"ETag": '"v1"'})
+                return httpx.Response(200, json={"worker": worker})
+
+            return handler
+
+        managers = [
+            NTHUDataManager(
+                base_url="https://example.com",
+                transport=httpx.MockTransport(handler_for(worker)),
+                snapshot_dir=str(tmp_path),
+                shared_snapshots=True,
+            )
+            for worker in ("refresher", "follower")
+        ]
+        refresher, follower = managers
+        assert refresher.shared.is_refresher() is True
+
+        assert await refresher.get("buses.json") == ("abc123", {"worker": "refresher"})
+        await asyncio.gather(*refresher._background_tasks)
+        assert await follower.get("buses.json") == ("abc123", {"worker": "refresher"})
+
+        # Both copies of file_details.json expire; upstream answers 304 Not Modified
+        expired = time.time() - 700
+        os.utime(refresher.snapshots.path_for("/file_details.json"), (expired, expired))
+        for manager in managers:
+            manager.file_details_manager._cache["last_updated"] = expired
+            manager.file_details_manager.stale_while_revalidate = False
+
+        assert await refresher.get("buses.json") == ("abc123", {"worker": "refresher"})
+        assert await follower.get("buses.json") == ("abc123", {"worker": "refresher"})
+        assert requests == [
+            ("refresher", "/file_details.json"),
+            ("refresher", "/buses.json"),
+            ("refresher", "/file_details.json"),
+        ]
+        for manager in managers:
+            await manager.aclose()
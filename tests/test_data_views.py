@@ -0,0 +1,96 @@
+"""Tests for the derived view cache."""
+
+import httpx
+
+from data_api.data.nthudata import NTHUDataManager
+from data_api.data.sizing import estimate_size
+from data_api.data.views import DerivedViews, index_by
+
+
+class MockUpstream:
+    """Mock data.nthusa.tw serving a list of newsletters."""
+
+    def __init__(self):
+        self.commit = "v1"
+        self.newsletters = [{"name": "a", "link": "1"}, {"name": "b", "link": "2"}]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/file_details.json":
+            files = [{"name": "newsletters.json", "last_commit": self.commit, "last_updated": ""}]
+            return httpx.Response(200, json={"file_details": {"/": files}})
+        return httpx.Response(200, json=self.newsletters)
+
+    def manager(self) -> NTHUDataManager:
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(self.handler)
+        )
+        manager.file_details_manager.stale_while_revalidate = False
+        return manager
+
+
+class TestDerivedViews:
+    """Tests for DerivedViews class."""
+
+    async def test_computed_once_per_commit(self):
+        """Test that a view is derived once and recomputed after the commit changes."""
+        upstream = MockUpstream()
+        manager = upstream.manager()
+        views = DerivedViews(manager)
+        calls = []
+
+        def names(newsletters):
+            calls.append(1)
+            return [n["name"] for n in newsletters]
+
+        view = views.register("newsletters.names", "newsletters.json", names)
+        assert await views.get(view) == ("v1", ["a", "b"])
+        assert await views.get(view) == ("v1", ["a", "b"])
+        assert len(calls) == 1
+
+        upstream.commit = "v2"
+        upstream.newsletters = [{"name": "c", "link": "3"}]
+        await manager.file_details_manager.refresh()
+        assert await views.get(view) == ("v2", ["c"])
+        assert len(calls) == 2
+
+        stats = views.stats()[view]
+        assert (stats["hits"], stats["misses"], stats["commit_hash"]) == (1, 2, "v2")
+        await manager.aclose()
+
+    async def test_evicts_least_recently_used(self):
+        """Test that views are evicted once the size budget is exceeded."""
+        manager = MockUpstream().manager()
+        views = DerivedViews(manager)
+        first = views.register("first", "newsletters.json", index_by("name"))
+        second = views.register("second", "newsletters.json", index_by("link"))
+
+        await views.get(first)
+        views.max_bytes = views.total_size
+        await views.get(second)
+
+        stats = views.stats()
+        assert stats[first]["cached"] is False
+        assert stats[first]["evictions"] == 1
+        assert stats[second]["cached"] is True
+        assert views.total_size <= views.max_bytes
+        await manager.aclose()
+
+    async def test_unavailable_endpoint(self):
+        """Test that views of unavailable endpoints are None and not cached."""
+
+        def offline(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("unreachable", request=request)
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(offline)
+        )
+        views = DerivedViews(manager)
+        view = views.register("names", "newsletters.json", index_by("name"))
+        assert await views.get(view) is None
+        assert views.stats()[view]["misses"] == 0
+        await manager.aclose()
+
+    async def test_estimate_size_counts_shared_objects_once(self):
+        """Test that repeated references do not inflate the size estimate."""
+        entry = {"name": "x" * 1000}
+        assert estimate_size([entry, entry]) < 2 * estimate_size(entry)
@@ -0,0 +1,77 @@
+"""Tests for the startup warmup pipeline."""
+
+import asyncio
+
+from data_api.data.warmup import Warmup
+
+
+def stage(results: list[bool], calls: list[str], name: str):
+    """Stage returning the next of ``results`` (the last one repeats)."""
+
+    async def run() -> bool:
+        calls.append(name)
+        return results.pop(0) if len(results) > 1 else results[0]
+
+    return run
+
+
+class TestWarmup:
+    """Tests for Warmup class."""
+
+    async def test_ready_after_all_stages(self):
+        """Test that stages run in order and the worker is ready once all succeed."""
+        calls = []
+        warmup = Warmup()
+        warmup.add_stage("prefetch", stage([True], calls, "prefetch"))
+        warmup.add_stage("processors", stage([True], calls, "processors"))
+        assert not warmup.ready
+
+        assert await warmup.run() is True
+        assert calls == ["prefetch", "processors"]
+        status = warmup.status()
+        assert status["ready"] and status["ready_at"] is not None
+        assert status["stages"]["prefetch"]["status"] == "ok"
+
+    async def test_later_stages_run_after_failure(self):
+        """Test that a failed stage does not block later stages, only readiness."""
+        calls = []
+        warmup = Warmup()
+        warmup.add_stage("prefetch", stage([False, True], calls, "prefetch"))
+        warmup.add_stage("processors", stage([True], calls, "processors"))
+
+        assert await warmup.run() is False
+        assert calls == ["prefetch", "processors"]
+        assert warmup.stages["prefetch"]["status"] == "failed"
+        assert warmup.stages["processors"]["status"] == "ok"
+
+        # Only the failed stage is run again
+        assert await warmup.run() is True
+        assert calls == ["prefetch", "processors", "prefetch"]
+        assert warmup.stages["prefetch"]["attempts"] == 2
+
+    async def test_exception_marks_stage_failed(self):
+        """Test that an exception in a stage is recorded instead of propagated."""
+
+        async def broken() -> bool:
+            raise RuntimeError("upstream down")
+
+        warmup = Warmup()
+        warmup.add_stage("prefetch", broken)
+        assert await warmup.run() is False
+        assert warmup.stages["prefetch"]["error"] == "upstream down"
+
+    async def test_background_retries_until_ready(self):
+        """Test that failed stages are retried in the background with backoff."""
+        calls = []
+        warmup = Warmup(retry_interval=0.01, max_retry_interval=0.02)
+        warmup.add_stage("prefetch", stage([False, False, True], calls, "prefetch"))
+        await warmup.run()
+
+        warmup.start()
+        for _ in range(100):
+            if warmup.ready:
+                break
+            await asyncio.sleep(0.01)
+        assert warmup.ready
+        assert len(calls) == 3
+        await warmup.stop()
@@ -6,6 +6,7 @@ from data_api.core.exceptions import (
     DataAPIException,
     DataNotAvailableException,
     DataUpdateException,
+    UpstreamFetchError,
 )
 
 
@@ -54,6 +55,37 @@ class TestDataUpdateException:
         assert isinstance(exc, DataAPIException)
 
 
+class TestUpstreamFetchError:
+    """Tests for UpstreamFetchError."""
+
+    async def test_structured_fields(self):
+        """Test the error exposes structured fields."""
+        exc = UpstreamFetchError("https://example.com/a.json", "http_status", "boom", 503, 3)
+        assert exc.to_dict() == {
+            "url": "https://example.com/a.json",
+            "kind": "http_status",
+            "message": "boom",
+            "status_code": 503,
+            "attempts": 3,
+        }
+        assert isinstance(exc, DataUpdateException)
+
+    async def test_message_reflects_attempts(self):
+        """Test the message counts the attempts made by the time it is rendered."""
+        exc = UpstreamFetchError("https://example.com/a.json", "timeout", "slow")
+        exc.attempts = 3
+        assert (
+            str(exc) == "timeout error fetching https://example.com/a.json after 3 attempt(s): slow"
+        )
+
+    async def test_retryable(self):
+        """Test that only transient failures are retryable."""
+        assert UpstreamFetchError("u", "timeout", "").retryable is True
+        assert UpstreamFetchError("u", "http_status", "", 429).retryable is True
+        assert UpstreamFetchError("u", "http_status", "", 404).retryable is False
+        assert UpstreamFetchError("u", "decode", "").retryable is False
+
+
 class TestExceptionHierarchy:
     """Tests for exception hierarchy."""
 
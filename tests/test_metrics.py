@@ -0,0 +1,103 @@
+"""Tests for the metrics registry and its instrumentation."""
+
+import httpx
+from httpx import ASGITransport, AsyncClient
+
+from data_api.api.api import app
+from data_api.core import metrics
+from data_api.core.metrics import Registry
+from data_api.data.nthudata import NTHUDataManager
+
+
+class TestRegistry:
+    """Tests for Counter, Histogram and Registry classes."""
+
+    def test_counter(self):
+        """Test counter values and exposition lines."""
+        registry = Registry()
+        counter = registry.counter("requests_total", "Requests", ("endpoint",))
+        counter.inc("/a")
+        counter.inc("/a", amount=2)
+        counter.inc('/b"')
+        assert counter.value("/a") == 3
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{endpoint="/a"} 3' in text
+        assert 'requests_total{endpoint="/b\\""} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets are cumulative and include +Inf, sum and count."""
+        registry = Registry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 3.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_histogram_time(self):
+        """Test that time() observes the block even when it raises."""
+        histogram = Registry().histogram("duration_seconds", "Duration", ("name",))
+        with histogram.time("ok"):
+            pass
+        try:
+            with histogram.time("failed"):
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert histogram.count("ok") == 1
+        assert histogram.count("failed") == 1
+
+
+class TestInstrumentation:
+    """Tests for metrics recorded by the data manager and the app."""
+
+    async def test_data_manager_metrics(self):
+        """Test fetch, error and cache counters of the data manager."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/file_details.json":
+                files = [
+                    {"name": "metrics_ok.json", "last_commit": "c1", "last_updated": ""},
+                    {"name": "metrics_missing.json", "last_commit": "c1", "last_updated": ""},
+                ]
+                return httpx.Response(200, json={"file_details": {"/": files}})
+            if request.url.path == "/metrics_ok.json":
+                return httpx.Response(200, json=[1, 2, 3])
+            return httpx.Response(404)
+
+        manager = NTHUDataManager(
+            base_url="https://example.com", transport=httpx.MockTransport(handler)
+        )
+        hits = metrics.DATA_CACHE_REQUESTS.value("/metrics_ok.json", "hit")
+        misses = metrics.DATA_CACHE_REQUESTS.value("/metrics_ok.json", "miss")
+        fetched = metrics.UPSTREAM_FETCH_BYTES.value("/metrics_ok.json")
+        errors = metrics.UPSTREAM_FETCH_ERRORS.value("/metrics_missing.json", "http_status")
+
+        await manager.get("metrics_ok.json")
+        await manager.get("metrics_ok.json")
+        await manager.get("metrics_missing.json")
+
+        assert metrics.DATA_CACHE_REQUESTS.value("/metrics_ok.json", "miss") == misses + 1
+        assert metrics.DATA_CACHE_REQUESTS.value("/metrics_ok.json", "hit") == hits + 1
+        assert metrics.UPSTREAM_FETCH_BYTES.value("/metrics_ok.json") == fetched + len(b"[1,2,3]")
+        assert (
+            metrics.UPSTREAM_FETCH_ERRORS.value("/metrics_missing.json", "http_status")
+            == errors + 1
+        )
+        await manager.aclose()
+
+    async def test_metrics_endpoint(self):
+        """Test that requests are recorded per route template and exposed as text."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/health")
+            response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/health",'
+            'operation_id="getHealth",status="200"}' in response.text
+        )
@@ -0,0 +1,134 @@
+"""Tests for the offline upstream mock and its fixtures."""
+
+import httpx
+import pytest
+from httpx import ASGITransport, AsyncClient
+from mock_upstream import DATA_HOST, MockUpstream
+
+from data_api.api.api import app
+from data_api.data.nthudata import NTHUDataManager
+
+
+def make_manager(upstream: MockUpstream) -> NTHUDataManager:
+    manager = NTHUDataManager(base_url=f"https://{DATA_HOST}", transport=upstream.transport())
+    manager.file_details_manager.stale_while_revalidate = False
+    return manager
+
+
+class TestMockUpstream:
+    """Tests for MockUpstream class."""
+
+    async def test_serves_every_data_fixture(self):
+        """Test that every file listed in file_details.json can be fetched."""
+        upstream = MockUpstream()
+        manager = make_manager(upstream)
+        file_details = await manager.file_details_manager.get_file_details()
+        assert {f["name"] for f in file_details} >= {"/buses.json", "/courses.json"}
+        for file_info in file_details:
+            result = await manager.get(file_info["name"])
+            assert result is not None
+            assert result[0] == upstream.commit(file_info["name"])
+        await manager.aclose()
+
+    async def test_rotation_triggers_refetch(self):
+        """Test that rotating a commit hash makes the manager refetch only that file."""
+        upstream = MockUpstream()
+        manager = make_manager(upstream)
+        first, _ = await manager.get("buses.json")
+        await manager.get("dining.json")
+
+        upstream.rotate("buses.json")
+        await manager.file_details_manager.refresh()
+        upstream.requests.clear()
+        second, _ = await manager.get("buses.json")
+        await manager.get("dining.json")
+
+        assert second != first
+        assert list(upstream.requests) == [(DATA_HOST, "/buses.json")]
+        await manager.aclose()
+
+    async def test_etag_not_modified(self):
+        """Test that a matching If-None-Match is answered with 304."""
+        upstream = MockUpstream()
+        async with AsyncClient(transport=upstream.transport()) as client:
+            response = await client.get(f"https://{DATA_HOST}/maps.json")
+            etag = response.headers["ETag"]
+            revalidated = await client.get(
+                f"https://{DATA_HOST}/maps.json", headers={"If-None-Match": etag}
+            )
+        assert response.status_code == 200
+        assert revalidated.status_code == 304
+
+    async def test_failure_rate(self):
+        """Test that failures are injected at the configured rate, reproducibly."""
+        statuses = []
+        for _ in range(2):
+            upstream = MockUpstream(failure_rate=0.5, seed=1)
+            async with AsyncClient(transport=upstream.transport()) as client:
+                responses = [await client.get(f"https://{DATA_HOST}/maps.json") for _ in range(20)]
+            statuses.append([r.status_code for r in responses])
+        assert statuses[0] == statuses[1]
+        assert set(statuses[0]) == {200, 503}
+
+    async def test_unknown_path(self):
+        """Test that paths without a fixture are answered with 404."""
+        upstream = MockUpstream()
+        async with AsyncClient(transport=upstream.transport()) as client:
+            response = await client.get(f"https://{DATA_HOST}/missing.json")
+        assert response.status_code == 404
+
+    async def test_request_log_is_bounded(self):
+        """Test that only the most recent requests are kept."""
+        upstream = MockUpstream(max_requests=2)
+        async with AsyncClient(transport=upstream.transport()) as client:
+            for path in ("/buses.json", "/dining.json", "/courses.json"):
+                await client.get(f"https://{DATA_HOST}{path}")
+        assert list(upstream.requests) == [
+            (DATA_HOST, "/dining.json"),
+            (DATA_HOST, "/courses.json"),
+        ]
+
+
+class TestInstalledMock:
+    """Tests for endpoints fetching from their own clients under MockUpstream.install."""
+
+    @pytest.fixture
+    async def client(self):
+        """Create async test client with the upstream mocked."""
+        upstream = MockUpstream()
+        with upstream.install():
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+            ) as client:
+                yield client
+
+    async def test_electricity_usage(self, client: AsyncClient):
+        """Test the energy endpoint against the recorded power-management pages."""
+        response = await client.get("/energy/electricity_usage")
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+
+    async def test_library_space(self, client: AsyncClient):
+        """Test the library space endpoint against the recorded booking system."""
+        response = await client.get("/libraries/space")
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+
+    async def test_library_rss(self, client: AsyncClient):
+        """Test the library RSS endpoint against the recorded feed."""
+        response = await client.get("/libraries/rss/news")
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+
+    async def test_library_lost_and_found(self, client: AsyncClient):
+        """Test the lost and found endpoint against the recorded search page."""
+        response = await client.get("/libraries/lost_and_found")
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+
+    async def test_restored_after_exit(self):
+        """Test that the default transport is restored when the context exits."""
+        original = httpx.AsyncHTTPTransport.handle_async_request
+        with MockUpstream().install():
+            assert httpx.AsyncHTTPTransport.handle_async_request is not original
+        assert httpx.AsyncHTTPTransport.handle_async_request is original
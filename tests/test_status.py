@@ -0,0 +1,81 @@
+"""Tests for health, readiness and cache status endpoints."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from mock_upstream import DATA_HOST, MockUpstream
+
+from data_api.api.api import app
+from data_api.api.routers import status as status_router
+from data_api.data.nthudata import NTHUDataManager
+from data_api.data.views import DerivedViews, index_by
+from data_api.data.warmup import Warmup
+
+
+class TestStatusEndpoints:
+    """Tests for status endpoints."""
+
+    @pytest.fixture
+    async def client(self):
+        """Create async test client."""
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+        ) as client:
+            yield client
+
+    async def test_health(self, client: AsyncClient):
+        """Test that the liveness endpoint always answers."""
+        response = await client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    async def test_ready(self, client: AsyncClient, monkeypatch):
+        """Test that readiness is 503 until every warmup stage succeeded."""
+        results = [False]
+
+        async def prefetch() -> bool:
+            return results[0]
+
+        warmup = Warmup()
+        warmup.add_stage("prefetch", prefetch)
+        monkeypatch.setattr(status_router, "warmup", warmup)
+
+        await warmup.run()
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["stages"]["prefetch"]["status"] == "failed"
+
+        results[0] = True
+        await warmup.run()
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    async def test_cache_status(self, client: AsyncClient, monkeypatch):
+        """Test per-dataset cache status and derived index state."""
+        upstream = MockUpstream()
+        manager = NTHUDataManager(base_url=f"https://{DATA_HOST}", transport=upstream.transport())
+        manager.file_details_manager.stale_while_revalidate = False
+        views = DerivedViews(manager)
+        view = views.register("libraries.by_name", "libraries.json", index_by("name"))
+        monkeypatch.setattr(status_router, "nthudata", manager)
+        monkeypatch.setattr(status_router, "views", views)
+
+        await manager.get("libraries.json")
+        await manager.get("maps.json")
+        upstream.requests.clear()
+
+        data = (await client.get("/_status/cache")).json()
+        libraries = data["datasets"]["/libraries.json"]
+        assert libraries["commit_hash"] == upstream.commit("/libraries.json")
+        assert libraries["size"] > 0
+        assert libraries["fetched_bytes"] > 0
+        assert libraries["indexes"] == {view: False}
+
+        await views.get(view)
+        data = (await client.get("/_status/cache")).json()
+        assert data["datasets"]["/libraries.json"]["indexes"] == {view: True}
+        assert data["datasets"]["/maps.json"]["indexes"] == {}
+        assert data["breakers"][DATA_HOST]["state"] == "closed"
+        # Polling the status never contacts upstream
+        assert not upstream.requests
+        await manager.aclose()